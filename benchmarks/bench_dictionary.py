@@ -0,0 +1,69 @@
+"""
+----------------------------------------------------
+Benchmark for the dictionary loaders
+Compares cold start and lookup cost of the text loader (load_dictionary),
+    the frozenset Dictionary and the memory-mapped Mapped_Dictionary
+Usage: python benchmarks/bench_dictionary.py [dict_file]
+       Without a dict_file, a synthetic word list is generated
+----------------------------------------------------
+"""
+import os
+import random
+import string
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import utilities
+
+WORDS = 80000
+LOOKUPS = 20000
+
+def make_word_list(directory):
+    """
+    Writes a sorted synthetic word list (one word per line) and returns its name
+    """
+    random.seed(0)
+    words = set()
+    for letter in string.ascii_lowercase:
+        for i in range(WORDS // 26):
+            words.add(letter + "".join(random.choice(string.ascii_lowercase) for j in range(random.randint(2, 10))))
+    dict_file = os.path.join(directory, "words.txt")
+    f = open(dict_file, 'w', encoding="ISO-8859-15")
+    f.write("\n".join(sorted(words)) + "\n")
+    f.close()
+    return dict_file
+
+def main():
+    directory = tempfile.mkdtemp()
+    dict_file = sys.argv[1] if len(sys.argv) > 1 else make_word_list(directory)
+    compiled_file = utilities.compile_dictionary(dict_file, os.path.join(directory, "words.dic"))
+
+    dict_list = utilities.load_dictionary(dict_file)
+    dictionary = utilities.Dictionary(dict_list)
+    mapped = utilities.Mapped_Dictionary(compiled_file)
+    random.seed(1)
+    samples = [random.choice(group) for group in random.sample(dict_list, 5) for i in range(LOOKUPS // 10)]
+    samples += ["".join(random.choice(string.ascii_lowercase) for j in range(6)) for i in range(LOOKUPS // 2)]
+    indices = [ord(word[0]) - 97 for word in samples]
+
+    def lookups(dict_list):
+        return lambda: [word in dict_list[index] for word, index in zip(samples, indices)]
+
+    cases = [
+        ("cold start: load_dictionary", lambda: utilities.load_dictionary(dict_file), 3),
+        ("cold start: Dictionary", lambda: utilities.Dictionary(utilities.load_dictionary(dict_file)), 3),
+        ("cold start: Mapped_Dictionary", lambda: utilities.Mapped_Dictionary(compiled_file), 3),
+        ("lookups: list", lookups(dict_list), 1),
+        ("lookups: Dictionary", lookups(dictionary), 3),
+        ("lookups: Mapped_Dictionary", lookups(mapped), 3),
+    ]
+    print("words: {}, lookups: {}".format(sum([len(group) for group in dict_list]), len(samples)))
+    for name, func, repeat in cases:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print("{:<32}{:>10.4f} s".format(name, best))
+    return
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+----------------------------------------------------
+Benchmark suite for the ciphers, the utilities and the Flask routes
+Every case is timed with timeit (best of --repeat runs) and the
+    results are written as JSON, so two runs can be compared
+Usage: python benchmarks/bench_suite.py run [-o results.json] [--sizes 1KB 100KB 10MB]
+                                            [--filter text] [--repeat 3] [--dict-file file]
+       python benchmarks/bench_suite.py compare baseline.json results.json [--threshold 0.1]
+Example: python benchmarks/bench_suite.py run --sizes 1KB 100KB -o before.json
+         (apply a change)
+         python benchmarks/bench_suite.py run --sizes 1KB 100KB -o after.json
+         python benchmarks/bench_suite.py compare before.json after.json
+compare exits with status 1 if a case got slower by more than threshold
+----------------------------------------------------
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ciphers
+import utilities
+from bench_dictionary import make_word_list
+
+SIZES = {"1KB": 1024, "100KB": 100 * 1024, "10MB": 10 * 1024 * 1024}
+SAMPLE = "The quick brown fox, jumps over 13 lazy dogs!\n"
+ANALYSIS_SAMPLE = "The quick brown fox jumps over the lazy dog"
+THRESHOLD = 0.1
+
+def make_text(size):
+    """
+    Returns the sample text repeated to exactly size characters
+    """
+    return (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+
+def make_dictionary(directory):
+    """
+    Writes a synthetic word list that also holds the sample words and returns its name
+    """
+    dict_file = make_word_list(directory)
+    words = set(open(dict_file, 'r', encoding="ISO-8859-15").read().split())
+    words.update(utilities.text_to_words(SAMPLE.lower() + ANALYSIS_SAMPLE.lower()))
+    f = open(dict_file, 'w', encoding="ISO-8859-15")
+    f.write("\n".join(sorted(words)) + "\n")
+    f.close()
+    return dict_file
+
+def cipher_cases(sizes):
+    """
+    Yields (name, func) for encrypt/decrypt of every cipher at every size
+    """
+    objects = [
+        ("columnar_transposition", ciphers.Columnar_Transposition("keyword")),
+        ("polybius", ciphers.Polybius(("!", 9))),
+        ("simple_substitution", ciphers.Simple_Substitution(("zebra", utilities.get_base("lower")))),
+        ("vigenere", ciphers.Vigenere("lemon")),
+        ("ceasar", ciphers.Ceaser_Cipher(3)),
+    ]
+    for label in sizes:
+        plaintext = make_text(SIZES[label])
+        for name, cipher in objects:
+            ciphertext = cipher.encrypt(plaintext)
+            yield "{}.encrypt[{}]".format(name, label), lambda cipher=cipher, plaintext=plaintext: cipher.encrypt(plaintext)
+            yield "{}.decrypt[{}]".format(name, label), lambda cipher=cipher, ciphertext=ciphertext: cipher.decrypt(ciphertext)
+
+def utility_cases(sizes, dict_file):
+    """
+    Yields (name, func) for the utilities text helpers at every size
+    """
+    base = utilities.get_base("nonalpha") + " \n"
+    dictionary = utilities.get_dictionary(dict_file)
+    for label in sizes:
+        text = make_text(SIZES[label])
+        cleaned = utilities.clean_text(text, base)
+        positions = utilities.get_positions(text, base)
+        yield "clean_text[{}]".format(label), lambda text=text: utilities.clean_text(text, base)
+        yield "insert_positions[{}]".format(label), lambda cleaned=cleaned, positions=positions: utilities.insert_positions(cleaned, positions)
+        yield "text_to_words[{}]".format(label), lambda text=text: utilities.text_to_words(text)
+        yield "analyze_text[{}]".format(label), lambda text=text: utilities.analyze_text(text, dictionary)
+        yield "score_text[{}]".format(label), lambda text=text: utilities.score_text(text, dictionary)
+        yield "get_freq[{}]".format(label), lambda text=text: utilities.get_freq(text)
+
+def make_prose(size):
+    """
+    Returns size characters of sample words in a fixed random order
+    A repeated sample would hide the key period from key length searches
+    """
+    words = utilities.text_to_words(SAMPLE.lower() + ANALYSIS_SAMPLE.lower())
+    generator = random.Random(0)
+    text = " ".join([generator.choice(words) for i in range(size // 4)])
+    return text[:size]
+
+def analysis_cases(dict_file):
+    """
+    Yields (name, func) for Polybius.cryptanalyze and Vigenere.cryptanalyze (1 MB)
+    """
+    ciphertext = ciphers.Polybius(("!", 9)).encrypt(ANALYSIS_SAMPLE)
+    yield "polybius.cryptanalyze", lambda: ciphers.Polybius.cryptanalyze(ciphertext, ['', 0, 0, dict_file, 0.93])
+    vigenere_text = ciphers.Vigenere("lemonade").encrypt(make_prose(1024 * 1024))
+    yield "vigenere.cryptanalyze[1MB]", lambda: ciphers.Vigenere.cryptanalyze(vigenere_text)
+
+def route_cases(sizes):
+    """
+    Yields (name, func) for the cipher routes through the Flask test client
+    The [empty] cases measure routing, parsing and key handling only
+    """
+    import main
+    client = main.app.test_client()
+    routes = [
+        ("columnar_transposition_cipher", "keyword"),
+        ("vigenere_cipher", "lemon"),
+        ("ceasar_cipher", "3"),
+        ("cipher/columnar_transposition", "keyword"),
+        ("cipher/polybius", ["!", 9]),
+        ("cipher/simple_substitution", ["zebra", utilities.get_base("lower")]),
+        ("cipher/vigenere", "lemon"),
+        ("cipher/ceasar", "3"),
+    ]
+    for label in ["empty"] + list(sizes):
+        text = make_text(SIZES[label]) if label in SIZES else ""
+        for route, key in routes:
+            body = {"key": key, "encryptFlag": "encrypt", "userInput": text}
+            yield "POST /{}[{}]".format(route, label), lambda route=route, body=body: client.post("/" + route, json=body)
+    yield "main.get_engine", lambda: main.get_engine("vigenere", "lemon")
+
+def time_case(func, repeat):
+    """
+    ----------------------------------------------------
+    Parameters:   func (function): case to time
+                  repeat (int): number of timing runs
+    Return:       result (dict): best and mean seconds per call,
+                      number of calls per run and number of runs
+    Description:  The number of calls per run is picked by timeit autorange
+                      (at least 0.2 seconds per run)
+    ---------------------------------------------------
+    """
+    timer = timeit.Timer(func)
+    number = timer.autorange()[0]
+    times = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(times), "mean": sum(times) / len(times), "number": number, "repeat": repeat}
+
+def run(args):
+    directory = tempfile.mkdtemp()
+    dict_file = args.dict_file if args.dict_file else make_dictionary(directory)
+    # Keep the output readable if a case prints (e.g. error messages)
+    devnull = open(os.devnull, 'w')
+    with contextlib.redirect_stdout(devnull):
+        cases = list(cipher_cases(args.sizes)) + list(utility_cases(args.sizes, dict_file))
+        cases += list(analysis_cases(dict_file)) + list(route_cases(args.sizes))
+
+    results = {}
+    for name, func in cases:
+        if args.filter and args.filter not in name: continue
+        with contextlib.redirect_stdout(devnull):
+            results[name] = time_case(func, args.repeat)
+        print("{:<48}{:>12.6f} s".format(name, results[name]["best"]))
+    devnull.close()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        f = open(args.output, 'w')
+        json.dump(report, f, indent=2)
+        f.close()
+    return 0
+
+def compare(args):
+    baseline = json.load(open(args.baseline, 'r'))["results"]
+    current = json.load(open(args.current, 'r'))["results"]
+
+    regressions = 0
+    for name in sorted(set(baseline) & set(current)):
+        change = current[name]["best"] / baseline[name]["best"] - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "faster"
+        print("{:<48}{:>12.6f}{:>12.6f}{:>+9.1%}  {}".format(name, baseline[name]["best"], current[name]["best"], change, flag))
+    for name in sorted(set(baseline) ^ set(current)):
+        print("{:<48} only in {}".format(name, args.baseline if name in baseline else args.current))
+
+    print("{} regression(s) above {:.0%}".format(regressions, args.threshold))
+    return 1 if regressions > 0 else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite")
+    commands = parser.add_subparsers(dest="mode", required=True)
+    command = commands.add_parser("run", help="time every case")
+    command.add_argument("-o", "--output", help="JSON results file")
+    command.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    command.add_argument("--filter", help="only run cases whose name contains this text")
+    command.add_argument("--repeat", type=int, default=3)
+    command.add_argument("--dict-file", help="word list (default: synthetic)")
+    command = commands.add_parser("compare", help="compare two JSON results files")
+    command.add_argument("baseline")
+    command.add_argument("current")
+    command.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown, default 0.1 (10%%)")
+    args = parser.parse_args(argv)
+
+    if args.mode == "run":
+        return run(args)
+    return compare(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
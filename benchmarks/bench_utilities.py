@@ -0,0 +1,38 @@
+"""
+----------------------------------------------------
+Benchmark for the utilities text helpers on a 10 MB input
+Usage: python benchmarks/bench_utilities.py [size_in_bytes]
+----------------------------------------------------
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import utilities
+
+SIZE = 10 * 1024 * 1024
+SAMPLE = "The quick brown fox, jumps over 13 lazy dogs!\n"
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    text = (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+    base = utilities.get_base("nonalpha") + " \n"
+
+    positions = utilities.get_positions(text, base)
+    cleaned, mask = utilities.get_mask(text, base)
+    cases = [
+        ("get_positions", lambda: utilities.get_positions(text, base)),
+        ("clean_text", lambda: utilities.clean_text(text, base)),
+        ("insert_positions", lambda: utilities.insert_positions(cleaned, positions)),
+        ("get_mask", lambda: utilities.get_mask(text, base)),
+        ("insert_mask", lambda: utilities.insert_mask(cleaned, mask)),
+    ]
+    print("input size: {} bytes".format(size))
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=3))
+        print("{:<20}{:>10.3f} s".format(name, best))
+    return
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+----------------------------------------------------
+Load test for the ASGI mode (main.asgi_app) with mixed payload sizes
+Requests are sent in-process at a fixed rate (open loop, latency is
+    measured from the scheduled send time), once with every request
+    running inline and once with large requests offloaded to the
+    process pool, then the latency percentiles are compared
+Usage: python benchmarks/load_test.py [--rate 50] [--seconds 10] [--large-share 0.05]
+                                      [--small-size 1024] [--large-size 4000000]
+----------------------------------------------------
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import main
+
+SAMPLE = "The quick brown fox, jumps over 13 lazy dogs!\n"
+ROUTE = "/vigenere_cipher"
+
+def make_body(size):
+    """
+    Returns a vigenere request body with a size character input
+    """
+    text = (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+    return json.dumps({"key": "lemon", "encryptFlag": "encrypt", "userInput": text}).encode("utf-8")
+
+async def send_request(body):
+    """
+    Sends one request to main.asgi_app and returns the response status
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": ROUTE, "raw_path": ROUTE.encode("ascii"), "query_string": b"",
+        "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "server": ("loadtest", 80), "client": ("127.0.0.1", 0),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response = {}
+
+    async def receive():
+        if len(messages) > 0: return messages.pop()
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start": response["status"] = message["status"]
+        return
+
+    await main.asgi_app(scope, receive, send)
+    return response["status"]
+
+async def run_load(schedule, bodies):
+    """
+    Sends bodies[kind] at every (time, kind) of schedule and returns [(kind, status, latency)]
+    """
+    results = []
+    start = time.perf_counter()
+
+    async def timed(at, kind):
+        delay = start + at - time.perf_counter()
+        if delay > 0: await asyncio.sleep(delay)
+        status = await send_request(bodies[kind])
+        results.append((kind, status, time.perf_counter() - (start + at)))
+        return
+
+    await asyncio.gather(*[timed(at, kind) for at, kind in schedule])
+    return results
+
+def percentile(values, share):
+    """
+    Returns the share (0-1) percentile of values
+    """
+    if len(values) == 0: return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+def report(name, results):
+    print(name)
+    for kind in ["small", "large"]:
+        latencies = [latency for result_kind, status, latency in results if result_kind == kind]
+        statuses = {}
+        for result_kind, status, latency in results:
+            if result_kind == kind: statuses[status] = statuses.get(status, 0) + 1
+        print("  {:<6} n={:<5} p50={:>8.1f} ms  p99={:>8.1f} ms  max={:>8.1f} ms  status={}".format(
+            kind, len(latencies), 1000 * percentile(latencies, 0.5), 1000 * percentile(latencies, 0.99),
+            1000 * max(latencies or [float("nan")]), statuses))
+    return
+
+def main_load(argv=None):
+    parser = argparse.ArgumentParser(description="ASGI load test with mixed payload sizes")
+    parser.add_argument("--rate", type=float, default=50, help="requests per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--large-share", type=float, default=0.05)
+    parser.add_argument("--small-size", type=int, default=1024)
+    parser.add_argument("--large-size", type=int, default=4000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    schedule = [(i / args.rate, "large" if random.random() < args.large_share else "small")
+                for i in range(int(args.rate * args.seconds))]
+    bodies = {"small": make_body(args.small_size), "large": make_body(args.large_size)}
+    print("{} requests at {}/s, {:.0%} of {} chars, the rest {} chars".format(
+        len(schedule), args.rate, args.large_share, args.large_size, args.small_size))
+
+    offload_min_size = main.ASGI_OFFLOAD_MIN_SIZE
+    main.ASGI_OFFLOAD_MIN_SIZE = float("inf")
+    report("inline (no offloading)", asyncio.run(run_load(schedule, bodies)))
+
+    main.ASGI_OFFLOAD_MIN_SIZE = min(offload_min_size, len(bodies["large"]))
+    main.get_asgi_pool().submit(abs, 0).result() # start the workers before timing
+    report("offloaded (>= {} bytes, {} workers)".format(main.ASGI_OFFLOAD_MIN_SIZE, main.ASGI_WORKERS),
+           asyncio.run(run_load(schedule, bodies)))
+    main.get_asgi_pool().shutdown()
+    return
+
+if __name__ == '__main__':
+    main_load()
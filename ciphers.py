@@ -1,4 +1,79 @@
+import math
+import os
+import random
+import re
+import sys
+import threading
 import utilities
+import vectorized
+from functools import lru_cache
+from itertools import permutations
+
+class _Translate_Table(dict):
+    """
+    ----------------------------------------------------
+    Private helper class
+    A str.translate table that is filled on demand
+    Characters missing from the table are passed to char_func
+        and the result is stored for later lookups
+    Keys are character codes (as used by str.translate) or strings
+    Used to precompute substitution tables once per key while
+        keeping exact per-character semantics for every input
+    ----------------------------------------------------
+    """
+
+    def __init__(self, char_func, chars=''):
+        """
+        ----------------------------------------------------
+        Parameters:   char_func (function): maps a character to its substitute
+                      chars (str): characters to precompute, default = ''
+        Description:  _Translate_Table constructor
+        ---------------------------------------------------
+        """
+        super().__init__()
+        self._char_func = char_func
+        for element in chars:
+            self[ord(element)] = char_func(element)
+        return
+
+    def __missing__(self, code):
+        value = self._char_func(chr(code) if isinstance(code, int) else code)
+        self[code] = value
+        return value
+
+def _bytes_table(translate_table):
+    """
+    ----------------------------------------------------
+    Parameters:   translate_table (dict): a str.translate table
+    Return:       table (bytes): 256 byte table for bytes.translate
+    Description:  Private helper function
+                  ASCII bytes are translated like the matching characters,
+                      all other bytes are kept
+                  If some ASCII character is not translated into a single
+                      ASCII character, returns None
+    ---------------------------------------------------
+    """
+    translated = "".join(map(chr, range(128))).translate(translate_table)
+    if len(translated) != 128 or not translated.isascii(): return None
+    return translated.encode("ascii") + bytes(range(128, 256))
+
+def _cipher_bytes_table(cipher, mode):
+    """
+    Private helper function which returns the bytes.translate table (see
+    _bytes_table) of cipher._encrypt_table (mode = 0) or cipher._decrypt_table
+    (mode = 1), cached in cipher._byte_tables until the key changes
+    """
+    if mode not in cipher._byte_tables:
+        cipher._byte_tables[mode] = _bytes_table(cipher._encrypt_table if mode == 0 else cipher._decrypt_table)
+    return cipher._byte_tables[mode]
+
+def _as_bytes(data):
+    """
+    Private helper function which returns bytes/bytearray data as is
+    and copies other buffers (memoryview) into bytes
+    """
+    if isinstance(data, (bytes, bytearray)): return data
+    return bytes(data)
 
 class Columnar_Transposition:
     """
@@ -16,6 +91,7 @@ class Columnar_Transposition:
     
     DEFAULT_PAD = 'q'
     DEFAULT_PASSWORD = 'abcd'
+    EXHAUSTIVE_WIDTH = 8
     
     def __init__(self,key=DEFAULT_PASSWORD,pad=DEFAULT_PAD):
         """
@@ -31,6 +107,7 @@ class Columnar_Transposition:
 
         if self.key != self.DEFAULT_PASSWORD : self.set_key(key)
         if self.pad != self.DEFAULT_PAD : self.set_pad(pad)
+        self._key_order = self.key_order(self.key)
 
         return
             
@@ -59,6 +136,7 @@ class Columnar_Transposition:
             key = self.DEFAULT_PASSWORD 
         
         self.key = key 
+        self._key_order = self.key_order(key)
         
         return boolean
 
@@ -93,12 +171,13 @@ class Columnar_Transposition:
         Parameters:   pad (str): a padding character
         Return:       success: True/False
         Description:  Sets pad to given character
-                      a pad should be a single character
+                      a pad should be a single Latin-1 character (so bytes
+                          can be padded too, see encrypt_bytes)
                       if invalid pad, set to default value
         ---------------------------------------------------
         """
         boolean = True 
-        if (not isinstance(pad, str) or len(pad) != 1):
+        if (not isinstance(pad, str) or len(pad) != 1 or ord(pad) > 255):
             boolean = False 
             pad = self.DEFAULT_PAD 
         
@@ -162,95 +241,335 @@ class Columnar_Transposition:
 
         return a
 
-    def encrypt(self,plaintext):
+    @utilities.log_call
+    def encrypt(self,plaintext,backend="python"):
         """
         ----------------------------------------------------
         Parameters:   plaintext (str)
+                      backend (str): "python" or "numpy", default = "python"
         Return:       ciphertext (list)
         Description:  Encryption using Columnar Transposition Cipher
                       Does not include whitespaces in encryption
                       Uses padding
+                      The numpy backend is used for ASCII text when NumPy is installed
         Asserts:      plaintext is a string
         ----------------------------------------------------
         """
+        if backend == "numpy" and vectorized.available(plaintext + self.pad):
+            return vectorized.transpose_encrypt(plaintext, self._key_order, self.pad)
+
         # Clean plaintext of spaces and keep track of their indicies so you can insert them back later 
-        positions_of_white_spaces = utilities.get_positions(plaintext, " ")
-        plaintext = utilities.clean_text(plaintext, " ")
+        plaintext, white_spaces = utilities.get_mask(plaintext, " ")
 
         # Get the amount of rows and columns needed
         length = len(plaintext)
-        key_order = self.key_order(self.key) 
+        key_order = self._key_order
         col = len(key_order)
         rows = (length // col) +1
 
-        # Populate matrix
-        matrix = utilities.new_matrix(rows, col, self.pad)
-        count = 0
-        for i in range(rows):
-            if count == len(plaintext) : break 
-            for j in range(col): 
-                if count < len(plaintext): 
-                    matrix[i][j] = plaintext[count]
-                    count += 1 
-        
-        # Encrypt the string
-        ciphertext = "" 
-        col_counter = 0 
-        while col_counter < col: 
-            index = key_order[col_counter]
-            row_counter = 0
-            while(row_counter < rows): 
-                ciphertext += matrix[row_counter][index] 
-                row_counter += 1
-            col_counter += 1
+        # Pad the last row, then read every column in key order
+        plaintext += self.pad * (rows*col - length)
+        ciphertext = "".join([plaintext[index::col] for index in key_order])
 
         # Insert the spaces back into the cipher text 
-        ciphertext = utilities.insert_positions(ciphertext,positions_of_white_spaces)
+        ciphertext = utilities.insert_mask(ciphertext,white_spaces)
 
         return ciphertext
 
-    def decrypt(self,ciphertext):
+    @utilities.log_call
+    def decrypt(self,ciphertext,backend="python"):
         """
         ----------------------------------------------------
         Parameters:   ciphertext (str)
+                      backend (str): "python" or "numpy", default = "python"
         Return:       plaintext (list)
         Description:  Decryption using Columnar Transposition Cipher
+                      The numpy backend is used for ASCII text when NumPy is installed
         Asserts:      ciphertext is a string
         ----------------------------------------------------
         """
+        if backend == "numpy" and vectorized.available(ciphertext + self.pad):
+            return vectorized.transpose_decrypt(ciphertext, self._key_order, self.pad)
+
         # Clean ciphertext of spaces and keep track of their indicies so you can insert them back later 
-        positions_of_white_spaces = utilities.get_positions(ciphertext, " ")
-        ciphertext = utilities.clean_text(ciphertext, " ")
+        ciphertext, white_spaces = utilities.get_mask(ciphertext, " ")
         
         # Get the amount of rows and columns needed
         length = len(ciphertext)
-        key_order = self.key_order(self.key) 
+        key_order = self._key_order
         col = len(key_order)
         rows = length // col
 
-        # Populate matrix and decrypt the string
-        matrix = utilities.new_matrix(rows, col, self.pad)
-        col_counter = 0
-        string_count = 0  
-        while col_counter < col and string_count < length: 
-            index = key_order[col_counter]
-            row_counter = 0
-            while(row_counter < rows and string_count < length): 
-                matrix[row_counter][index] = ciphertext[string_count]
-                row_counter += 1
-                string_count += 1
-            col_counter += 1
-
-        # Turn matrix into string counterpart 
-        matrix[-1] = [element for element in matrix[-1] if element != self.pad]
-        plaintext = utilities.matrix_to_string(matrix)
+        # Every column holds rows characters, column k starts at k*rows
+        # Characters beyond rows*col do not fit in the table and are dropped
+        table = [self.pad] * (max(rows, 2) * col)
+        for k, index in enumerate(key_order):
+            table[index:rows*col:col] = ciphertext[k*rows:(k+1)*rows]
+
+        # Turn table into string counterpart, dropping padding from the last row
+        last_row = (max(rows, 2) - 1) * col
+        plaintext = "".join(table[:last_row]) + "".join(table[last_row:]).replace(self.pad, "")
 
         # Insert the spaces back into the cipher text 
-        plaintext = utilities.insert_positions(plaintext,positions_of_white_spaces)
+        plaintext = utilities.insert_mask(plaintext,white_spaces)
 
         
         return plaintext
 
+    @utilities.log_call
+    def encrypt_bytes(self,data,inplace=False):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+                      inplace (bool): write the result into data, default = False
+                          data must be a bytearray, it grows by the padding
+        Return:       ciphertext (bytes), or data if inplace
+        Description:  Same as encrypt for bytes, spaces (b' ') keep their place
+                  Example: encrypt_bytes(b'abc def') == encrypt('abc def').encode()
+        ---------------------------------------------------
+        """
+        cleaned, spaces = self._byte_mask(_as_bytes(data))
+
+        length = len(cleaned)
+        col = len(self._key_order)
+        rows = (length // col) + 1
+        padded = cleaned + self.pad.encode("latin-1") * (rows*col - length)
+
+        if inplace and len(spaces) == 0:
+            # Columns go straight into the caller's buffer
+            data.extend(padded[length:])
+            for k, index in enumerate(self._key_order):
+                data[k*rows:(k+1)*rows] = padded[index::col]
+            return data
+
+        ciphertext = b"".join([padded[index::col] for index in self._key_order])
+        return self._byte_result(data, self._insert_bytes(ciphertext, spaces), inplace)
+
+    @utilities.log_call
+    def decrypt_bytes(self,data,inplace=False):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+                      inplace (bool): write the result into data, default = False
+                          data must be a bytearray
+        Return:       plaintext (bytes), or data if inplace
+        Description:  Same as decrypt for bytes, spaces (b' ') keep their place
+        ---------------------------------------------------
+        """
+        ciphertext, spaces = self._byte_mask(_as_bytes(data))
+
+        length = len(ciphertext)
+        col = len(self._key_order)
+        rows = length // col
+        pad = self.pad.encode("latin-1")
+
+        # Same table quirks as decrypt: at least two rows, extra characters dropped
+        table = bytearray(pad * (max(rows, 2) * col))
+        for k, index in enumerate(self._key_order):
+            table[index:rows*col:col] = ciphertext[k*rows:(k+1)*rows]
+        last_row = (max(rows, 2) - 1) * col
+        table[last_row:] = table[last_row:].replace(pad, b"")
+
+        return self._byte_result(data, self._insert_bytes(table, spaces), inplace)
+
+    @staticmethod
+    def _byte_mask(data):
+        """
+        Private helper method which returns data without spaces and the
+        offsets of the spaces (bytes version of utilities.get_mask)
+        """
+        if b" " not in data: return data, []
+        spaces = [match.start() for match in re.finditer(b" ", data)]
+        return data.replace(b" ", b""), spaces
+
+    @staticmethod
+    def _insert_bytes(data, spaces):
+        """
+        Private helper method which inserts the spaces found by _byte_mask
+        back into data (bytes version of utilities.insert_mask)
+        """
+        if len(spaces) == 0: return data
+        cuts = [offset - i for i, offset in enumerate(spaces)]
+        pieces = [data[start:end] for start, end in zip([0] + cuts, cuts)]
+        return b" ".join(pieces) + b" " + data[cuts[-1]:]
+
+    @staticmethod
+    def _byte_result(data, result, inplace):
+        """
+        Private helper method which copies result into data if inplace
+        """
+        if not inplace: return bytes(result)
+        data[:] = result
+        return data
+
+    @staticmethod
+    def cryptanalyze(ciphertext,pad=DEFAULT_PAD,max_width=20,restarts=8,seed=None,ngram_file=None):
+        """
+        ----------------------------------------------------
+        Static method
+        Parameters:   ciphertext (str)
+                      pad (str): padding character, default = q
+                      max_width (int): largest column count tried, default = 20
+                      restarts (int): hill climbing runs per width, default = 8
+                      seed (int): seed for reproducible results, default = None
+                      ngram_file (str): bigram counts file, default = None (BIGRAM_FILE)
+        Return:       ranked (list): [(key_order, plaintext, score), ...]
+        Description:  Cryptanalysis of Columnar Transposition Cipher
+                      Encryption always pads the last row, so a candidate column
+                          count divides the ciphertext length and at least one
+                          column ends with pad
+                      Columns ending with text are placed before the columns
+                          ending with pad, as in the last row of the plaintext
+                      Each pair of columns is scored once by the bigram log
+                          probabilities of their rows (column-pair matrix),
+                          so a column order is scored without decryption
+                      Widths up to EXHAUSTIVE_WIDTH try every column order,
+                          wider ones use random-restart hill climbing
+                      score is the average log probability of a bigram,
+                          one candidate per width, best first
+                      If no candidate width is found, print error and return []
+                      If BIGRAM_FILE is not installed, the bigrams are derived
+                          from DICT_FILE (see utilities.get_ngram_table)
+        Errors:       if no bigram table can be loaded --> FileNotFoundError
+                      if ngram_file does not hold bigrams --> ValueError
+        ---------------------------------------------------
+        """
+        n, table = utilities.get_ngram_table(utilities.BIGRAM_FILE if ngram_file == None else ngram_file)
+        if n != 2:
+            raise ValueError("Error(Columnar_Transposition.cryptanalyze): bigram file expected, got {}-grams".format(n))
+        text = utilities.get_mask(ciphertext, " ")[0]
+        length = len(text)
+        rng = random.Random(seed)
+
+        ranked = []
+        for col in range(2, min(max_width, len(utilities.get_base('all'))) + 1):
+            rows = length // col
+            if length % col != 0 or rows < 2: continue
+            columns = [text[k*rows:(k+1)*rows] for k in range(col)]
+            padded = [k for k in range(col) if columns[k][-1] == pad]
+            if len(padded) == 0: continue
+            groups = [k for k in range(col) if columns[k][-1] != pad], padded
+
+            matrix = Columnar_Transposition._pair_scores(columns, table)
+            if col <= Columnar_Transposition.EXHAUSTIVE_WIDTH:
+                score, order = Columnar_Transposition._best_order(matrix, groups)
+            else:
+                score, order = max([Columnar_Transposition._climb(matrix, groups, rng) for i in range(restarts)],
+                                   key=lambda result: result[0])
+
+            # order[position] = ciphertext column --> key_order[ciphertext column] = position
+            key_order = [0] * col
+            for position, k in enumerate(order):
+                key_order[k] = position
+            chars = utilities.get_base('lower') if col <= 26 else utilities.get_base('all')
+            key = [""] * col
+            for k, position in enumerate(key_order):
+                key[position] = chars[k]
+            plaintext = Columnar_Transposition("".join(key), pad).decrypt(ciphertext)
+            ranked.append((key_order, plaintext, score / ((col - 1) * (rows - 1))))
+
+        if len(ranked) == 0:
+            print("Columnar_Transposition.cryptanalyze: cryptanalysis failed")
+            return []
+
+        ranked.sort(key=lambda candidate: candidate[2], reverse=True)
+        return ranked
+
+    @staticmethod
+    def _pair_scores(columns, table):
+        """
+        ----------------------------------------------------
+        Parameters:   columns (list of str): ciphertext columns, equal lengths
+                      table (array): bigram log probabilities from get_ngram_table
+        Return:       matrix (list of lists)
+        Description:  Private helper method
+                      matrix[a][b] is the score of column b following column a:
+                          the sum of the bigram log probabilities of every row
+                          except the last one (which holds the padding)
+                      Pairs that are not two letters score as a random pair
+        ---------------------------------------------------
+        """
+        unknown = math.log10(1 / len(table))
+        indices = [[ord(element) - 97 if "a" <= element <= "z" else -1 for element in column[:-1].lower()] 
+                   for column in columns]
+
+        matrix = []
+        for first in indices:
+            matrix.append([sum([table[a * 26 + b] if a >= 0 and b >= 0 else unknown for a, b in zip(first, second)]) 
+                           for second in indices])
+        return matrix
+
+    @staticmethod
+    def _order_score(matrix, order):
+        """
+        Private helper method which returns the score of a column order
+        """
+        return sum([matrix[a][b] for a, b in zip(order, order[1:])])
+
+    @staticmethod
+    def _best_order(matrix, groups):
+        """
+        ----------------------------------------------------
+        Parameters:   matrix (list of lists): column pair scores
+                      groups (tuple): (text columns, pad columns)
+        Return:       score (float), order (list)
+        Description:  Private helper method
+                      Tries every order of the text columns followed by
+                          every order of the pad columns
+        ---------------------------------------------------
+        """
+        best = None
+        for head in permutations(groups[0]):
+            for tail in permutations(groups[1]):
+                order = head + tail
+                score = Columnar_Transposition._order_score(matrix, order)
+                if best == None or score > best[0]:
+                    best = score, list(order)
+        return best
+
+    @staticmethod
+    def _climb(matrix, groups, rng):
+        """
+        ----------------------------------------------------
+        Parameters:   matrix (list of lists): column pair scores
+                      groups (tuple): (text columns, pad columns)
+                      rng (random.Random)
+        Return:       score (float), order (list)
+        Description:  Private helper method
+                      A single hill climbing run from a random column order
+                      Moves a block of columns to another position within its
+                          group, or swaps two columns of a group, while the
+                          score improves
+        ---------------------------------------------------
+        """
+        head, tail = list(groups[0]), list(groups[1])
+        rng.shuffle(head)
+        rng.shuffle(tail)
+        order = head + tail
+        best = Columnar_Transposition._order_score(matrix, order)
+        ranges = [(0, len(head)), (len(head), len(order))]
+
+        improved = True
+        while improved:
+            improved = False
+            for start, end in ranges:
+                candidates = []
+                for i in range(start, end):
+                    for j in range(i + 1, end):
+                        swapped = order[:]
+                        swapped[i], swapped[j] = swapped[j], swapped[i]
+                        candidates.append(swapped)
+                        # Move the block order[i:j] elsewhere within the group
+                        block, rest = order[i:j], order[:i] + order[j:]
+                        for k in range(start, end - len(block) + 1):
+                            if k != i: candidates.append(rest[:k] + block + rest[k:])
+                for candidate in candidates:
+                    score = Columnar_Transposition._order_score(matrix, candidate)
+                    if score > best + 1e-9:
+                        best, order = score, candidate
+                        improved = True
+        return best, order
+
         
 
 class Polybius:
@@ -267,6 +586,14 @@ class Polybius:
     """
     
     DEFAULT_KEY = ('a',5)
+    _numeric = None
+
+    # Prefix checks used by cryptanalyze to reject candidate keys early
+    ANALYSIS_PREFIX = 200       # ciphertext characters checked before a full decrypt
+    MAX_INVALID_PAIRS = 0.1     # maximum ratio of digit pairs outside the square
+    MIN_ALPHA_RATIO = 0.5       # minimum ratio of alpha characters (whitespace excluded)
+    MIN_LANGUAGE_SCORE = 0.045  # minimum average English frequency of decrypted letters
+    MIN_LANGUAGE_LETTERS = 30   # letters needed before the frequency check is applied
 
     def __init__(self,key=DEFAULT_KEY):
         """
@@ -277,6 +604,7 @@ class Polybius:
         ---------------------------------------------------
         """
         self.key = self.DEFAULT_KEY 
+        self._set_tables()
         if key != self.DEFAULT_KEY : self.set_key(key)
         return
 
@@ -378,7 +706,33 @@ class Polybius:
             boolean = False
         else: 
             self.key = key  
+            self._set_tables()
         return boolean
+
+    def _set_tables(self):
+        """
+        ----------------------------------------------------
+        Private helper method
+        Precomputes the square, its base string and the encode/decode maps
+            for the current key:
+            _encode_table: {ord(char): "ij"}, usable with str.translate
+            _decode_table: {"ij": char} for every pair of ASCII digits
+                ("" for pairs outside the square), other pairs use decode
+        ---------------------------------------------------
+        """
+        self._square = self.get_square("list")
+        self._base = utilities.matrix_to_string(self._square)
+        size = len(self._square)
+        self._encode_table = {}
+        self._decode_table = _Translate_Table(self.decode)
+        for i in range(10):
+            for j in range(10):
+                plainchar = ""
+                if 1 <= i <= size and 1 <= j <= size:
+                    plainchar = self._square[i-1][j-1]
+                    self._encode_table[ord(plainchar)] = str(i) + str(j)
+                self._decode_table[str(i) + str(j)] = plainchar
+        return
     
     def __str__(self):
         """
@@ -410,17 +764,13 @@ class Polybius:
         -------------------------------------------------------
         """
         # Handle error cases 
-        base = self._get_base()
-        if plainchar not in base : return ""
+        if plainchar not in self._base : return ""
         if len(plainchar) != 1 : 
             print("Error(Polybius.encode): invalid input")
             return ""
         
         # Find character in square and do correct substitution 
-        square = self.get_square("list")
-        i1,i2 = utilities.index_2d(square, plainchar)
-
-        return str(i1+1) + str(i2+1)
+        return self._encode_table[ord(plainchar)]
 
     def decode(self,cipher):
         """
@@ -441,7 +791,7 @@ class Polybius:
             return "" 
 
         # Get square as well as valid boundries for ciphertext
-        square = self.get_square("list")
+        square = self._square
         rows = len(square)
         col = len(square[0])
         i = int(cipher[0])
@@ -455,6 +805,7 @@ class Polybius:
 
         return plainchar        
     
+    @utilities.log_call
     def encrypt(self,plaintext):
         """
         ----------------------------------------------------
@@ -465,16 +816,9 @@ class Polybius:
         Asserts:      plaintext is a string
         ----------------------------------------------------
         """
-        base = self._get_base()
-        ciphertext = "" 
-        for element in plaintext:
-            if element in base: 
-                ciphertext += self.encode(element)
-            else:
-                ciphertext += element 
-
-        return ciphertext 
+        return plaintext.translate(self._encode_table)
 
+    @utilities.log_call
     def decrypt(self,ciphertext):
         """
         ----------------------------------------------------
@@ -485,25 +829,121 @@ class Polybius:
         Asserts:      ciphertext is a string
         ----------------------------------------------------
         """
-        plaintext = "" 
-        index = 0 
+        # Odd entries are pairs of numeric characters
+        parts = self._numeric_patterns()[0].split(ciphertext)
+        parts[1::2] = map(self._decode_table.__getitem__, parts[1::2])
+
+        return "".join(parts)
+
+    def _decrypt_pairs(self,ciphertext):
+        """
+        ----------------------------------------------------
+        Parameters:   ciphertext (str)
+        Return:       plaintext (str)
+                      index (int): position of the first character not decrypted
+        Description:  Private helper method
+                      Decrypts ciphertext up to its last character
+                      The last character is left undecrypted when it could
+                          still be the first digit of a two digit number
+        ---------------------------------------------------
+        """
+        # Numbers are paired from the start of each run of numeric characters,
+        # so the last character is left alone unless it ends an even length run
+        index = len(ciphertext)
+        tail = index - len(ciphertext.rstrip(self._numeric_patterns()[1]))
+        if index > 0 and (tail == 0 or tail % 2 == 1): 
+            index -= 1
 
-        while index < len(ciphertext) - 1:
-            decode_val = ciphertext[index:index+2] 
-            if decode_val.isnumeric(): 
-                plaintext += self.decode(decode_val)
-                index += 2 
-            else: 
-                plaintext += ciphertext[index]
-                index += 1 
+        return self.decrypt(ciphertext[:index]), index
 
-        if index < len(ciphertext): 
-            plaintext += ciphertext[index]  
+    @utilities.log_call
+    def encrypt_bytes(self,data):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+        Return:       ciphertext (bytes)
+        Description:  Same as encrypt for bytes, which are read as Latin-1
+                          (ASCII data gives the same result as encrypt)
+        ---------------------------------------------------
+        """
+        return self.encrypt(bytes(data).decode("latin-1")).encode("latin-1")
 
-        return plaintext 
+    @utilities.log_call
+    def decrypt_bytes(self,data):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+        Return:       plaintext (bytes)
+        Description:  Same as decrypt for bytes, which are read as Latin-1
+        ---------------------------------------------------
+        """
+        return self.decrypt(bytes(data).decode("latin-1")).encode("latin-1")
 
     @staticmethod
-    def cryptanalyze(ciphertext,args=['',0,0,None,0.93]):
+    def _numeric_patterns():
+        """
+        ----------------------------------------------------
+        Static method
+        Parameters:   -
+        Return:       pair_pattern (compiled pattern)
+                      numeric (str): all numeric characters, 0-9 first
+        Description:  Returns a pattern matching (and capturing) a pair of
+                          numeric characters, and the numeric characters themselves
+                      Numeric follows str.isnumeric (not only 0-9), matching
+                          the pairs accepted by decode
+                      Both are constructed once and shared by all objects
+        ---------------------------------------------------
+        """
+        if Polybius._numeric is None:
+            numeric = "0123456789" + "".join([chr(code) for code in range(128, sys.maxunicode + 1) if chr(code).isnumeric()])
+            # Character class written as ranges of consecutive code points
+            ranges = []
+            for element in numeric:
+                if len(ranges) > 0 and ord(ranges[-1][1]) == ord(element) - 1:
+                    ranges[-1][1] = element
+                else:
+                    ranges.append([element, element])
+            numeric_class = "".join([re.escape(a) + "-" + re.escape(b) for a, b in ranges])
+            Polybius._numeric = (re.compile("([" + numeric_class + "]{2})"), numeric)
+        return Polybius._numeric
+
+    def encrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Encrypts everything read from reader and writes it to writer
+        ---------------------------------------------------
+        """
+        for chunk in utilities.read_chunks(reader, chunk_size):
+            writer.write(self.encrypt(chunk))
+        return
+
+    def decrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Decrypts everything read from reader and writes it to writer
+                      A digit pair split between two chunks is carried over,
+                          so the output is identical to decrypt(reader.read())
+        ---------------------------------------------------
+        """
+        carry = ""
+        for chunk in utilities.read_chunks(reader, chunk_size):
+            chunk = carry + chunk
+            plaintext, index = self._decrypt_pairs(chunk)
+            writer.write(plaintext)
+            carry = chunk[index:]
+        writer.write(carry)
+        return
+
+    @staticmethod
+    def cryptanalyze(ciphertext,args=['',0,0,None,0.93],ranked=False,workers=0,max_words=None):
         """
         ----------------------------------------------------
         Static method
@@ -512,59 +952,149 @@ class Polybius:
                             start_char: (str): default = ''
                             min_size: (int): default = 0
                             max_size: (int): default = 0
-                            dictionary_file (str): default = None
+                            dictionary_file (str): default = None (engmix.txt)
                             threshold (float): default = 0.93
+                      ranked (bool): default = False
+                      workers (int): size of process pool, default = 0 (no pool)
+                      max_words (int): words checked against threshold before a
+                          candidate is fully scored, default = None (all words)
         Return:       key,plaintext
+                      if ranked: candidates (list of (key, plaintext, score))
         Description:  Cryptanalysis of Polybius Cipher
-                      Returns plaintext and key (start_char,size)
+                      Returns plaintext and key (start_char,size) of the best
+                          candidate whose dictionary score reaches threshold
+                      If ranked, returns every candidate that survived the
+                          prefix checks, best dictionary score first
                       Assumes user passes a valid args list
                       Uses bruteforce for the sizes is in range [min_size,max_size]
+                      Each candidate is first checked on a short prefix
+                          (see _prefix_check) and only survivors are fully decrypted
+                      Unless ranked, a decrypted candidate is dropped as soon as
+                          its words cannot reach threshold (see utilities.Plaintext_Scorer)
+                      If workers > 1, square sizes are spread across a process pool
                       The square is always located between [' ', '~'] ASCII characters
         ---------------------------------------------------
         """
-        # Load dict and tester 
-        args[3] = utilities.load_dictionary("engmix.txt")
-        analyze = Polybius()
-        if args[1] == 0 : args[1] = 2 
-        if args[2] == 0 : args[2] = 9
-
-        # Case in which size of square is known 
-        if (args[1] == args[2]):
-            analyze.set_key((args[0],args[1]))
-            if (args[0] != ""):
-                plaintext = analyze.decrypt(ciphertext) 
-                return (args[0],args[1]),plaintext  
-
+        start_char, min_size, max_size, dict_file, threshold = args
+        if min_size == 0 : min_size = 2 
+        if max_size == 0 : max_size = 9
+        if dict_file == None : dict_file = "engmix.txt"
+
+        # Case in which the key is known 
+        if (min_size == max_size and start_char != ""):
+            analyze = Polybius()
+            analyze.set_key((start_char,min_size))
+            plaintext = analyze.decrypt(ciphertext) 
+            if not ranked : return (start_char,min_size),plaintext  
+            return [((start_char,min_size), plaintext, Polybius._dictionary_score(plaintext, dict_file))]
+
+        # Unless ranked, only candidates reaching threshold are scored
+        if (threshold > 1 or threshold < 0): threshold = 0.9
+        check = None if ranked else (threshold, max_words)
+
+        # Candidate keys, grouped by size
+        groups = []
+        for i in range(min_size, max_size+1): 
+            if start_char != "":
+                possible_start_chars = [ord(start_char)]
             else:
-                max_start_char = 126 - (args[1]**2)
-                min_start_char = 32 
-                possible_start_chars = range(min_start_char, max_start_char + 1)
-                for element in possible_start_chars: 
-                    analyze.set_key((chr(element), args[1]))
-                    plaintext = analyze.decrypt(ciphertext)
-                    if utilities.is_plaintext(plaintext, args[3], args[4]) : return analyze.get_key(), plaintext
-        
+                possible_start_chars = range(32, 126 - (i*i) + 1)
+            keys = [(chr(element), i) for element in possible_start_chars if Polybius.valid_key((chr(element), i))]
+            if len(keys) > 0 : groups.append(keys)
+
+        candidates = []
+        if workers is not None and workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(Polybius._score_keys, [ciphertext]*len(groups), groups,
+                                           [dict_file]*len(groups), [check]*len(groups)):
+                    candidates += result
         else:
-            if args[0] != "":  
-                for i in range(args[1], args[2]+1): 
-                    analyze.set_key((args[0], i)) 
-                    plaintext = analyze.decrypt(ciphertext)
-                    if utilities.is_plaintext(plaintext, args[3], args[4]) : return analyze.get_key(), plaintext 
-            else: 
-               for i in range(args[1], args[2]+1): 
-                    max_start_char = 126 - (i*i)
-                    min_start_char = 32 
-                    possible_start_chars = range(min_start_char, max_start_char + 1)
-
-                    for element in possible_start_chars: 
-                        analyze.set_key((chr(element), i))
-                        plaintext = analyze.decrypt(ciphertext)
-                        if utilities.is_plaintext(plaintext, args[3], args[4]) : return analyze.get_key(), plaintext
+            for keys in groups:
+                candidates += Polybius._score_keys(ciphertext, keys, dict_file, check)
 
+        # Best score first, ties keep the search order
+        candidates.sort(key=lambda candidate: -candidate[2])
+        if ranked : return candidates
+
+        if len(candidates) > 0 and candidates[0][2] >= threshold:
+            return candidates[0][0], candidates[0][1]
 
         print("Polybius.cryptanalyze: cryptanalysis failed")
         return "", ""
 
+    @staticmethod
+    def _score_keys(ciphertext, keys, dict_file, check=None):
+        """
+        ----------------------------------------------------
+        Parameters:   ciphertext (str)
+                      keys (list): candidate keys
+                      dict_file (str): dictionary filename
+                      check (tuple): (threshold, max_words), default = None
+                          if given, plaintexts failing is_plaintext are dropped
+        Return:       candidates (list of (key, plaintext, score))
+        Description:  Private helper method (process pool entry point)
+                      Decrypts and scores every key that passes _prefix_check
+        ---------------------------------------------------
+        """
+        candidates = []
+        analyze = Polybius()
+        prefix = ciphertext[:Polybius.ANALYSIS_PREFIX]
+        for key in keys:
+            analyze.set_key(key)
+            if not analyze._prefix_check(prefix) : continue
+            plaintext = analyze.decrypt(ciphertext)
+            if check is not None and not utilities.is_plaintext(plaintext, utilities.get_dictionary(dict_file), *check) : continue
+            candidates.append((key, plaintext, Polybius._dictionary_score(plaintext, dict_file)))
+        return candidates
+
+    def _prefix_check(self,prefix):
+        """
+        ----------------------------------------------------
+        Parameters:   prefix (str): start of the ciphertext
+        Return:       True/False
+        Description:  Private helper method
+                      Cheap test of the current key on a ciphertext prefix
+                      Fails if too many digit pairs fall outside the square,
+                          if too few decrypted characters are alpha, or
+                          if the decrypted letters do not follow English frequencies
+        ---------------------------------------------------
+        """
+        plaintext, index = self._decrypt_pairs(prefix)
+        size = self.key[1]
+        pairs = 0
+        invalid = 0
+        i = 0
+        while i < index:
+            if prefix[i:i+2].isnumeric():
+                pairs += 1
+                if not (1 <= int(prefix[i]) <= size and 1 <= int(prefix[i+1]) <= size) : invalid += 1
+                i += 2
+            else:
+                i += 1
+        if pairs > 0 and invalid / pairs > self.MAX_INVALID_PAIRS : return False
+
+        text = "".join(plaintext.split())
+        letters = [element for element in text.lower() if "a" <= element <= "z"]
+        if len(text) > 0 and len(letters) / len(text) < self.MIN_ALPHA_RATIO : return False
+
+        if len(letters) >= self.MIN_LANGUAGE_LETTERS:
+            freq = utilities.get_language_freq()
+            score = sum([freq[ord(element) - 97] for element in letters]) / len(letters)
+            if score < self.MIN_LANGUAGE_SCORE : return False
+
+        return True
+
+    @staticmethod
+    def _dictionary_score(plaintext, dict_file):
+        """
+        Private helper method which returns the ratio of plaintext words
+        found in the dictionary (0 if there are no words)
+        """
+        matches, words = utilities.score_text(plaintext, utilities.get_dictionary(dict_file))
+        if words == 0 : return 0
+        return matches / words
+
 class Simple_Substitution:
     """
     ----------------------------------------------------
@@ -591,7 +1121,8 @@ class Simple_Substitution:
         ---------------------------------------------------
         """
         self.key = self.DEFAULT_KEY 
-        if key != self.DEFAULT_KEY : self.set_key()
+        self._set_tables()
+        if key != self.DEFAULT_KEY : self.set_key(key)
         return
 
     def get_key(self):
@@ -666,8 +1197,56 @@ class Simple_Substitution:
             new_keyword = self._remove_duplicates(key[0],key[1])
             new_base = self._remove_duplicates(key[1],key[1])
             self.key = (new_keyword, new_base)
+            self._set_tables()
         return boolean 
 
+    def _set_tables(self):
+        """
+        Private helper function which precomputes the encryption and decryption
+        translate tables for the current key (both lower and upper case)
+        """
+        base = self.key[1]
+        chars = base + base.upper()
+        self._encrypt_table = _Translate_Table(self._encrypt_char, chars)
+        self._decrypt_table = _Translate_Table(self._decrypt_char, chars)
+        self._lookup_tables = {}
+        self._byte_tables = {}
+        return
+
+    def _lookup_table(self, mode):
+        """
+        Private helper function which returns the NumPy lookup table of
+        the encryption (mode = 0) or decryption (mode = 1) translate table
+        """
+        if mode not in self._lookup_tables:
+            table = self._encrypt_table if mode == 0 else self._decrypt_table
+            self._lookup_tables[mode] = vectorized.lookup_table(table)
+        return self._lookup_tables[mode]
+
+    def _encrypt_char(self, element):
+        """
+        Private helper function which encrypts a single character
+        """
+        if element.lower() not in self.key[1]:
+            return element
+        table = self.get_table()[1]
+        index = self.key[1].index(element.lower())
+        if element.isupper():
+            return table[index].upper()
+        return table[index]
+
+    def _decrypt_char(self, element):
+        """
+        Private helper function which decrypts a single character
+        """
+        if element.lower() not in self.key[1]:
+            return element
+        table = self.get_table()[1]
+        index = table.index(element.lower())
+        if element.isupper():
+            return self.key[1][index].upper()
+        return self.key[1][index]
+
     def _remove_duplicates(self, string, base):
         """
         Private helper function which removes duplicates in a particular string 
@@ -695,59 +1274,209 @@ class Simple_Substitution:
         output = "Simple Substitution Cipher:\nkey = {}\n{}\n{}".format(self.key[0],a[0],a[1])
         return output 
     
-    def encrypt(self,plaintext: str):
+    @utilities.log_call
+    def encrypt(self,plaintext: str,backend="python"):
         """
         ----------------------------------------------------
         Parameters:   plaintext (str)
+                      backend (str): "python" or "numpy", default = "python"
         Return:       ciphertext (list)
         Description:  Encryption using Simple Substitution Cipher
                       Encrypts only characters defined in base
                       Preserves the case of characters
+                      The numpy backend is used for ASCII text when NumPy is installed
         Asserts:      plaintext is a string
         ----------------------------------------------------
         """
-        ciphertext = ""
-        table = self.get_table()[1]
-        for element in plaintext:
-            if element.lower() not in self.key[1]:
-                ciphertext += element
-            else:
-                is_capital = element.isupper()
-                index = self.key[1].index(element.lower())
-
-                if is_capital:
-                    ciphertext += table[index].upper()
-                else:
-                    ciphertext += table[index]
-        return ciphertext
+        if backend == "numpy" and vectorized.available(plaintext) and self._lookup_table(0) is not None:
+            return vectorized.lookup(plaintext, self._lookup_table(0))
+        return plaintext.translate(self._encrypt_table)
 
-        
-
-    def decrypt(self,ciphertext):
+    @utilities.log_call
+    def decrypt(self,ciphertext,backend="python"):
         """
         ----------------------------------------------------
         Parameters:   ciphertext (str)
+                      backend (str): "python" or "numpy", default = "python"
         Return:       plaintext (list)
         Description:  decryption using Simple Substitution Cipher
                       Decrypts only characters defined in base
                       Preserves the case of characters
+                      The numpy backend is used for ASCII text when NumPy is installed
         Asserts:      ciphertext is a string
         ----------------------------------------------------
         """
-        plaintext = ""
-        table = self.get_table()[1]
-        for element in ciphertext:
-            if element.lower() not in self.key[1]:
-                plaintext += element
-            else:
-                is_capital = element.isupper()
-                index = table.index(element.lower())
+        if backend == "numpy" and vectorized.available(ciphertext) and self._lookup_table(1) is not None:
+            return vectorized.lookup(ciphertext, self._lookup_table(1))
+        return ciphertext.translate(self._decrypt_table)
+
+    @utilities.log_call
+    def encrypt_bytes(self,data):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+        Return:       ciphertext (bytes)
+        Description:  Same as encrypt for bytes, using a 256 byte table
+                      ASCII bytes are substituted, other bytes are kept
+        ---------------------------------------------------
+        """
+        table = _cipher_bytes_table(self, 0)
+        if table is None: return self.encrypt(bytes(data).decode("latin-1")).encode("latin-1")
+        return bytes(_as_bytes(data).translate(table))
+
+    @utilities.log_call
+    def decrypt_bytes(self,data):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+        Return:       plaintext (bytes)
+        Description:  Same as decrypt for bytes, using a 256 byte table
+                      ASCII bytes are substituted, other bytes are kept
+        ---------------------------------------------------
+        """
+        table = _cipher_bytes_table(self, 1)
+        if table is None: return self.decrypt(bytes(data).decode("latin-1")).encode("latin-1")
+        return bytes(_as_bytes(data).translate(table))
+
+    def encrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Encrypts everything read from reader and writes it to writer
+        ---------------------------------------------------
+        """
+        for chunk in utilities.read_chunks(reader, chunk_size):
+            writer.write(chunk.translate(self._encrypt_table))
+        return
+
+    def decrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Decrypts everything read from reader and writes it to writer
+        ---------------------------------------------------
+        """
+        for chunk in utilities.read_chunks(reader, chunk_size):
+            writer.write(chunk.translate(self._decrypt_table))
+        return
+
+    @staticmethod
+    def cryptanalyze(ciphertext, restarts=8, workers=0, seed=None, ngram_file=None):
+        """
+        ----------------------------------------------------
+        Static method
+        Parameters:   ciphertext (str)
+                      restarts (int): number of hill climbing runs, default = 8
+                      workers (int): size of process pool, default = 0 (no pool)
+                      seed (int): seed for reproducible results, default = None
+                      ngram_file (str): n-gram counts file, default = None (NGRAM_FILE)
+        Return:       key (tuple), plaintext (str)
+        Description:  Cryptanalysis of Simple Substitution Cipher over the
+                          lower case English alphabet
+                      Runs random-restart hill climbing over key permutations,
+                          scored by the n-gram log probabilities of the text
+                      Ciphertext n-grams are counted once as integer indices,
+                          and a swap of two letters only rescores the n-grams
+                          containing them (no text is decrypted while climbing)
+                      If workers > 1, restarts run across a process pool
+                      Restart i uses seed + i, so a given seed gives the same
+                          key regardless of workers
+                      The key is returned as (substitution string, base)
+                      If the ciphertext has too few letters, print error
+                          and return "", ""
+        ---------------------------------------------------
+        """
+        n = utilities.get_ngram_table(ngram_file)[0]
+        letters = [ord(element) - 97 for element in ciphertext.lower() if "a" <= element <= "z"]
+        if len(letters) < n:
+            print("Simple_Substitution.cryptanalyze: cryptanalysis failed")
+            return "", ""
+
+        if seed == None: seed = random.randrange(2**32)
+        seeds = [seed + i for i in range(restarts)]
+        args = [letters] * restarts, seeds, [ngram_file] * restarts
+        if workers is not None and workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(Simple_Substitution._climb, *args))
+        else:
+            results = list(map(Simple_Substitution._climb, *args))
+
+        # Best score wins, ties go to the earliest restart
+        score, key = max(results, key=lambda result: result[0])
+
+        # key[cipher letter] = plain letter --> substitution string sub[plain letter] = cipher letter
+        base = utilities.get_base("lower")
+        sub = [""] * 26
+        for cipher_index, plain_index in enumerate(key):
+            sub[plain_index] = base[cipher_index]
+        key = ("".join(sub), base)
+        plaintext = Simple_Substitution(key).decrypt(ciphertext)
+
+        return key, plaintext
 
-                if is_capital:
-                    plaintext += self.key[1][index].upper()
+    @staticmethod
+    def _climb(letters, seed, ngram_file):
+        """
+        ----------------------------------------------------
+        Parameters:   letters (list of int): ciphertext letters (a = 0)
+                      seed (int)
+                      ngram_file (str)
+        Return:       score (float), key (list): key[cipher letter] = plain letter
+        Description:  Private helper method (process pool entry point)
+                      A single hill climbing run from a random key
+                      Swaps of two key letters are kept while they improve the score
+        ---------------------------------------------------
+        """
+        n, table = utilities.get_ngram_table(ngram_file)
+        weights = [26 ** (n - 1 - i) for i in range(n)]
+
+        # Distinct ciphertext n-grams and their counts
+        counts = {}
+        for i in range(len(letters) - n + 1):
+            ngram = tuple(letters[i:i+n])
+            counts[ngram] = counts.get(ngram, 0) + 1
+        ngrams = list(counts.items())
+
+        # N-grams affected by swapping cipher letters a and b
+        by_letter = [set() for i in range(26)]
+        for index, (ngram, count) in enumerate(ngrams):
+            for element in ngram: by_letter[element].add(index)
+        affected = {}
+        for a in range(26):
+            for b in range(a + 1, 26):
+                affected[(a, b)] = [ngrams[index] for index in by_letter[a] | by_letter[b]]
+
+        def score(ngram_list, key):
+            return sum([count * table[sum([key[element] * weight for element, weight in zip(ngram, weights)])] 
+                        for ngram, count in ngram_list])
+
+        rng = random.Random(seed)
+        key = list(range(26))
+        rng.shuffle(key)
+        best = score(ngrams, key)
+
+        improved = True
+        while improved:
+            improved = False
+            for (a, b), ngram_list in affected.items():
+                if len(ngram_list) == 0: continue
+                old = score(ngram_list, key)
+                key[a], key[b] = key[b], key[a]
+                delta = score(ngram_list, key) - old
+                if delta > 1e-9:
+                    best += delta
+                    improved = True
                 else:
-                    plaintext += self.key[1][index]
-        return plaintext
+                    key[a], key[b] = key[b], key[a]
+
+        return best, key
 
 class Vigenere:
     """
@@ -765,6 +1494,11 @@ class Vigenere:
     """
     
     DEFAULT_KEY = 'key'
+    _NON_ALPHA = re.compile("([^a-zA-Z\u212a]+)") # KELVIN SIGN lowers to 'k' 
+    _NON_ALPHA_BYTES = bytes([code for code in range(256) if not chr(code).isascii() or not chr(code).isalpha()])
+    _ALPHA_RUN = re.compile(b"[a-zA-Z]+")
+    _shift_tables = None
+    _byte_shift_tables = None
     
     def __init__(self,key=DEFAULT_KEY):
         """
@@ -806,7 +1540,7 @@ class Vigenere:
             boolean = False 
             key = self.DEFAULT_KEY
         
-        key = utilities.clean_text(key, utilities.get_base("nonalpha") + " ")
+        key = key.translate(utilities.get_delete_table("nonalpha")).replace(" ", "")
         if (len(key) < 2): key += "default"
         self._key = key.lower()
         return boolean
@@ -866,18 +1600,69 @@ class Vigenere:
 
         return vigenere_square
 
-    def encrypt(self,plaintext):
+    @staticmethod
+    def get_shift_tables():
+        """
+        ----------------------------------------------------
+        static method
+        Parameters:   -
+        Return:       shift_tables (dict)
+        Description:  Returns the vigenere square as translate tables
+                      shift_tables[key_char] = (encrypt_table, decrypt_table)
+                      Each table maps lower and upper case characters
+                      Tables are constructed once and shared by all objects
+        ---------------------------------------------------
+        """
+        if Vigenere._shift_tables is None:
+            base = utilities.get_base("lower")
+            vsquare = Vigenere.get_square()
+            shift_tables = {}
+            for row, key_char in enumerate(base):
+                shifted = vsquare[row]
+                # KELVIN SIGN lowers to 'k', it is substituted as an upper case letter
+                plain = base + base.upper()
+                cipher = shifted + shifted.upper()
+                encrypt_table = str.maketrans(plain + "\u212a", cipher + cipher[base.index("k") + 26])
+                decrypt_table = str.maketrans(cipher + "\u212a", plain + plain[shifted.index("k") + 26])
+                shift_tables[key_char] = (encrypt_table, decrypt_table)
+            Vigenere._shift_tables = shift_tables
+        return Vigenere._shift_tables
+
+    @staticmethod
+    def get_byte_shift_tables():
+        """
+        ----------------------------------------------------
+        Static method
+        Parameters:   -
+        Return:       byte_shift_tables (dict):
+                      byte_shift_tables[key_char] = (encrypt_table, decrypt_table)
+                      256 byte tables for bytes.translate, ASCII letters only
+                      Tables are constructed once and shared by all objects
+        ---------------------------------------------------
+        """
+        if Vigenere._byte_shift_tables is None:
+            Vigenere._byte_shift_tables = {key_char: (_bytes_table(tables[0]), _bytes_table(tables[1]))
+                                           for key_char, tables in Vigenere.get_shift_tables().items()}
+        return Vigenere._byte_shift_tables
+
+    @utilities.log_call
+    def encrypt(self,plaintext,backend="python"):
         """
         ----------------------------------------------------
         Parameters:   plaintext (str)
+                      backend (str): "python" or "numpy", default = "python"
         Return:       ciphertext (str)
         Description:  Encryption using Vigenere Cipher
                       May use an auto character or a running key
+                      The numpy backend is used for ASCII text when NumPy is installed
         Asserts:      plaintext is a string
         ---------------------------------------------------
         """
         assert type(plaintext) == str, 'invalid plaintext'
         
+        if backend == "numpy" and vectorized.available(plaintext):
+            shifts = self._key_shifts()
+            if shifts is not None: return vectorized.shift_alpha(plaintext, shifts)
         
         return self._encrypt_run(plaintext)
 
@@ -890,55 +1675,39 @@ class Vigenere:
                       Encryption using Vigenere Cipher Using a running key
         ---------------------------------------------------
         """
-        # First take out all non alpha characters for encryption 
-        base = utilities.get_base("nonalpha") + " " + "\n"
-        positions = utilities.get_positions(plaintext, base)
-        plaintext = utilities.clean_text(plaintext,base)
-
-        # Formulate key of proper length
-        x = len(plaintext) // len(self._key)
-        r = len(plaintext) % len(self._key)
-        key_stream = self._key*x + self._key[0:r+1]
-
-        # Encrypt
-        test = ""
-        vsquare = self.get_square()
-        ciphertext = "" 
-        key_pt = 0
-        base = utilities.get_base("lower")
-        for element in plaintext:
-            test += element
-            flag = element.isupper() 
-            if element.lower() in base:
-                col = base.index(element.lower())
-                row = base.index(key_stream[key_pt])
-                value = vsquare[row][col] 
-                if flag : value = value.upper()
-                ciphertext += value
-                key_pt += 1  
-            else: 
-                ciphertext += element
-                
-        # Add back non alpha characters 
-        ciphertext = utilities.insert_positions(ciphertext, positions)
-        print("vig ciphertext is", ciphertext)
-        
-        return ciphertext
+        return self._translate_run(plaintext, 0)[0]
     
-    def decrypt(self,ciphertext):
+    @utilities.log_call
+    def decrypt(self,ciphertext,backend="python"):
         """
         ----------------------------------------------------
         Parameters:   ciphertext (str)
+                      backend (str): "python" or "numpy", default = "python"
         Return:       plaintext (str)
         Description:  Decryption using Vigenere Cipher
                       May use an auto character or a running key
+                      The numpy backend is used for ASCII text when NumPy is installed
         Asserts:      ciphertext is a string
         ---------------------------------------------------
         """
         assert type(ciphertext) == str, 'invalid input'
 
+        if backend == "numpy" and vectorized.available(ciphertext):
+            shifts = self._key_shifts()
+            if shifts is not None: return vectorized.shift_alpha(ciphertext, [-shift for shift in shifts])
+
         return self._decryption_run(ciphertext)
 
+    def _key_shifts(self):
+        """
+        Private helper method which returns the shift of every key character,
+        or None if the key is empty or has a character outside the lower case base
+        """
+        base = utilities.get_base("lower")
+        shifts = [base.find(key_char) for key_char in self._key]
+        if len(shifts) == 0 or -1 in shifts: return None
+        return shifts
+
     def _decryption_run(self,ciphertext):
         """
         ----------------------------------------------------
@@ -948,86 +1717,796 @@ class Vigenere:
                       Decryption using Vigenere Cipher Using running key
         ---------------------------------------------------
         """
-        # First take out all non alpha characters for encryption 
-        base = utilities.get_base("nonalpha") + " " + "\n"
-        positions = utilities.get_positions(ciphertext, base)
-        ciphertext = utilities.clean_text(ciphertext,base)
+        return self._translate_run(ciphertext, 1)[0]
+
+    def _translate_run(self,text,mode,key_start=0):
+        """
+        ----------------------------------------------------
+        Parameters:   text (str)
+                      mode (int): 0 = encrypt, 1 = decrypt
+                      key_start (int): key position of the first alpha character
+                          default = 0
+        Return:       updated_text (str)
+                      alpha_count (int): number of substituted characters
+        Description:  Private helper method
+                      Applies the running key to the alpha characters of text
+                      Alpha characters are grouped by their key position and
+                          each group is substituted with a single str.translate
+                      All other characters are kept in place
+        ---------------------------------------------------
+        """
+        # Separate alpha runs (even indices) from everything else (odd indices)
+        parts = self._NON_ALPHA.split(text)
+        alpha = "".join(parts[0::2])
+
+        # Substitute every key position in one pass
+        shift_tables = self.get_shift_tables()
+        key_len = len(self._key)
+        substituted = [None] * len(alpha)
+        for key_pt in range(min(key_len, len(alpha))):
+            key_char = self._key[(key_start + key_pt) % key_len]
+            if key_char not in shift_tables:
+                utilities.get_base("lower").index(key_char) # invalid key character
+            substituted[key_pt::key_len] = alpha[key_pt::key_len].translate(shift_tables[key_char][mode])
+        alpha_count = len(alpha)
+        alpha = "".join(substituted)
+
+        # Add back non alpha characters
+        updated_text = []
+        alpha_pt = 0
+        for index, part in enumerate(parts):
+            if index % 2 == 1:
+                updated_text.append(part)
+            else:
+                updated_text.append(alpha[alpha_pt:alpha_pt+len(part)])
+                alpha_pt += len(part)
 
-        # Formulate key of proper length
-        x = len(ciphertext) // len(self._key)
-        r = len(ciphertext) % len(self._key)
-        key_stream = self._key*x + self._key[0:r+1]
+        return "".join(updated_text), alpha_count
 
-        # decrypt
-        vsquare = self.get_square()
-        plaintext = "" 
+    @utilities.log_call
+    def encrypt_bytes(self,data,inplace=False):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+                      inplace (bool): write the result into data, default = False
+                          data must be a bytearray
+        Return:       ciphertext (bytes), or data if inplace
+        Description:  Same as encrypt for bytes, ASCII letters are substituted
+                          and all other bytes are kept
+        ---------------------------------------------------
+        """
+        return self._bytes_run(data, 0, inplace)
+
+    @utilities.log_call
+    def decrypt_bytes(self,data,inplace=False):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+                      inplace (bool): write the result into data, default = False
+                          data must be a bytearray
+        Return:       plaintext (bytes), or data if inplace
+        Description:  Same as decrypt for bytes, ASCII letters are substituted
+                          and all other bytes are kept
+        ---------------------------------------------------
+        """
+        return self._bytes_run(data, 1, inplace)
+
+    def _bytes_run(self,data,mode,inplace):
+        """
+        ----------------------------------------------------
+        Parameters:   data (bytes, bytearray or memoryview)
+                      mode (int): 0 = encrypt, 1 = decrypt
+                      inplace (bool)
+        Return:       updated_data (bytes), or data if inplace
+        Description:  Private helper method
+                      Letters are grouped by key position and every group is
+                          substituted with a single bytes.translate, then the
+                          letters are written back between the other bytes
+                      data is processed in blocks of CHUNK_SIZE bytes, with
+                          inplace the letters of every block are written back
+                          into data (other bytes are never touched), so the
+                          extra memory is a few blocks
+        ---------------------------------------------------
+        """
+        tables = self.get_byte_shift_tables()
+        for key_char in self._key:
+            if key_char not in tables:
+                utilities.get_base("lower").index(key_char) # invalid key character
+        if not inplace: data = bytearray(_as_bytes(data))
+
+        # One block at a time, so only a block is copied
+        key_len = len(self._key)
+        key_start = 0
+        for block_start in range(0, len(data), utilities.CHUNK_SIZE):
+            block_end = min(block_start + utilities.CHUNK_SIZE, len(data))
+            block = bytes(data[block_start:block_end])
+            alpha = block.translate(None, self._NON_ALPHA_BYTES)
+
+            substituted = bytearray(alpha)
+            for key_pt in range(min(key_len, len(alpha))):
+                key_char = self._key[(key_start + key_pt) % key_len]
+                substituted[key_pt::key_len] = alpha[key_pt::key_len].translate(tables[key_char][mode])
+            key_start = (key_start + len(alpha)) % key_len
+
+            if len(substituted) == len(block):
+                data[block_start:block_end] = substituted
+                continue
+            alpha_pt = 0
+            for match in self._ALPHA_RUN.finditer(block):
+                start, end = match.span()
+                data[block_start + start:block_start + end] = substituted[alpha_pt:alpha_pt + end - start]
+                alpha_pt += end - start
+
+        return data if inplace else bytes(data)
+
+    def encrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Encrypts everything read from reader and writes it to writer
+                      The key position is carried across chunks, so the output
+                          is identical to encrypt(reader.read())
+        ---------------------------------------------------
+        """
+        self._stream_run(reader, writer, chunk_size, 0)
+        return
+
+    def decrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Decrypts everything read from reader and writes it to writer
+                      The key position is carried across chunks, so the output
+                          is identical to decrypt(reader.read())
+        ---------------------------------------------------
+        """
+        self._stream_run(reader, writer, chunk_size, 1)
+        return
+
+    def _stream_run(self,reader,writer,chunk_size,mode):
+        """
+        Private helper method which runs _translate_run over a stream of chunks
+        """
         key_pt = 0
+        for chunk in utilities.read_chunks(reader, chunk_size):
+            text, alpha_count = self._translate_run(chunk, mode, key_pt)
+            writer.write(text)
+            key_pt = (key_pt + alpha_count) % len(self._key)
+        return
+
+    # Key length estimation used by cryptanalyze
+    ENGLISH_IOC = 0.0667        # index of coincidence of English text
+    RANDOM_IOC = 0.0385         # index of coincidence of uniformly random letters
+    IOC_TOLERANCE = 0.9         # key lengths within this ratio of the best IoC are candidates
+    ANALYSIS_SAMPLE = 100000    # letters used to estimate the key length
+    KASISKI_SAMPLE = 20000      # letters searched for repeated trigrams
+
+    @staticmethod
+    def cryptanalyze(ciphertext,max_key_len=20):
+        """
+        ----------------------------------------------------
+        Static method
+        Parameters:   ciphertext (str)
+                      max_key_len (int): longest key length tried, default = 20
+        Return:       key,plaintext
+        Description:  Cryptanalysis of Vigenere Cipher (running key)
+                      The key length is estimated from the average index of
+                          coincidence of the key columns (Friedman test),
+                          the smallest length close to the best one is chosen,
+                          using repeated trigram spacing (Kasiski examination)
+                          to break ties
+                      Each key column is then solved by choosing the shift with
+                          the smallest chi-squared statistic against English
+                      A key of length 1 is returned doubled (e.g. 'kk'), since
+                          keys need at least two characters
+                      If the ciphertext has no alpha characters, print error
+                          and return "", ""
+        ---------------------------------------------------
+        """
+        letters = "".join(Vigenere._NON_ALPHA.split(ciphertext)[0::2]).lower()
+        if len(letters) == 0:
+            print("Vigenere.cryptanalyze: cryptanalysis failed")
+            return "", ""
+
+        key_len = Vigenere._key_length(letters, max(1, max_key_len))
+
+        # Solve every column against English letter frequencies
         base = utilities.get_base("lower")
+        language_freq = utilities.get_language_freq()
+        key = ""
+        for counts in Vigenere._column_counts(letters, key_len):
+            expected = [freq * sum(counts) for freq in language_freq]
+            chi_squared = [sum([(counts[(i + shift) % 26] - expected[i])**2 / expected[i] for i in range(26)]) for shift in range(26)]
+            key += base[chi_squared.index(min(chi_squared))]
 
-        for element in ciphertext:
-            #test += element
-            flag = element.isupper() 
-            if element.lower() in base:
-                row = base.index(key_stream[key_pt])
-                index = vsquare[row].index(element.lower())
-                value = base[index] 
-                if flag : value = value.upper()
-                plaintext += value
-                key_pt += 1  
-            else: 
-                plaintext += element 
-        
-        # Add back non alpha characters 
-        plaintext = utilities.insert_positions(plaintext, positions)
+        if len(key) < 2: key *= 2
+        plaintext = Vigenere(key).decrypt(ciphertext, "numpy")
 
-        return plaintext
+        return key, plaintext
+
+    @staticmethod
+    def _column_counts(letters,key_len):
+        """
+        ----------------------------------------------------
+        Parameters:   letters (str): lower case ciphertext letters
+                      key_len (int)
+        Return:       counts (2D list): letter counts (a-z) of every key column
+        Description:  Private helper method
+                      Counts all columns in one pass with the numpy backend,
+                          otherwise with str.count over every column
+                          (same columns as blocks_to_baskets of text_to_blocks)
+        ---------------------------------------------------
+        """
+        if vectorized.available(letters):
+            return vectorized.column_counts(letters, key_len)
+        base = utilities.get_base("lower")
+        return [[letters[i::key_len].count(char) for char in base] for i in range(key_len)]
+
+    @staticmethod
+    def _key_length(letters,max_key_len):
+        """
+        ----------------------------------------------------
+        Parameters:   letters (str): lower case ciphertext letters
+                      max_key_len (int)
+        Return:       key_len (int)
+        Description:  Private helper method
+                      Estimates the key length (see cryptanalyze)
+        ---------------------------------------------------
+        """
+        sample = letters[:Vigenere.ANALYSIS_SAMPLE]
+        max_key_len = min(max_key_len, max(1, len(sample) // 2))
+
+        # Average index of coincidence of the columns for every key length
+        ioc = {}
+        for key_len in range(1, max_key_len + 1):
+            total = 0
+            for counts in Vigenere._column_counts(sample, key_len):
+                n = sum(counts)
+                if n > 1:
+                    total += sum([count * (count - 1) for count in counts]) / (n * (n - 1))
+            ioc[key_len] = total / key_len
+
+        best = max(ioc.values())
+        if best <= Vigenere.RANDOM_IOC:
+            # Columns too short to tell, fall back to the Friedman estimate
+            n = len(sample)
+            kappa = ioc[1]
+            denominator = (n - 1) * kappa - Vigenere.RANDOM_IOC * n + Vigenere.ENGLISH_IOC
+            if denominator <= 0: return 1
+            estimate = round((Vigenere.ENGLISH_IOC - Vigenere.RANDOM_IOC) * n / denominator)
+            return min(max(1, estimate), max_key_len)
+
+        candidates = [key_len for key_len in ioc if ioc[key_len] >= Vigenere.IOC_TOLERANCE * best]
+
+        # Kasiski: share of repeated trigram spacings divisible by each candidate
+        kasiski = Vigenere._kasiski(letters[:Vigenere.KASISKI_SAMPLE])
+        if len(kasiski) > 0 and len(candidates) > 1:
+            shares = {key_len: sum([1 for distance in kasiski if distance % key_len == 0]) / len(kasiski) * key_len for key_len in candidates}
+            best_share = max(shares.values())
+            candidates = [key_len for key_len in candidates if shares[key_len] >= 0.5 * best_share]
+
+        return candidates[0]
+
+    @staticmethod
+    def _kasiski(letters):
+        """
+        Private helper method which returns the distances between
+        consecutive occurrences of every repeated trigram
+        """
+        last_seen = {}
+        distances = []
+        for i in range(len(letters) - 2):
+            trigram = letters[i:i+3]
+            if trigram in last_seen:
+                distances.append(i - last_seen[trigram])
+            last_seen[trigram] = i
+        return distances
 
 class Ceaser_Cipher():
     _base = utilities.get_base("lower")
 
     def __init__(self, key): 
         self._key = key 
+        self._set_tables()
 
     def get_shifted_base(self): 
         return utilities.shift_string(self._base, self._key, "l")
-    
-    def encrypt(self, plaintext: str):
-        # prepare new base based on key
+
+    def _set_tables(self):
+        """
+        Private helper function which precomputes the encryption and decryption
+        translate tables for the current key (both lower and upper case)
+        """
         shifted_base = self.get_shifted_base()
-        print("this is the shifted base", shifted_base)
+        chars = self._base + self._base.upper()
+        self._encrypt_table = _Translate_Table(lambda element: self._shift_char(element, self._base, shifted_base), chars)
+        self._decrypt_table = _Translate_Table(lambda element: self._shift_char(element, shifted_base, self._base), chars)
+        self._byte_tables = {}
+        return
 
+    @staticmethod
+    def _shift_char(element, from_base, to_base):
+        """
+        Private helper function which substitutes a single character
+        """
+        if (not element.isalpha()): return element
+        if (element.isupper()): 
+            index = from_base.find(element.lower())
+            return to_base[index].upper()
+        index = from_base.find(element)
+        return to_base[index]
+    
+    @utilities.log_call
+    def encrypt(self, plaintext: str, backend="python"):
         # encrypt  
-        ciphertext = ""
-        for element in plaintext: 
-            if (not element.isalpha()): ciphertext += element 
-            else:  
-                if (element.isupper()): 
-                    index = self._base.find(element.lower())
-                    ciphertext += shifted_base[index].upper()
-                else: 
-                    index = self._base.find(element)
-                    ciphertext += shifted_base[index]
-        return ciphertext
+        if backend == "numpy" and vectorized.available(plaintext):
+            return vectorized.shift_alpha(plaintext, [self._key])
+        return plaintext.translate(self._encrypt_table)
     
-    def decrypt(self, ciphertext: str):
-        # prepare new base baded on key
-        shifted_base = self.get_shifted_base()
-        print("this is the shifted base", shifted_base) 
-        plaintext = ""
-
+    @utilities.log_call
+    def decrypt(self, ciphertext: str, backend="python"):
         # decrypt
-        for element in ciphertext:  
-            if (not element.isalpha()): plaintext += element 
-            else: 
-                if (element.isupper()): 
-                    index = shifted_base.find(element.lower())
-                    plaintext += self._base[index].upper()
-                else: 
-                    index = shifted_base.find(element)
-                    plaintext += self._base[index]
-        return plaintext
-            
+        if backend == "numpy" and vectorized.available(ciphertext):
+            return vectorized.shift_alpha(ciphertext, [-self._key])
+        return ciphertext.translate(self._decrypt_table)
+
+    @utilities.log_call
+    def encrypt_bytes(self, data):
+        # ASCII letters are shifted with a 256 byte table, other bytes are kept
+        return bytes(_as_bytes(data).translate(_cipher_bytes_table(self, 0)))
+
+    @utilities.log_call
+    def decrypt_bytes(self, data):
+        return bytes(_as_bytes(data).translate(_cipher_bytes_table(self, 1)))
+
+    def encrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Encrypts everything read from reader and writes it to writer
+        ---------------------------------------------------
+        """
+        for chunk in utilities.read_chunks(reader, chunk_size):
+            writer.write(chunk.translate(self._encrypt_table))
+        return
+
+    def decrypt_stream(self,reader,writer,chunk_size=utilities.CHUNK_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   reader (file-like): object with a read(size) method
+                      writer (file-like): object with a write(text) method
+                      chunk_size (int): characters per read, default = CHUNK_SIZE
+        Return:       -
+        Description:  Decrypts everything read from reader and writes it to writer
+        ---------------------------------------------------
+        """
+        for chunk in utilities.read_chunks(reader, chunk_size):
+            writer.write(chunk.translate(self._decrypt_table))
+        return
+
+    @staticmethod
+    def cryptanalyze(ciphertext, confirm=False, dict_file=None, threshold=0.9):
+        """
+        ----------------------------------------------------
+        Static method
+        Parameters:   ciphertext (str)
+                      confirm (bool): check the best candidate with the dictionary
+                          default = False
+                      dict_file (str): dictionary filename, default = None (DICT_FILE)
+                      threshold (float): is_plaintext threshold, default = 0.9
+        Return:       key (int), plaintext (str), ranked (list of (key, confidence))
+        Description:  Cryptanalysis of Ceaser Cipher
+                      Letters are counted once (upper and lower case combined)
+                      Every shift is scored by rotating the count vector and
+                          computing its chi-squared statistic against English
+                      Confidence of a shift is its likelihood exp(-chi_squared/2)
+                          relative to all shifts (confidences add up to 1)
+                      Returns the best key and its plaintext, and all keys ranked
+                      If confirm and the plaintext fails the dictionary check,
+                          print error and return "", "", ranked
+        ---------------------------------------------------
+        """
+        base = utilities.get_base("lower")
+        counts = utilities.get_freq(ciphertext, base + base.upper())
+        counts = [counts[i] + counts[i+26] for i in range(26)]
+        total = sum(counts)
+        if total == 0:
+            print("Ceaser_Cipher.cryptanalyze: cryptanalysis failed")
+            return "", "", []
+
+        # plaintext letter i is ciphertext letter i+key
+        expected = [freq * total for freq in utilities.get_language_freq()]
+        chi_squared = []
+        for key in range(26):
+            rotated = counts[key:] + counts[:key]
+            chi_squared.append(sum([(rotated[i] - expected[i])**2 / expected[i] for i in range(26)]))
+
+        best = min(chi_squared)
+        likelihood = [math.exp(-(value - best) / 2) for value in chi_squared]
+        ranked = sorted([(key, likelihood[key] / sum(likelihood)) for key in range(26)], key=lambda item: -item[1])
+
+        key = ranked[0][0]
+        plaintext = Ceaser_Cipher(key).decrypt(ciphertext)
+        if confirm and not utilities.is_plaintext(plaintext, utilities.get_dictionary(dict_file), threshold):
+            print("Ceaser_Cipher.cryptanalyze: cryptanalysis failed")
+            return "", "", ranked
+
+        return key, plaintext, ranked
+
+def _tuple_key(key):
+    """
+    Private helper function which converts a JSON list key into a tuple key
+    """
+    if isinstance(key, list): key = tuple(key)
+    return key
+
+def _str_key(key):
+    """
+    Private helper function which accepts only str keys (no JSON null, bool or number)
+    """
+    if not isinstance(key, str): raise TypeError("key must be a str")
+    return key
 
+def _int_key(key):
+    """
+    Private helper function which converts a number or a numeric string into
+    a shift (JSON true/false and non-integral numbers such as 3.9 are not shifts)
+    """
+    if isinstance(key, bool): raise TypeError("key must be an int")
+    if isinstance(key, float) and not key.is_integer(): raise ValueError("key must be an integer")
+    return int(key)
 
+def _valid_shift(key):
+    """
+    Private helper function which checks if key is a valid Ceaser Cipher shift
+    """
+    return isinstance(key, int) and not isinstance(key, bool)
+
+# Ciphers reachable by name: name --> (class, key parser, key validator)
+CIPHERS = {
+    "columnar_transposition": (Columnar_Transposition, _str_key, Columnar_Transposition.valid_key),
+    "polybius": (Polybius, _tuple_key, Polybius.valid_key),
+    "simple_substitution": (Simple_Substitution, _tuple_key, Simple_Substitution.valid_key),
+    "vigenere": (Vigenere, _str_key, Vigenere.valid_key),
+    "ceasar": (Ceaser_Cipher, _int_key, _valid_shift),
+}
+
+def _cipher_args(name, key, pad=None):
+    """
+    Private helper function which returns (cipher class, constructor arguments)
+    for a cipher name and a key, or (None, None) if the cipher is not defined
+    """
+    if name not in CIPHERS: return None, None
+    cipher_class, parse_key = CIPHERS[name][:2]
+    args = (parse_key(key),)
+    if cipher_class is Columnar_Transposition:
+        args += (Columnar_Transposition.DEFAULT_PAD if pad == None else pad,)
+    return cipher_class, args
+
+def get_engine(name, key, pad=None):
+    """
+    ----------------------------------------------------
+    Parameters:   name (str): a name defined in CIPHERS
+                  key (?): cipher key, as received (e.g. a JSON list or a string)
+                  pad (str): padding character for columnar_transposition
+                      default = None (DEFAULT_PAD)
+    Return:       cipher (?): a cipher object, None if the key is invalid
+    Description:  Parses and validates the key with the registry entry of
+                      name and constructs the cipher object
+                  The result (None included) can be cached per (name, key, pad)
+    Errors:       if the cipher is not defined -->
+                      print 'Error(get_engine): undefined cipher'
+                      return None
+    ---------------------------------------------------
+    """
+    if name not in CIPHERS:
+        print("Error(get_engine): undefined cipher")
+        return None
+    try:
+        cipher_class, args = _cipher_args(name, key, pad)
+        if not CIPHERS[name][2](args[0]): return None
+    except (TypeError, ValueError):
+        return None
+    return cipher_class(*args)
+
+def _batch_args(item):
+    """
+    Private helper function which returns (cipher class, constructor arguments)
+    for a batch item, or (None, None) if the cipher is not defined
+    """
+    return _cipher_args(item.get("cipher"), item["key"], item.get("pad"))
 
-    
\ No newline at end of file
+def _valid_batch_item(item):
+    """
+    Private helper function which checks the shape of a batch item:
+    a dict with a key and str cipher, encryptFlag and userInput
+    """
+    if not isinstance(item, dict) or "key" not in item:
+        return False
+    return all([isinstance(item.get(field), str) for field in ("cipher", "encryptFlag", "userInput")])
+
+def _batch_run(cipher, item):
+    """
+    Private helper function which encrypts or decrypts a single batch item
+    """
+    if item["encryptFlag"] == "encrypt":
+        return cipher.encrypt(item["userInput"])
+    return cipher.decrypt(item["userInput"])
+
+def _batch_group(cipher_class, args, items):
+    """
+    Private helper function which processes a group of batch items
+    sharing the same key using a single cipher object (worker process entry point)
+    """
+    cipher = cipher_class(*args)
+    return [_batch_run(cipher, item) for item in items]
+
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+def _get_batch_pool(workers):
+    """
+    Private helper function which returns the process pool of batch_process,
+    created on first use (recreated if the number of workers changes)
+    """
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is not None and _batch_pool._max_workers != workers:
+            _batch_pool.shutdown(wait=False)
+            _batch_pool = None
+        if _batch_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            _batch_pool = ProcessPoolExecutor(max_workers=workers)
+    return _batch_pool
+
+def _batch_chunks(indices, items, size):
+    """
+    Private helper function which splits the indices of a group into chunks
+    of about size input characters
+    """
+    chunk = []
+    chunk_size = 0
+    for index in indices:
+        chunk.append(index)
+        chunk_size += len(items[index]["userInput"])
+        if chunk_size >= size:
+            yield chunk
+            chunk = []
+            chunk_size = 0
+    if len(chunk) > 0: yield chunk
+
+def batch_process(items, workers=0, cache=None):
+    """
+    ----------------------------------------------------
+    Parameters:   items (list): list of dict {cipher, key, encryptFlag, userInput}
+                      cipher: a name defined in CIPHERS
+                      key: cipher key (lists are converted to tuples)
+                      encryptFlag: 'encrypt' or 'decrypt'
+                      pad (optional): padding character for columnar_transposition
+                  workers (int): size of process pool, default = 0 (no pool)
+                  cache (utilities.LRU_Cache): shared cipher cache, default = None
+                      its entries are (cipher, key is valid) pairs
+    Return:       results (list): result str of every item, in order
+                      None for an item that could not be processed
+    Description:  Encrypts/decrypts every item and returns the results in order
+                  Items that share a cipher and key reuse one cipher object
+                  If workers > 1, items are split into chunks of about
+                      1/(2*workers) of the total input, every chunk holding
+                      items of a single key, and the chunks run in a process
+                      pool that is created once and reused by later calls
+    Errors:       if items is not a list -->
+                      print 'Error(batch_process): invalid items' and return []
+                  if an item is not a dict with a key and str cipher,
+                      encryptFlag and userInput -->
+                      print 'Error(batch_process): invalid item'
+                      its result is None
+                  if an item uses an undefined cipher -->
+                      print 'Error(batch_process): undefined cipher'
+                      its result is None
+                  if an item has a key that cannot be parsed or is not valid -->
+                      print 'Error(batch_process): invalid key'
+                      its result is None
+    ---------------------------------------------------
+    """
+    if not isinstance(items, list):
+        print("Error(batch_process): invalid items")
+        return []
+
+    results = [None] * len(items)
+    groups = {}
+    valid = {}
+    for index, item in enumerate(items):
+        if not _valid_batch_item(item):
+            print("Error(batch_process): invalid item")
+            continue
+        try:
+            cipher_class, args = _batch_args(item)
+            if cipher_class is None:
+                print("Error(batch_process): undefined cipher")
+                continue
+            # Same check as get_engine, once per key
+            if (cipher_class, args) not in valid:
+                valid[(cipher_class, args)] = CIPHERS[item["cipher"]][2](args[0])
+            if not valid[(cipher_class, args)]: raise ValueError
+            groups.setdefault((cipher_class, args), []).append(index)
+        except (TypeError, ValueError):
+            # e.g. an unhashable key, a key that is not a number or a key rejected by valid_key
+            print("Error(batch_process): invalid key")
+
+    if workers is not None and workers > 1 and len(groups) > 0:
+        pool = _get_batch_pool(workers)
+        total = sum([len(items[index]["userInput"]) for indices in groups.values() for index in indices])
+        size = max(1, total // (2 * workers))
+        futures = []
+        for (cipher_class, args), indices in groups.items():
+            for chunk in _batch_chunks(indices, items, size):
+                group_items = [items[index] for index in chunk]
+                futures.append((chunk, pool.submit(_batch_group, cipher_class, args, group_items)))
+        for chunk, future in futures:
+            for index, text in zip(chunk, future.result()):
+                results[index] = text
+        return results
+
+    if cache is None: cache = utilities.LRU_Cache(len(groups))
+    for (cipher_class, args), indices in groups.items():
+        cache_key = (cipher_class.__name__, utilities.typed_key(args))
+        cipher = cache.get(cache_key, lambda: (cipher_class(*args), True))[0]
+        for index in indices:
+            results[index] = _batch_run(cipher, items[index])
+
+    return results
+
+# Inputs shorter than this are processed serially by parallel_encrypt/parallel_decrypt
+PARALLEL_MIN_SIZE = 1000000
+
+def parallel_encrypt(cipher, text, workers=None, min_size=PARALLEL_MIN_SIZE):
+    """
+    ----------------------------------------------------
+    Parameters:   cipher (?): a Ceaser_Cipher, Simple_Substitution, Polybius
+                      or Vigenere object
+                  text (str)
+                  workers (int): size of process pool, default = None (CPU count)
+                  min_size (int): shorter texts are encrypted serially,
+                      default = PARALLEL_MIN_SIZE
+    Return:       ciphertext (str)
+    Description:  Same result as cipher.encrypt(text), computed on several cores
+                  The text is split into chunks which are shared with the
+                      workers through multiprocessing.shared_memory
+                  Vigenere chunks start at the key position given by a prefix
+                      count of the alpha characters of the previous chunks
+                  Other ciphers (Columnar_Transposition) are run serially
+    ---------------------------------------------------
+    """
+    return _parallel_run(cipher, text, 0, workers, min_size)
+
+def parallel_decrypt(cipher, text, workers=None, min_size=PARALLEL_MIN_SIZE):
+    """
+    ----------------------------------------------------
+    Parameters:   cipher (?): a Ceaser_Cipher, Simple_Substitution, Polybius
+                      or Vigenere object
+                  text (str)
+                  workers (int): size of process pool, default = None (CPU count)
+                  min_size (int): shorter texts are decrypted serially,
+                      default = PARALLEL_MIN_SIZE
+    Return:       plaintext (str)
+    Description:  Same result as cipher.decrypt(text), see parallel_encrypt
+                  Polybius chunks never split a run of numeric characters
+    ---------------------------------------------------
+    """
+    return _parallel_run(cipher, text, 1, workers, min_size)
+
+def _parallel_key(cipher):
+    """
+    Private helper function which returns the constructor key of a cipher
+    that can be processed in chunks, or None
+    """
+    if type(cipher) in (Ceaser_Cipher, Vigenere): return cipher._key
+    if type(cipher) in (Simple_Substitution, Polybius): return cipher.get_key()
+    return None
+
+def _chunk_bounds(cipher, text, mode, chunks):
+    """
+    Private helper function which splits text into at most chunks pieces
+    and returns the character offsets [0, ..., len(text)]
+    """
+    bounds = [0]
+    step = len(text) // chunks + 1
+    numeric = type(cipher) is Polybius and mode == 1
+    position = step
+    while position < len(text):
+        # A Polybius number must not be cut in two
+        while numeric and position < len(text) and text[position].isnumeric() and text[position - 1].isnumeric():
+            position += 1
+        if position < len(text): bounds.append(position)
+        position += step
+    bounds.append(len(text))
+    return bounds
+
+def _parallel_run(cipher, text, mode, workers, min_size):
+    """
+    Private helper function for parallel_encrypt (mode = 0) and parallel_decrypt (mode = 1)
+    """
+    key = _parallel_key(cipher)
+    if workers is None: workers = os.cpu_count() or 1
+    if type(cipher) is Vigenere and cipher._key_shifts() is None: key = None
+    if key is None or workers < 2 or len(text) < min_size:
+        return cipher.encrypt(text) if mode == 0 else cipher.decrypt(text)
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    bounds = _chunk_bounds(cipher, text, mode, workers * 2)
+    data = text.encode("utf-8", "surrogatepass")
+    if len(data) == len(text):
+        offsets = bounds
+    else:
+        offsets = [0]
+        for start, end in zip(bounds, bounds[1:]):
+            offsets.append(offsets[-1] + len(text[start:end].encode("utf-8", "surrogatepass")))
+
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        shm.buf[:len(data)] = data
+        del data
+        chunks = list(zip(offsets, offsets[1:]))
+        names = [shm.name] * len(chunks)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            key_starts = [0] * len(chunks)
+            if type(cipher) is Vigenere:
+                # Key position of every chunk = alpha characters before it
+                counts = executor.map(_parallel_count, names, *zip(*chunks))
+                total = 0
+                for i, count in enumerate(counts):
+                    key_starts[i] = total % len(cipher._key)
+                    total += count
+            args = [type(cipher)] * len(chunks), [key] * len(chunks), [mode] * len(chunks)
+            results = executor.map(_parallel_chunk, names, *zip(*chunks), *args, key_starts)
+            return "".join(results)
+    finally:
+        shm.close()
+        shm.unlink()
+
+def _read_chunk(name, start, end):
+    """
+    Private helper function which reads a chunk of text from shared memory
+    """
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(shm.buf[start:end]).decode("utf-8", "surrogatepass")
+    finally:
+        shm.close()
+
+def _parallel_count(name, start, end):
+    """
+    Private helper function which counts the Vigenere alpha characters of a chunk
+    (worker process entry point)
+    """
+    return sum(map(len, Vigenere._NON_ALPHA.split(_read_chunk(name, start, end))[0::2]))
+
+def _parallel_chunk(name, start, end, cipher_class, key, mode, key_start):
+    """
+    Private helper function which encrypts/decrypts a chunk
+    (worker process entry point)
+    """
+    text = _read_chunk(name, start, end)
+    cipher = _worker_cipher(cipher_class, key)
+    if cipher_class is Vigenere:
+        return cipher._translate_run(text, mode, key_start)[0]
+    return cipher.encrypt(text) if mode == 0 else cipher.decrypt(text)
+
+@lru_cache(maxsize=16)
+def _worker_cipher(cipher_class, key):
+    """
+    Private helper function which keeps one cipher object per key in every worker
+    """
+    return cipher_class(key)
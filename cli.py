@@ -0,0 +1,89 @@
+"""
+----------------------------------------------------
+Command line interface for stream encryption/decryption
+Reads the input one chunk at a time, so memory use does not
+    depend on the input size
+Usage:   python cli.py encrypt|decrypt <cipher> <key> [-i input] [-o output]
+         python cli.py compile_dictionary [dict_file] [compiled_file]
+Example: python cli.py encrypt vigenere lemon -i log.txt -o log.enc
+         python cli.py decrypt polybius '["a", 5]' < log.enc
+         python cli.py compile_dictionary engmix.txt
+----------------------------------------------------
+"""
+import argparse
+import json
+import sys
+import ciphers
+import utilities
+
+# Ciphers that support encrypt_stream/decrypt_stream
+STREAM_CIPHERS = ["ceasar", "polybius", "simple_substitution", "vigenere"]
+
+def parse_key(cipher, key):
+    """
+    ----------------------------------------------------
+    Parameters:   cipher (str): a name defined in STREAM_CIPHERS
+                  key (str): command line key, plain text or JSON
+    Return:       key (?): key in the format expected by the cipher
+    Description:  Keys are read as JSON when possible (e.g. '["a", 5]' or 3)
+                  otherwise they are used as plain strings
+                  The key is checked with the validator of the cipher
+    Errors:       if the key cannot be parsed or is not valid -->
+                  raise ValueError
+    ---------------------------------------------------
+    """
+    try:
+        key = json.loads(key)
+    except ValueError:
+        pass
+    _, parser, validator = ciphers.CIPHERS[cipher]
+    try:
+        key = parser(key)
+        valid = validator(key)
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise ValueError("invalid key for {}".format(cipher))
+    return key
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt a stream of text")
+    commands = parser.add_subparsers(dest="mode", required=True)
+    for mode in ["encrypt", "decrypt"]:
+        command = commands.add_parser(mode)
+        command.add_argument("cipher", choices=STREAM_CIPHERS)
+        command.add_argument("key")
+        command.add_argument("-i", "--input", help="input file (default: stdin)")
+        command.add_argument("-o", "--output", help="output file (default: stdout)")
+        command.add_argument("--chunk-size", type=int, default=utilities.CHUNK_SIZE)
+    command = commands.add_parser("compile_dictionary", help="compile a word list for memory mapping")
+    command.add_argument("dict_file", nargs="?", default=utilities.DICT_FILE)
+    command.add_argument("compiled_file", nargs="?")
+    args = parser.parse_args(argv)
+
+    if args.mode == "compile_dictionary":
+        print(utilities.compile_dictionary(args.dict_file, args.compiled_file))
+        return
+
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    try:
+        key = parse_key(args.cipher, args.key)
+    except ValueError as error:
+        parser.error(str(error))
+    cipher = ciphers.CIPHERS[args.cipher][0](key)
+    # newline='' keeps line endings (e.g. CRLF) unchanged
+    reader = open(args.input, 'r', encoding="utf-8", newline='') if args.input else sys.stdin
+    writer = open(args.output, 'w', encoding="utf-8", newline='') if args.output else sys.stdout
+    try:
+        if args.mode == "encrypt":
+            cipher.encrypt_stream(reader, writer, args.chunk_size)
+        else:
+            cipher.decrypt_stream(reader, writer, args.chunk_size)
+    finally:
+        if args.input: reader.close()
+        if args.output: writer.close()
+    return
+
+if __name__ == '__main__':
+    main()
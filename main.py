@@ -1,13 +1,127 @@
 from pydoc import render_doc
 from flask import Flask
-from flask import render_template, jsonify, request
+from flask import render_template, jsonify, request, g, Response
 from flask_cors import CORS, cross_origin
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import ciphers
+import io
+import metrics
+import utilities
 import os 
+import sys
+import threading
+import time
 
 app = Flask(__name__)
 CORS(app)
 
+# Prepared cipher objects are shared between requests that use the same key
+CIPHER_CACHE_SIZE = int(os.getenv("CIPHER_CACHE_SIZE", default=256))
+CIPHER_CACHE_TTL = float(os.getenv("CIPHER_CACHE_TTL", default=3600))
+cipher_cache = utilities.LRU_Cache(CIPHER_CACHE_SIZE, CIPHER_CACHE_TTL)
+
+# Debug events (cipher, input length, duration) are logged when LOG_LEVEL is set
+if os.getenv("LOG_LEVEL"):
+    utilities.configure_logging(os.getenv("LOG_LEVEL").upper())
+
+# Large batches may be spread across a process pool
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", default=0))
+BATCH_PARALLEL_MIN_SIZE = int(os.getenv("BATCH_PARALLEL_MIN_SIZE", default=1000000))
+
+# ASGI mode (asgi_app): request bodies of at least ASGI_OFFLOAD_MIN_SIZE bytes run in a process pool,
+# at most ASGI_MAX_PENDING of them at a time (503 beyond), each for at most ASGI_TIMEOUT seconds (504)
+ASGI_WORKERS = int(os.getenv("ASGI_WORKERS", default=os.cpu_count() or 1))
+ASGI_OFFLOAD_MIN_SIZE = int(os.getenv("ASGI_OFFLOAD_MIN_SIZE", default=256 * 1024))
+ASGI_MAX_PENDING = int(os.getenv("ASGI_MAX_PENDING", default=2 * ASGI_WORKERS))
+ASGI_TIMEOUT = float(os.getenv("ASGI_TIMEOUT", default=30))
+
+# Metrics, served in Prometheus format by /metrics (set METRICS_DIR for several workers)
+REQUESTS = metrics.Counter("http_requests_total", "HTTP requests", ("route", "status"))
+REQUEST_LATENCY = metrics.Histogram("http_request_duration_seconds", "HTTP request latency", ("route",))
+CIPHER_CALLS = metrics.Counter("cipher_calls_total", "Cipher calls", ("cipher", "method"))
+CIPHER_LATENCY = metrics.Histogram("cipher_duration_seconds", "Cipher call latency", ("cipher", "method"))
+CIPHER_INPUT_SIZE = metrics.Histogram("cipher_input_size_chars", "Cipher input size", ("cipher", "method"), 
+                                      buckets=metrics.SIZE_BUCKETS)
+CACHE_REQUESTS = metrics.Counter("cipher_cache_requests_total", "Cipher cache lookups")
+CACHE_MISSES = metrics.Counter("cipher_cache_misses_total", "Cipher cache misses")
+INVALID_KEYS = metrics.Counter("invalid_key_errors_total", "Requests with an invalid key", ("cipher",))
+
+def get_cipher(cipher_class, *key):
+    """
+    Returns a prepared cipher object for the given key (and pad)
+    Objects are cached on (cipher type, key, pad), with the type of every value,
+    together with the result of the key check
+    Every request with an invalid key is counted, cached or not
+    """
+    CACHE_REQUESTS.inc()
+    cache_key = (cipher_class.__name__, utilities.typed_key(key))
+    cipher, valid = cipher_cache.get(cache_key, lambda: new_cipher(cipher_class, *key))
+    if not valid:
+        INVALID_KEYS.inc(cipher_class.__name__)
+    return cipher
+
+def new_cipher(cipher_class, *key):
+    """
+    Creates a (cipher object, key is valid) pair on a cache miss
+    """
+    CACHE_MISSES.inc()
+    valid = not hasattr(cipher_class, "valid_key") or cipher_class.valid_key(key[0])
+    return cipher_class(*key), valid
+
+def get_engine(name, key, pad=None):
+    """
+    Returns the cipher object of a registry entry (None for an invalid key)
+    Key parsing, validation and construction are cached on (name, key, pad),
+    with the type of every value (1 and True are different keys)
+    """
+    CACHE_REQUESTS.inc()
+    cache_key = ("engine", name, utilities.typed_key(key), utilities.typed_key(pad))
+    return cipher_cache.get(cache_key, lambda: new_engine(name, key, pad))
+
+def new_engine(name, key, pad):
+    """
+    Creates the cipher object of a registry entry on a cache miss
+    """
+    CACHE_MISSES.inc()
+    return ciphers.get_engine(name, key, pad)
+
+def run_cipher(cipher, encrypt_flag, text):
+    """
+    Encrypts (encrypt_flag = "encrypt") or decrypts text and records the cipher metrics
+    """
+    method = "encrypt" if encrypt_flag == "encrypt" else "decrypt"
+    start = time.perf_counter()
+    result = getattr(cipher, method)(text)
+    name = type(cipher).__name__
+    CIPHER_CALLS.inc(name, method)
+    CIPHER_LATENCY.observe(time.perf_counter() - start, name, method)
+    CIPHER_INPUT_SIZE.observe(len(text), name, method)
+    return result
+
+def cache_hit_ratio(totals):
+    """
+    Returns the exposition lines of the cipher cache hit ratio of all workers
+    """
+    lookups = sum([values[0] for values in totals.get(CACHE_REQUESTS.name, {}).values()])
+    misses = sum([values[0] for values in totals.get(CACHE_MISSES.name, {}).values()])
+    ratio = (lookups - misses) / lookups if lookups > 0 else 0
+    return ["# HELP cipher_cache_hit_ratio Cipher cache hits / lookups",
+            "# TYPE cipher_cache_hit_ratio gauge",
+            "cipher_cache_hit_ratio {}".format(ratio)]
+
+@app.before_request
+def start_timer():
+    g.start = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    REQUESTS.inc(route, str(response.status_code))
+    if "start" in g:
+        REQUEST_LATENCY.observe(time.perf_counter() - g.start, route)
+    return response
+
 
 @app.route("/")
 @cross_origin(origins='*')
@@ -18,13 +132,10 @@ def hello_world():
 @cross_origin(origins='*')
 def columnar_cipher():
     # get class 
-    print("IN COLUMNAR")
     request_data = request.get_json()
-    cipher = ciphers.Columnar_Transposition(request_data["key"])
-    if (request_data["encryptFlag"] == "encrypt"):
-        response = {"text": cipher.encrypt(request_data["userInput"]) }
-    else: 
-        response = {"text": cipher.decrypt(request_data["userInput"]) }
+    pad = request_data.get("pad", ciphers.Columnar_Transposition.DEFAULT_PAD)
+    cipher = get_cipher(ciphers.Columnar_Transposition, request_data["key"], pad)
+    response = {"text": run_cipher(cipher, request_data["encryptFlag"], request_data["userInput"]) }
 
     return jsonify(response)
 
@@ -32,14 +143,9 @@ def columnar_cipher():
 @cross_origin(origins='*')
 def vigenere_cipher():
     # get class 
-    print("IN VIGEENRE")
     request_data = request.get_json()
-    cipher = ciphers.Vigenere(request_data["key"])
-    if (request_data["encryptFlag"] == "encrypt"):
-        response = {"text": cipher.encrypt(request_data["userInput"]) }
-        print("this is the response", response)
-    else: 
-        response = {"text": cipher.decrypt(request_data["userInput"]) }
+    cipher = get_cipher(ciphers.Vigenere, request_data["key"])
+    response = {"text": run_cipher(cipher, request_data["encryptFlag"], request_data["userInput"]) }
 
     return jsonify(response)
 
@@ -47,15 +153,192 @@ def vigenere_cipher():
 @cross_origin(origins='*')
 def ceasar_cipher():
     # get class 
-    #print("IN CEASAR CIPHER")
     request_data = request.get_json()
-    cipher = ciphers.Ceaser_Cipher(int( request_data["key"] ))
-    if (request_data["encryptFlag"] == "encrypt"):
-        response = {"text": cipher.encrypt(request_data["userInput"]) }
-    else: 
-        response = {"text": cipher.decrypt(request_data["userInput"]) }
+    try:
+        key = int( request_data["key"] )
+    except (TypeError, ValueError):
+        INVALID_KEYS.inc(ciphers.Ceaser_Cipher.__name__)
+        raise
+    cipher = get_cipher(ciphers.Ceaser_Cipher, key)
+    response = {"text": run_cipher(cipher, request_data["encryptFlag"], request_data["userInput"]) }
+
+    return jsonify(response)
+
+@app.route("/ceasar_cipher/crack", methods=["POST"])
+@cross_origin(origins='*')
+def ceasar_crack():
+    request_data = request.get_json()
+    key, plaintext, ranked = ciphers.Ceaser_Cipher.cryptanalyze(request_data["userInput"], request_data.get("confirm", False))
+    response = {"key": key, "text": plaintext, "candidates": [{"key": k, "confidence": c} for k, c in ranked]}
+
+    return jsonify(response)
+
+@app.route("/batch", methods=["POST"])
+@cross_origin(origins='*')
+def batch():
+    # request body is a list of {cipher, key, encryptFlag, userInput}
+    # errors lists the malformed items and the items with an undefined cipher or an invalid key
+    # (their text is null)
+    items = request.get_json()
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return jsonify({"error": "request body must be a list of objects"}), 400
+    workers = 0
+    size = sum(len(item["userInput"]) for item in items if isinstance(item.get("userInput"), str))
+    if size >= BATCH_PARALLEL_MIN_SIZE:
+        workers = BATCH_WORKERS
+    results = ciphers.batch_process(items, workers, cipher_cache)
+    response = {"text": results, "errors": [index for index, text in enumerate(results) if text is None]}
+
+    return jsonify(response)
+
+@app.route("/cipher/<name>", methods=["POST"])
+@cross_origin(origins='*')
+def cipher_route(name):
+    # request body is {key, encryptFlag, userInput} (and pad for columnar_transposition)
+    if name not in ciphers.CIPHERS:
+        return jsonify({"error": "undefined cipher"}), 404
+    request_data = request.get_json()
+    if not isinstance(request_data, dict) or "key" not in request_data:
+        return jsonify({"error": "missing key"}), 400
+    if not isinstance(request_data.get("encryptFlag"), str) or not isinstance(request_data.get("userInput"), str):
+        return jsonify({"error": "encryptFlag and userInput must be strings"}), 400
+    cipher = get_engine(name, request_data["key"], request_data.get("pad"))
+    if cipher is None:
+        INVALID_KEYS.inc(ciphers.CIPHERS[name][0].__name__)
+        return jsonify({"error": "invalid key"}), 400
+    response = {"text": run_cipher(cipher, request_data["encryptFlag"], request_data["userInput"]) }
 
     return jsonify(response)
 
+@app.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.generate_latest(cache_hit_ratio), content_type=metrics.CONTENT_TYPE)
+
+_asgi_pool = None
+_asgi_slots = None
+
+def call_wsgi(environ, body):
+    """
+    ----------------------------------------------------
+    Parameters:   environ (dict): WSGI environ without wsgi.input/wsgi.errors
+                  body (bytes): request body
+    Return:       status (int), headers (list of (bytes, bytes)), data (bytes)
+    Description:  Runs a request through the Flask app and returns the
+                      full response
+                  Module level so it can run in a process pool worker
+    ---------------------------------------------------
+    """
+    environ = dict(environ)
+    environ["wsgi.input"] = io.BytesIO(body)
+    environ["wsgi.errors"] = sys.stderr
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = int(status.split(" ", 1)[0])
+        response["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+        return
+
+    chunks = app(environ, start_response)
+    try:
+        data = b"".join(chunks)
+    finally:
+        if hasattr(chunks, "close"): chunks.close()
+    return response["status"], response["headers"], data
+
+def asgi_environ(scope, length):
+    """
+    Returns the WSGI environ of an ASGI http scope
+    """
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": "HTTP/" + scope.get("http_version", "1.1"),
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(length),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name == "CONTENT_LENGTH": continue
+        if name != "CONTENT_TYPE": name = "HTTP_" + name
+        environ[name] = environ[name] + "," + value if name in environ else value
+    return environ
+
+def get_asgi_pool():
+    """
+    Returns the process pool of the ASGI mode, created on first use
+    """
+    global _asgi_pool, _asgi_slots
+    if _asgi_pool is None:
+        _asgi_slots = threading.BoundedSemaphore(ASGI_MAX_PENDING)
+        _asgi_pool = ProcessPoolExecutor(max_workers=ASGI_WORKERS)
+    return _asgi_pool
+
+async def asgi_app(scope, receive, send):
+    """
+    ----------------------------------------------------
+    Parameters:   scope, receive, send: ASGI 3 interface
+    Description:  ASGI entry point serving the same routes as app
+                  Example: uvicorn main:asgi_app --workers 2
+                  Small requests run inline, request bodies of at least
+                      ASGI_OFFLOAD_MIN_SIZE bytes run in a process pool, so
+                      large payloads do not block the event loop
+                  When ASGI_MAX_PENDING offloaded requests are queued or
+                      running, further large requests get 503
+                  An offloaded request that takes longer than ASGI_TIMEOUT
+                      seconds gets 504 (its worker finishes in the background
+                      and keeps its pending slot until then)
+    ---------------------------------------------------
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if _asgi_pool is not None: _asgi_pool.shutdown(wait=False, cancel_futures=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http": return
+
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect": return
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    body = b"".join(chunks)
+    environ = asgi_environ(scope, len(body))
+
+    if len(body) < ASGI_OFFLOAD_MIN_SIZE or ASGI_WORKERS <= 0:
+        status, headers, data = call_wsgi(environ, body)
+    else:
+        pool = get_asgi_pool()
+        if not _asgi_slots.acquire(blocking=False):
+            status, headers, data = 503, [(b"content-type", b"text/plain"), (b"retry-after", b"1")], b"Server busy"
+        else:
+            future = pool.submit(call_wsgi, environ, body)
+            future.add_done_callback(lambda future: _asgi_slots.release())
+            try:
+                status, headers, data = await asyncio.wait_for(asyncio.wrap_future(future), ASGI_TIMEOUT)
+            except asyncio.TimeoutError:
+                status, headers, data = 504, [(b"content-type", b"text/plain")], b"Request timed out"
+
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": data})
+    return
+
 if __name__ == '__main__':
     app.run(host="0.0.0.0", debug=True, port=os.getenv("PORT", default=5000))
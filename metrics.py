@@ -0,0 +1,345 @@
+"""
+----------------------------------------------------
+Prometheus-style metrics shared by every worker process
+Every process writes its values into its own memory-mapped file in
+    METRICS_DIR (metrics_<pid>_<n>.db), /metrics sums the files of all
+    processes, so the numbers are correct under gunicorn with several workers
+Recording a value is an in-place add on the mapped memory, no I/O
+    or serialization happens on the request path
+If METRICS_DIR is not set, values live in anonymous memory and only
+    the current process is reported
+METRICS_DIR should be emptied before the server starts (files of
+    stopped workers keep counting, like Prometheus counters)
+----------------------------------------------------
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+
+METRICS_DIR = os.getenv("METRICS_DIR")
+FILE_PREFIX = "metrics_"
+FILE_EXT = ".db"
+SEGMENT_SIZE = 64 * 1024
+
+# Latency (seconds) and input size (characters) buckets
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+_registry = []
+
+class _Mapped_Values:
+    """
+    ----------------------------------------------------
+    Description: Fixed size array of floats backed by mmap (one segment)
+                 File layout (native byte order, 8 byte aligned):
+                 header: used bytes (uint64)
+                 entries: key length (uint32), slot count (uint32),
+                          key (utf-8, padded to 8 bytes), slots (float64 each)
+                 The used size is written after the entry, so a reader
+                     never sees a partial entry
+                 A full segment is never remapped, the process opens a new
+                     one instead, so recorded slots stay valid without locking
+    ----------------------------------------------------
+    """
+    _HEADER = struct.Struct("Q")
+    _ENTRY = struct.Struct("II")
+
+    def __init__(self, path=None, size=SEGMENT_SIZE):
+        """
+        ----------------------------------------------------
+        Parameters:   path (str): file name, default = None (anonymous memory)
+                      size (int): bytes, default = SEGMENT_SIZE
+        Description:  Creates an empty segment
+        ---------------------------------------------------
+        """
+        if path is not None:
+            f = open(path, 'w+b')
+            f.truncate(size)
+            self._mmap = mmap.mmap(f.fileno(), size)
+            f.close()
+        else:
+            self._mmap = mmap.mmap(-1, size)
+        self._used = self._HEADER.size
+        self._HEADER.pack_into(self._mmap, 0, self._used)
+        self.values = memoryview(self._mmap).cast('d')
+        return
+
+    def allocate(self, key, count):
+        """
+        ----------------------------------------------------
+        Parameters:   key (str): unique name of the slots
+                      count (int): number of float slots
+        Return:       index (int): index of the first slot in values
+                      None if the segment is full
+        ---------------------------------------------------
+        """
+        encoded = key.encode('utf-8')
+        padded = (len(encoded) + 7) // 8 * 8
+        size = self._ENTRY.size + padded + 8 * count
+        if self._used + size > len(self._mmap): return None
+
+        offset = self._used
+        self._ENTRY.pack_into(self._mmap, offset, len(encoded), count)
+        self._mmap[offset + self._ENTRY.size:offset + self._ENTRY.size + len(encoded)] = encoded
+        index = (offset + self._ENTRY.size + padded) // 8
+        self._used += size
+        self._HEADER.pack_into(self._mmap, 0, self._used)
+        return index
+
+    def data(self):
+        """
+        Returns a copy of the segment contents
+        """
+        return bytes(self._mmap)
+
+    @staticmethod
+    def read(data):
+        """
+        ----------------------------------------------------
+        Static method
+        Parameters:   data (bytes-like): contents of a segment
+        Return:       entries (list): [(key, [values]), ...]
+        ---------------------------------------------------
+        """
+        entries = []
+        used = _Mapped_Values._HEADER.unpack_from(data, 0)[0]
+        offset = _Mapped_Values._HEADER.size
+        while offset < used:
+            length, count = _Mapped_Values._ENTRY.unpack_from(data, offset)
+            offset += _Mapped_Values._ENTRY.size
+            key = bytes(data[offset:offset + length]).decode('utf-8')
+            offset += (length + 7) // 8 * 8
+            entries.append((key, list(struct.unpack_from("{}d".format(count), data, offset))))
+            offset += 8 * count
+        return entries
+
+# Segments of the current process, newest last
+_segments = []
+_lock = threading.Lock()
+
+def _allocate(key, count):
+    """
+    Private helper function which allocates count slots in the current
+    process and returns (values, index)
+    """
+    segment = _segments[-1] if len(_segments) > 0 else None
+    index = segment.allocate(key, count) if segment is not None else None
+    if index is None:
+        path = None
+        if METRICS_DIR:
+            file_name = "{}{}_{}{}".format(FILE_PREFIX, os.getpid(), len(_segments), FILE_EXT)
+            path = os.path.join(METRICS_DIR, file_name)
+        segment = _Mapped_Values(path)
+        _segments.append(segment)
+        index = segment.allocate(key, count)
+    return segment.values, index
+
+def _reset_after_fork():
+    """
+    Private helper function which gives a forked worker its own segments
+    """
+    global _lock
+    _lock = threading.Lock()
+    del _segments[:]
+    for metric in _registry: metric._slots = {}
+    return
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+class _Metric:
+    """
+    ----------------------------------------------------
+    Description: Base class of Counter and Histogram
+                 Every set of label values gets its own slots, allocated
+                     on first use
+    ----------------------------------------------------
+    """
+    TYPE = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        ----------------------------------------------------
+        Parameters:   name (str): metric name
+                      documentation (str): HELP text
+                      labelnames (tuple of str): default = ()
+        Description:  Creates and registers a metric
+        ---------------------------------------------------
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._slots = {}
+        _registry.append(self)
+        return
+
+    def _slot(self, labelvalues):
+        """
+        Private helper method which returns (values, first slot index) of labelvalues
+        """
+        with _lock:
+            if labelvalues not in self._slots:
+                key = json.dumps([self.name] + [str(value) for value in labelvalues])
+                self._slots[labelvalues] = _allocate(key, self._count())
+        return self._slots[labelvalues]
+
+    def _count(self):
+        return 1
+
+class Counter(_Metric):
+    """
+    ----------------------------------------------------
+    Description: Monotonic counter
+                 Usage: REQUESTS = Counter("requests_total", "Requests", ("route",))
+                        REQUESTS.inc("/metrics")
+    ----------------------------------------------------
+    """
+    TYPE = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        """
+        ----------------------------------------------------
+        Parameters:   labelvalues (str): one value per label name
+                      amount (float): default = 1
+        Return:       -
+        ---------------------------------------------------
+        """
+        slot = self._slots.get(labelvalues)
+        if slot is None: slot = self._slot(labelvalues)
+        values, index = slot
+        _lock.acquire()
+        values[index] += amount
+        _lock.release()
+        return
+
+    def samples(self, labelvalues, values):
+        """
+        Returns the exposition lines of one set of label values
+        """
+        return ["{}{} {}".format(self.name, _format_labels(self.labelnames, labelvalues), _format_value(values[0]))]
+
+class Histogram(_Metric):
+    """
+    ----------------------------------------------------
+    Description: Histogram with fixed upper bounds
+                 Slots: one count per bucket (+Inf last), then the sum
+                 Buckets are stored per bucket and made cumulative on export
+    ----------------------------------------------------
+    """
+    TYPE = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._sum_offset = len(self.buckets) + 1
+        super().__init__(name, documentation, labelnames)
+        return
+
+    def _count(self):
+        return len(self.buckets) + 2
+
+    def observe(self, value, *labelvalues):
+        """
+        ----------------------------------------------------
+        Parameters:   value (float)
+                      labelvalues (str): one value per label name
+        Return:       -
+        ---------------------------------------------------
+        """
+        slot = self._slots.get(labelvalues)
+        if slot is None: slot = self._slot(labelvalues)
+        values, index = slot
+        bucket = index + bisect_left(self.buckets, value)
+        _lock.acquire()
+        values[bucket] += 1
+        values[index + self._sum_offset] += value
+        _lock.release()
+        return
+
+    def samples(self, labelvalues, values):
+        """
+        Returns the exposition lines of one set of label values
+        """
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), values):
+            total += count
+            labels = _format_labels(self.labelnames + ("le",), labelvalues + (_format_value(bound),))
+            lines.append("{}_bucket{} {}".format(self.name, labels, _format_value(total)))
+        labels = _format_labels(self.labelnames, labelvalues)
+        lines.append("{}_sum{} {}".format(self.name, labels, _format_value(values[-1])))
+        lines.append("{}_count{} {}".format(self.name, labels, _format_value(total)))
+        return lines
+
+def _format_labels(names, values):
+    """
+    Private helper function which formats {name="value",...}
+    """
+    if len(names) == 0: return ""
+    pairs = ['{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+             for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}"
+
+def _format_value(value):
+    """
+    Private helper function which formats a sample value
+    """
+    if value == float("inf"): return "+Inf"
+    if value == int(value): return str(int(value))
+    return repr(value)
+
+def collect():
+    """
+    ----------------------------------------------------
+    Parameters:   -
+    Return:       totals (dict): {metric name: {label values: [values]}}
+    Description:  Sums the values of every process
+                  Reads every store in METRICS_DIR, or only the store of
+                      the current process if METRICS_DIR is not set
+    ---------------------------------------------------
+    """
+    if METRICS_DIR:
+        stores = []
+        for file_name in sorted(os.listdir(METRICS_DIR)):
+            if file_name.startswith(FILE_PREFIX) and file_name.endswith(FILE_EXT):
+                f = open(os.path.join(METRICS_DIR, file_name), 'rb')
+                stores.append(f.read())
+                f.close()
+    else:
+        stores = [segment.data() for segment in _segments]
+
+    totals = {}
+    for data in stores:
+        if len(data) < _Mapped_Values._HEADER.size: continue
+        for key, values in _Mapped_Values.read(data):
+            key = json.loads(key)
+            labelvalues = tuple(key[1:])
+            metric_totals = totals.setdefault(key[0], {})
+            if labelvalues in metric_totals:
+                metric_totals[labelvalues] = [a + b for a, b in zip(metric_totals[labelvalues], values)]
+            else:
+                metric_totals[labelvalues] = values
+    return totals
+
+def generate_latest(extra=None):
+    """
+    ----------------------------------------------------
+    Parameters:   extra (function): default = None
+                      called with the totals of collect(), returns more
+                      exposition lines (e.g. ratios computed from counters)
+    Return:       output (str): Prometheus text exposition format (0.0.4)
+    ---------------------------------------------------
+    """
+    totals = collect()
+    lines = []
+    for metric in _registry:
+        lines.append("# HELP {} {}".format(metric.name, metric.documentation))
+        lines.append("# TYPE {} {}".format(metric.name, metric.TYPE))
+        for labelvalues, values in sorted(totals.get(metric.name, {}).items()):
+            lines += metric.samples(labelvalues, values)
+    if extra is not None:
+        lines += extra(totals)
+    return "\n".join(lines) + "\n"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
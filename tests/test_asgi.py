@@ -0,0 +1,92 @@
+"""
+----------------------------------------------------
+Tests of the ASGI entry point (main.asgi_app): inline and offloaded
+requests, backpressure (503) and timeouts (504)
+----------------------------------------------------
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+import main
+
+class Stalled_Pool:
+    """
+    Pool whose tasks start at once and never finish until released
+    """
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self.futures.append(future)
+        return future
+
+def request(body):
+    data = json.dumps(body).encode()
+    scope = {"type": "http", "method": "POST", "path": "/vigenere_cipher", "headers": [(b"content-type", b"application/json")]}
+    messages = [{"type": "http.request", "body": data[:10], "more_body": True},
+                {"type": "http.request", "body": data[10:], "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(main.asgi_app(scope, receive, send))
+    return sent[0]["status"], sent[1]["body"]
+
+BODY = {"key": "lemon", "encryptFlag": "encrypt", "userInput": "attack at dawn"}
+
+@pytest.fixture
+def offload(monkeypatch):
+    monkeypatch.setattr(main, "ASGI_OFFLOAD_MIN_SIZE", 0)
+    monkeypatch.setattr(main, "ASGI_WORKERS", 1)
+    monkeypatch.setattr(main, "_asgi_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(main, "cipher_cache", main.utilities.LRU_Cache(main.CIPHER_CACHE_SIZE))
+
+def expected():
+    return json.dumps({"text": main.ciphers.Vigenere("lemon").encrypt("attack at dawn")})
+
+def test_inline(monkeypatch):
+    monkeypatch.setattr(main, "ASGI_OFFLOAD_MIN_SIZE", 1 << 20)
+    status, data = request(BODY)
+    assert status == 200
+    assert json.loads(data) == json.loads(expected())
+
+def test_offloaded(offload, monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(main, "_asgi_pool", pool)
+    status, data = request(BODY)
+    pool.shutdown()
+    assert status == 200
+    assert json.loads(data) == json.loads(expected())
+    # the pending slot is released when the task finishes
+    assert main._asgi_slots.acquire(blocking=False)
+
+def test_busy_returns_503(offload, monkeypatch):
+    monkeypatch.setattr(main, "_asgi_pool", Stalled_Pool())
+    main._asgi_slots.acquire()
+    status, data = request(BODY)
+    assert status == 503
+    assert data == b"Server busy"
+
+def test_timeout_returns_504(offload, monkeypatch):
+    pool = Stalled_Pool()
+    monkeypatch.setattr(main, "_asgi_pool", pool)
+    monkeypatch.setattr(main, "ASGI_TIMEOUT", 0.05)
+    status, data = request(BODY)
+    assert status == 504
+    # the slot stays taken until the worker finishes
+    assert request(BODY)[0] == 503
+    pool.futures[0].set_result((200, [], b""))
+    assert main._asgi_slots.acquire(blocking=False)
@@ -0,0 +1,42 @@
+"""
+----------------------------------------------------
+Tests of the precomputed character-class tables (utilities.get_base,
+get_base_set, get_delete_table) against the original get_base
+----------------------------------------------------
+"""
+import pytest
+import utilities
+
+def reference_base(base_type):
+    lower = "abcdefghijklmnopqrstuvwxyz"
+    upper = lower.upper()
+    num = "0123456789"
+    special = "".join([chr(i) for i in range(ord('!'), 127) if not chr(i).isalnum()])
+    return {
+        'lower': lower, 'upper': upper, 'alpha': upper + lower, 'lowernum': lower + num,
+        'uppernum': upper + num, 'alphanum': upper + lower + num, 'special': special,
+        'nonalpha': special + num, 'B6': num + lower + upper + ' ' + '\n',
+        'BA': upper + lower + num + special + ' \n', 'all': upper + lower + num + special,
+    }.get(base_type, '')
+
+BASE_TYPES = ['lower', 'upper', 'alpha', 'lowernum', 'uppernum', 'alphanum', 'special', 'nonalpha', 'B6', 'BA', 'all']
+
+@pytest.mark.parametrize("base_type", BASE_TYPES)
+def test_tables_match_original(base_type):
+    base = reference_base(base_type)
+    assert utilities.get_base(base_type) == base
+    assert utilities.get_base_set(base_type) == frozenset(base)
+    text = "".join(map(chr, range(300)))
+    assert text.translate(utilities.get_delete_table(base_type)) == "".join([c for c in text if c not in base])
+
+def test_shared_objects():
+    assert utilities.get_base_set("lower") is utilities.get_base_set("lower")
+    assert utilities.get_delete_table("lower") is utilities.get_delete_table("lower")
+    assert "a1, b\t\r\n".translate(utilities.get_delete_table("whitespace")) == "a1,b"
+    assert "a1, b".translate(utilities.get_delete_table("nonalpha")) == "a b"
+
+def test_undefined_base_type(capsys):
+    assert utilities.get_base("undefined") == ""
+    assert utilities.get_base_set("undefined") == frozenset()
+    assert utilities.get_delete_table("undefined") == {}
+    assert capsys.readouterr().out.count("undefined base type") == 3
@@ -0,0 +1,59 @@
+"""
+----------------------------------------------------
+Tests of ciphers.batch_process
+----------------------------------------------------
+"""
+import ciphers
+
+def make_items():
+    items = [{"cipher": "vigenere", "key": "lemon", "encryptFlag": "encrypt", "userInput": "hello world {}".format(i)}
+             for i in range(12)]
+    items.append({"cipher": "ceasar", "key": "3", "encryptFlag": "decrypt", "userInput": "dbc"})
+    items.append({"cipher": "columnar_transposition", "key": "keyword", "encryptFlag": "encrypt", "userInput": "attack at dawn"})
+    return items
+
+def test_serial_results():
+    items = make_items()
+    results = ciphers.batch_process(items)
+    assert results[0] == ciphers.Vigenere("lemon").encrypt("hello world 0")
+    assert results[-2] == "ayz"
+    assert results[-1] == ciphers.Columnar_Transposition("keyword").encrypt("attack at dawn")
+
+def test_pool_matches_serial():
+    items = make_items()
+    serial = ciphers.batch_process(items)
+    assert ciphers.batch_process(items, workers=2) == serial
+    pool = ciphers._batch_pool
+    assert ciphers.batch_process(items, workers=2) == serial
+    assert ciphers._batch_pool is pool
+
+def test_chunks_split_large_groups():
+    items = make_items()
+    chunks = list(ciphers._batch_chunks(list(range(12)), items, 30))
+    assert len(chunks) > 1
+    assert sum(chunks, []) == list(range(12))
+
+def test_invalid_items():
+    items = make_items()
+    items[1] = {"cipher": "polybius", "key": [["!"], 9], "encryptFlag": "encrypt", "userInput": "x"}
+    items[2] = {"cipher": "ceasar", "key": [1], "encryptFlag": "encrypt", "userInput": "x"}
+    items[3] = {"cipher": "undefined", "key": "a", "encryptFlag": "encrypt", "userInput": "x"}
+    results = ciphers.batch_process(items)
+    assert results[1:4] == [None, None, None]
+    assert results[0] == ciphers.Vigenere("lemon").encrypt("hello world 0")
+
+def test_malformed_items():
+    items = make_items()
+    items[1] = {"cipher": "vigenere", "key": "lemon", "userInput": "x"}
+    items[2] = {"cipher": "vigenere", "encryptFlag": "encrypt", "userInput": "x"}
+    items[3] = {"cipher": "vigenere", "key": "lemon", "encryptFlag": "encrypt", "userInput": 5}
+    items[4] = {"cipher": None, "key": "lemon", "encryptFlag": "encrypt", "userInput": "x"}
+    items[5] = "x"
+    items[6] = ["vigenere", "lemon", "encrypt", "x"]
+    expected = [ciphers.Vigenere("lemon").encrypt("hello world 0")] + [None] * 6
+    assert ciphers.batch_process(items)[:7] == expected
+    assert ciphers.batch_process(items, workers=2)[:7] == expected
+    assert ciphers.batch_process(items)[-1] == ciphers.Columnar_Transposition("keyword").encrypt("attack at dawn")
+
+def test_items_not_a_list():
+    assert ciphers.batch_process({"a": 1}) == []
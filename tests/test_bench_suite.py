@@ -0,0 +1,45 @@
+"""
+----------------------------------------------------
+Tests of the benchmark suite (benchmarks/bench_suite.py):
+the cases run, and compare flags regressions
+----------------------------------------------------
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+import bench_suite
+
+def write_results(path, results):
+    path.write_text(json.dumps({"results": {name: {"best": best} for name, best in results.items()}}))
+    return str(path)
+
+def test_cipher_cases_cover_every_cipher():
+    cases = dict(bench_suite.cipher_cases(["1KB"]))
+    for name in ["columnar_transposition", "polybius", "simple_substitution", "vigenere", "ceasar"]:
+        assert name + ".encrypt[1KB]" in cases
+        assert name + ".decrypt[1KB]" in cases
+    for func in cases.values():
+        func()
+
+def test_make_text():
+    assert len(bench_suite.make_text(1000)) == 1000
+    assert len(bench_suite.make_prose(1000)) == 1000
+    assert bench_suite.make_prose(1000) == bench_suite.make_prose(1000)
+
+def test_time_case():
+    result = bench_suite.time_case(lambda: None, 2)
+    assert result["repeat"] == 2
+    assert 0 <= result["best"] <= result["mean"]
+
+def test_compare(tmp_path, capsys):
+    baseline = write_results(tmp_path / "baseline.json", {"a": 1.0, "b": 1.0, "old": 1.0})
+    faster = write_results(tmp_path / "faster.json", {"a": 0.5, "b": 1.05, "new": 1.0})
+    slower = write_results(tmp_path / "slower.json", {"a": 1.5, "b": 1.0})
+    assert bench_suite.main(["compare", baseline, faster]) == 0
+    output = capsys.readouterr().out
+    assert "faster" in output and "only in" in output
+    assert bench_suite.main(["compare", baseline, slower]) == 1
+    assert "1 regression(s)" in capsys.readouterr().out
+    assert bench_suite.main(["compare", baseline, slower, "--threshold", "0.6"]) == 0
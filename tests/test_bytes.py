@@ -0,0 +1,47 @@
+"""
+----------------------------------------------------
+Tests of the bytes paths (encrypt_bytes/decrypt_bytes) against the str paths
+----------------------------------------------------
+"""
+import random
+
+import pytest
+
+import ciphers
+import utilities
+
+def latin1(cipher, method, data):
+    return getattr(cipher, method)(data.decode("latin-1")).encode("latin-1")
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, utilities.CHUNK_SIZE])
+def test_vigenere_inplace_blocks(chunk_size, monkeypatch):
+    monkeypatch.setattr(utilities, "CHUNK_SIZE", chunk_size)
+    rng = random.Random(chunk_size)
+    for key in ["lemon", "ab", "k"]:
+        cipher = ciphers.Vigenere(key)
+        for length in [0, 1, 5, 17, 200]:
+            data = bytes(rng.choice(b"abcXYZ ,.!\n\xe9\xff0") for _ in range(length))
+            expected = latin1(cipher, "encrypt", data)
+            assert cipher.encrypt_bytes(data) == expected
+            buffer = bytearray(data)
+            assert cipher.encrypt_bytes(buffer, inplace=True) is buffer
+            assert buffer == expected
+            assert cipher.decrypt_bytes(memoryview(expected)) == latin1(cipher, "decrypt", expected)
+
+def test_columnar_pad_outside_latin1():
+    cipher = ciphers.Columnar_Transposition("keyword", "€")
+    assert cipher.get_pad() == ciphers.Columnar_Transposition.DEFAULT_PAD
+    assert cipher.encrypt_bytes(b"abc def") == cipher.encrypt("abc def").encode("latin-1")
+
+def test_columnar_latin1_pad():
+    cipher = ciphers.Columnar_Transposition("keyword", "\xe9")
+    assert cipher.get_pad() == "\xe9"
+    ciphertext = cipher.encrypt_bytes(b"attack at dawn")
+    assert ciphertext == latin1(cipher, "encrypt", b"attack at dawn")
+    assert cipher.decrypt_bytes(ciphertext) == b"attack at dawn"
+
+@pytest.mark.parametrize("cipher", [ciphers.Ceaser_Cipher(3), ciphers.Simple_Substitution(("zebra", utilities.get_base("lower")))])
+def test_shared_byte_tables(cipher):
+    data = bytes(range(128))
+    assert cipher.encrypt_bytes(data) == latin1(cipher, "encrypt", data)
+    assert cipher.decrypt_bytes(data) == latin1(cipher, "decrypt", data)
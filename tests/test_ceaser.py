@@ -0,0 +1,37 @@
+"""
+----------------------------------------------------
+Tests of Ceaser_Cipher.cryptanalyze
+----------------------------------------------------
+"""
+import pytest
+import ciphers
+
+PLAINTEXT = "Meet me near the old bridge at seven, bring the documents and tell no one."
+WORDS = ["at", "and", "bridge", "bring", "documents", "me", "meet", "near", "no", "old", "one", "seven", "tell", "the"]
+
+@pytest.fixture
+def dict_file(tmp_path):
+    words = sorted(set(WORDS + [chr(97 + i) for i in range(26)]))
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(words) + "\n")
+    return str(path)
+
+@pytest.mark.parametrize("key", [0, 1, 3, 13, 25])
+def test_finds_key(key):
+    ciphertext = ciphers.Ceaser_Cipher(key).encrypt(PLAINTEXT)
+    found, plaintext, ranked = ciphers.Ceaser_Cipher.cryptanalyze(ciphertext)
+    assert (found, plaintext) == (key, PLAINTEXT)
+    assert sorted([candidate for candidate, confidence in ranked]) == list(range(26))
+    assert ranked[0] == (key, max([confidence for candidate, confidence in ranked]))
+    assert sum([confidence for candidate, confidence in ranked]) == pytest.approx(1)
+
+def test_no_letters():
+    assert ciphers.Ceaser_Cipher.cryptanalyze("123 !?") == ("", "", [])
+
+def test_confirm(dict_file):
+    ciphertext = ciphers.Ceaser_Cipher(7).encrypt(PLAINTEXT)
+    assert ciphers.Ceaser_Cipher.cryptanalyze(ciphertext, True, dict_file)[:2] == (7, PLAINTEXT)
+    # English letter frequencies, but not dictionary words
+    key, plaintext, ranked = ciphers.Ceaser_Cipher.cryptanalyze("Eetm em enra eht dlo gidreb", True, dict_file)
+    assert (key, plaintext) == ("", "")
+    assert len(ranked) == 26
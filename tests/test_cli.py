@@ -0,0 +1,44 @@
+"""
+----------------------------------------------------
+Tests of the command line interface (cli.py)
+----------------------------------------------------
+"""
+import pytest
+import ciphers
+import cli
+
+def run(tmp_path, mode, cipher, key, data, *options):
+    source = tmp_path / "input.txt"
+    target = tmp_path / "output.txt"
+    source.write_bytes(data)
+    cli.main([mode, cipher, key, "-i", str(source), "-o", str(target)] + list(options))
+    return target.read_bytes()
+
+def test_line_endings_are_kept(tmp_path):
+    assert run(tmp_path, "encrypt", "ceasar", "3", b"Hello\r\nWorld\r\n") == b"Khoor\r\nZruog\r\n"
+    assert run(tmp_path, "decrypt", "ceasar", "3", b"Khoor\r\nZruog\r\n") == b"Hello\r\nWorld\r\n"
+
+def test_utf8_round_trip(tmp_path):
+    text = "café über naïve\n"
+    ciphertext = run(tmp_path, "encrypt", "vigenere", "lemon", text.encode("utf-8"), "--chunk-size", "3")
+    assert ciphertext.decode("utf-8") == ciphers.Vigenere("lemon").encrypt(text)
+    assert run(tmp_path, "decrypt", "vigenere", "lemon", ciphertext).decode("utf-8") == text
+
+def test_json_key(tmp_path):
+    ciphertext = run(tmp_path, "encrypt", "polybius", '[" ", 9]', b"abc", "--chunk-size", "1")
+    assert ciphertext.decode() == ciphers.Polybius((" ", 9)).encrypt("abc")
+
+@pytest.mark.parametrize("arguments", [
+    ["encrypt", "vigenere", "123"],
+    ["encrypt", "ceasar", "x"],
+    ["encrypt", "ceasar", "3.5"],
+    ["encrypt", "polybius", '["!", 10]'],
+    ["encrypt", "vigenere", "lemon", "--chunk-size", "0"],
+])
+def test_invalid_arguments(tmp_path, capsys, arguments):
+    source = tmp_path / "input.txt"
+    source.write_text("abc")
+    with pytest.raises(SystemExit) as error:
+        cli.main(arguments + ["-i", str(source), "-o", str(tmp_path / "output.txt")])
+    assert error.value.code == 2
+    assert "error:" in capsys.readouterr().err
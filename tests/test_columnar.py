@@ -0,0 +1,57 @@
+"""
+----------------------------------------------------
+Tests of the slicing Columnar_Transposition engine against
+the original matrix version
+----------------------------------------------------
+"""
+import pytest
+import ciphers
+import utilities
+
+def reference_encrypt(cipher, plaintext):
+    plaintext, white_spaces = utilities.get_mask(plaintext, " ")
+    key_order = cipher._key_order
+    col = len(key_order)
+    rows = len(plaintext) // col + 1
+    matrix = [[cipher.pad] * col for i in range(rows)]
+    for count, character in enumerate(plaintext):
+        matrix[count // col][count % col] = character
+    ciphertext = "".join([matrix[row][index] for index in key_order for row in range(rows)])
+    return utilities.insert_mask(ciphertext, white_spaces)
+
+def reference_decrypt(cipher, ciphertext):
+    ciphertext, white_spaces = utilities.get_mask(ciphertext, " ")
+    key_order = cipher._key_order
+    col = len(key_order)
+    rows = len(ciphertext) // col
+    matrix = [[cipher.pad] * col for i in range(max(rows, 2))]
+    count = 0
+    for index in key_order:
+        for row in range(rows):
+            if count < len(ciphertext):
+                matrix[row][index] = ciphertext[count]
+                count += 1
+    matrix[-1] = [element for element in matrix[-1] if element != cipher.pad]
+    plaintext = "".join(["".join(row) for row in matrix])
+    return utilities.insert_mask(plaintext, white_spaces)
+
+TEXTS = ["attack at dawn", "abc", "", "a", "defend the east wall of the castle", "x" * 23, "the quick brown fox"]
+KEYS = ["keyword", "ab", "zebras", "abcd", "dcba"]
+
+@pytest.mark.parametrize("key", KEYS)
+@pytest.mark.parametrize("text", TEXTS)
+def test_same_output_as_matrix_version(key, text):
+    cipher = ciphers.Columnar_Transposition(key)
+    ciphertext = cipher.encrypt(text)
+    assert ciphertext == reference_encrypt(cipher, text)
+    assert cipher.decrypt(ciphertext) == reference_decrypt(cipher, ciphertext)
+    # ragged ciphertext (trailing characters that do not fill a column)
+    assert cipher.decrypt(ciphertext + "ab") == reference_decrypt(cipher, ciphertext + "ab")
+
+@pytest.mark.parametrize("key", KEYS)
+def test_round_trip_ragged_last_row(key):
+    cipher = ciphers.Columnar_Transposition(key)
+    # texts shorter than the key keep their padding (a table has at least two rows)
+    for length in range(len(key), 3 * len(key) + 2):
+        text = "abcdefghijklmnoprstuvwxyz"[:length]
+        assert cipher.decrypt(cipher.encrypt(text)) == text
@@ -0,0 +1,37 @@
+"""
+----------------------------------------------------
+Tests of Columnar_Transposition.cryptanalyze without installed n-gram files
+----------------------------------------------------
+"""
+import pytest
+
+import ciphers
+import utilities
+
+WORDS = ["attack", "at", "dawn", "the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog",
+         "and", "then", "there", "were", "none", "this", "that", "with", "have"]
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utilities, "_ngram_tables", {})
+    return tmp_path
+
+def test_missing_tables(workdir):
+    ciphertext = ciphers.Columnar_Transposition("keyword").encrypt("attack at dawn")
+    with pytest.raises(FileNotFoundError, match=utilities.BIGRAM_FILE):
+        ciphers.Columnar_Transposition.cryptanalyze(ciphertext)
+
+def test_bigrams_derived_from_dictionary(workdir):
+    (workdir / utilities.DICT_FILE).write_text("\n".join(WORDS) + "\n", encoding="ISO-8859-15")
+    plaintext = "the quick brown fox jumps over the lazy dog and then there were none"
+    ciphertext = ciphers.Columnar_Transposition("key").encrypt(plaintext)
+    ranked = ciphers.Columnar_Transposition.cryptanalyze(ciphertext, max_width=6, seed=1)
+    assert len(ranked) > 0
+    assert plaintext in [candidate[1] for candidate in ranked]
+
+def test_rejects_other_ngram_sizes(workdir):
+    (workdir / "trigrams.txt").write_text("THE 10\nAND 5\n")
+    ciphertext = ciphers.Columnar_Transposition("keyword").encrypt("attack at dawn")
+    with pytest.raises(ValueError):
+        ciphers.Columnar_Transposition.cryptanalyze(ciphertext, ngram_file="trigrams.txt")
@@ -0,0 +1,60 @@
+"""
+----------------------------------------------------
+Tests of the indexed dictionaries: the same results as a plain dict_list
+----------------------------------------------------
+"""
+import pytest
+import utilities
+
+WORDS = ["attack", "at", "dawn", "the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "café"]
+TEXTS = ["", "Attack at dawn!", "The quick brown fox jumps over the lazy dog.", "xq zz the 12 fox",
+         "café Café naïve über", "   \n\t", "a b c d e f g"]
+
+@pytest.fixture
+def dict_file(tmp_path):
+    # one word per line, sorted, every starting letter present (see load_dictionary)
+    words = sorted(set(WORDS + [chr(97 + i) for i in range(26)]))
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(words) + "\n", encoding="ISO-8859-15")
+    return str(path)
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_dictionary_matches_list(dict_file, text):
+    dict_list = utilities.load_dictionary(dict_file)
+    dictionary = utilities.Dictionary(dict_list)
+    assert dictionary.analyze_text(text) == utilities.analyze_text(text, dict_list)
+    for threshold in [0.5, 0.9]:
+        assert dictionary.is_plaintext(text, threshold) == utilities.is_plaintext(text, dict_list, threshold)
+
+def test_get_dictionary_is_shared(dict_file, monkeypatch):
+    monkeypatch.setattr(utilities, "_dictionaries", {})
+    dictionary = utilities.get_dictionary(dict_file)
+    assert isinstance(dictionary, utilities.Dictionary)
+    assert utilities.get_dictionary(dict_file) is dictionary
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_mapped_dictionary_matches_list(dict_file, tmp_path, text):
+    dict_list = utilities.load_dictionary(dict_file)
+    compiled_file = utilities.compile_dictionary(dict_file, str(tmp_path / "words.dic"))
+    dictionary = utilities.Mapped_Dictionary(compiled_file)
+    assert len(dictionary) == len(dict_list)
+    assert [len(group) for group in dictionary] == [len(set(words)) for words in dict_list]
+    assert dictionary.analyze_text(text) == utilities.analyze_text(text, dict_list)
+    for threshold in [0.5, 0.9]:
+        assert dictionary.is_plaintext(text, threshold) == utilities.is_plaintext(text, dict_list, threshold)
+
+def test_mapped_dictionary_lookups(dict_file):
+    dictionary = utilities.Mapped_Dictionary(utilities.compile_dictionary(dict_file))
+    for word in WORDS:
+        assert word in dictionary[ord(word[0]) - 97]
+    assert "attacks" not in dictionary[0]
+    assert "" not in dictionary[0]
+    assert 5 not in dictionary[0]
+
+def test_get_dictionary_uses_compiled_copy(dict_file, monkeypatch):
+    monkeypatch.setattr(utilities, "_dictionaries", {})
+    assert isinstance(utilities.get_dictionary(dict_file), utilities.Dictionary)
+    compiled_file = utilities.compile_dictionary(dict_file)
+    assert compiled_file.endswith(utilities.COMPILED_DICT_EXT)
+    monkeypatch.setattr(utilities, "_dictionaries", {})
+    assert isinstance(utilities.get_dictionary(dict_file), utilities.Mapped_Dictionary)
@@ -0,0 +1,70 @@
+"""
+----------------------------------------------------
+Tests of the queue-based logging (utilities.configure_logging, log_call)
+----------------------------------------------------
+"""
+import logging
+import logging.handlers
+import threading
+
+import pytest
+
+import ciphers
+import utilities
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread())
+
+def drain():
+    # stopping the listener writes every queued record
+    utilities._log_listener.stop()
+    utilities._log_listener = None
+
+@pytest.fixture
+def collector():
+    handler = Collector()
+    level, propagate = utilities.logger.level, utilities.logger.propagate
+    utilities.configure_logging(logging.DEBUG, handler)
+    yield handler
+    if utilities._log_listener is not None: drain()
+    for old_handler in utilities.logger.handlers[:]:
+        if isinstance(old_handler, logging.handlers.QueueHandler): utilities.logger.removeHandler(old_handler)
+    utilities.logger.setLevel(level)
+    utilities.logger.propagate = propagate
+
+def test_log_call_goes_through_queue(collector):
+    handler = collector
+    assert any(isinstance(item, logging.handlers.QueueHandler) for item in utilities.logger.handlers)
+    ciphers.Vigenere("lemon").encrypt("attack at dawn")
+    drain()
+    assert len(handler.records) == 1
+    record = handler.records[0]
+    assert (record.cipher, record.method, record.length) == ("Vigenere", "encrypt", 14)
+    assert record.duration >= 0
+    assert "cipher=Vigenere method=encrypt length=14" in record.getMessage()
+    # written on the listener thread, not by the caller
+    assert handler.threads[0] is not threading.current_thread()
+
+def test_reconfigure_replaces_listener(collector):
+    handler = collector
+    second = Collector()
+    utilities.configure_logging(logging.DEBUG, second)
+    assert len([item for item in utilities.logger.handlers if isinstance(item, logging.handlers.QueueHandler)]) == 1
+    ciphers.Ceaser_Cipher(3).encrypt("abc")
+    drain()
+    assert len(handler.records) == 0
+    assert len(second.records) == 1
+
+def test_no_records_above_debug(collector):
+    handler = collector
+    utilities.logger.setLevel(logging.INFO)
+    ciphers.Vigenere("lemon").encrypt("attack at dawn")
+    drain()
+    assert handler.records == []
@@ -0,0 +1,121 @@
+"""
+----------------------------------------------------
+Tests of the Flask routes (main.py)
+----------------------------------------------------
+"""
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+import main
+import metrics
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "cipher_cache", main.utilities.LRU_Cache(main.CIPHER_CACHE_SIZE))
+    return main.app.test_client()
+
+def counter(metric, *labels):
+    values = metrics.collect().get(metric.name, {}).get(labels)
+    return values[0] if values is not None else 0
+
+def test_invalid_key_counted_on_every_request(client):
+    invalid = counter(main.INVALID_KEYS, "Vigenere")
+    misses = counter(main.CACHE_MISSES)
+    body = {"key": "123", "encryptFlag": "encrypt", "userInput": "abc"}
+    for i in range(3):
+        assert client.post("/vigenere_cipher", json=body).status_code == 200
+    assert counter(main.INVALID_KEYS, "Vigenere") == invalid + 3
+    assert counter(main.CACHE_MISSES) == misses + 1
+
+def test_invalid_key_counted_the_same_on_every_route(client):
+    invalid = counter(main.INVALID_KEYS, "Vigenere")
+    body = {"key": "123", "encryptFlag": "encrypt", "userInput": "abc"}
+    client.post("/vigenere_cipher", json=body)
+    client.post("/cipher/vigenere", json=body)
+    assert counter(main.INVALID_KEYS, "Vigenere") == invalid + 2
+    invalid = counter(main.INVALID_KEYS, "Ceaser_Cipher")
+    for key in ["x", None, ["1"]]:
+        body = {"key": key, "encryptFlag": "encrypt", "userInput": "abc"}
+        assert client.post("/ceasar_cipher", json=body).status_code == 500
+    assert counter(main.INVALID_KEYS, "Ceaser_Cipher") == invalid + 3
+
+def test_engine_keys_are_typed(client):
+    body = {"key": 1, "encryptFlag": "encrypt", "userInput": "abc"}
+    assert client.post("/cipher/ceasar", json=body).json["text"] == "bcd"
+    body["key"] = True
+    assert client.post("/cipher/ceasar", json=body).status_code == 400
+    for key in [None, True, 5, ["a"]]:
+        body = {"key": key, "encryptFlag": "encrypt", "userInput": "abc"}
+        assert client.post("/cipher/vigenere", json=body).status_code == 400
+        assert client.post("/cipher/columnar_transposition", json=body).status_code == 400
+
+def test_batch_validates_every_item(client):
+    items = [
+        {"cipher": "vigenere", "key": "lemon", "encryptFlag": "encrypt", "userInput": "abc"},
+        {"cipher": "vigenere", "key": "123", "encryptFlag": "encrypt", "userInput": "abc"},
+        {"cipher": "vigenere", "key": None, "encryptFlag": "encrypt", "userInput": "abc"},
+        {"cipher": "polybius", "key": ["A", 9], "encryptFlag": "encrypt", "userInput": "abc"},
+        {"cipher": "columnar_transposition", "key": ["a"], "encryptFlag": "encrypt", "userInput": "abc"},
+        {"cipher": "undefined", "key": "a", "encryptFlag": "encrypt", "userInput": "abc"},
+    ]
+    response = client.post("/batch", json=items).json
+    assert response["text"][0] == main.ciphers.Vigenere("lemon").encrypt("abc")
+    assert response["text"][1:] == [None] * 5
+    assert response["errors"] == [1, 2, 3, 4, 5]
+
+def test_route_cache_hits_misses_and_eviction(client, monkeypatch):
+    monkeypatch.setattr(main, "cipher_cache", main.utilities.LRU_Cache(2))
+    for key in ["lemon", "lemon", "kiwi", "lemon", "mango", "kiwi"]:
+        body = {"key": key, "encryptFlag": "encrypt", "userInput": "abc"}
+        assert client.post("/vigenere_cipher", json=body).status_code == 200
+    # kiwi was the least recently used entry when mango was added
+    assert main.cipher_cache.hits == 2
+    assert main.cipher_cache.misses == 4
+    assert main.cipher_cache.stats()["entries"] == 2
+
+def test_route_and_batch_share_typed_cache_keys(client):
+    body = {"key": "lemon", "encryptFlag": "encrypt", "userInput": "abc"}
+    client.post("/vigenere_cipher", json=body)
+    items = [{"cipher": "vigenere", "key": "lemon", "encryptFlag": "encrypt", "userInput": "abc"}]
+    client.post("/batch", json=items)
+    assert main.cipher_cache.hits == 1
+    assert main.utilities.typed_key(1) != main.utilities.typed_key(True)
+    assert main.utilities.typed_key(["a", 1]) != main.utilities.typed_key(["a", "1"])
+
+def test_batch_reports_malformed_items(client):
+    items = [
+        {"cipher": "vigenere", "key": "lemon", "userInput": "abc"},
+        {"cipher": "vigenere", "encryptFlag": "encrypt", "userInput": "abc"},
+        {"cipher": "vigenere", "key": "lemon", "encryptFlag": "encrypt", "userInput": 12},
+        {"cipher": "vigenere", "key": "lemon", "encryptFlag": "encrypt", "userInput": "abc"},
+    ]
+    response = client.post("/batch", json=items)
+    assert response.status_code == 200
+    assert response.json["text"] == [None, None, None, main.ciphers.Vigenere("lemon").encrypt("abc")]
+    assert response.json["errors"] == [0, 1, 2]
+
+def test_batch_body_must_be_a_list_of_objects(client):
+    for body in [{"a": 1}, ["x"], [{"cipher": "ceasar"}, 1], "x", 5]:
+        assert client.post("/batch", json=body).status_code == 400
+
+def test_engine_rejects_fractional_shift(client):
+    body = {"key": 3.9, "encryptFlag": "encrypt", "userInput": "abc"}
+    assert client.post("/cipher/ceasar", json=body).status_code == 400
+    body["key"] = 3.0
+    assert client.post("/cipher/ceasar", json=body).json["text"] == "def"
+
+def test_cipher_route_missing_fields(client):
+    for body in [{"key": "lemon", "userInput": "abc"}, {"key": "lemon", "encryptFlag": "encrypt"},
+                 {"encryptFlag": "encrypt", "userInput": "abc"},
+                 {"key": "lemon", "encryptFlag": "encrypt", "userInput": 5}, ["lemon"]]:
+        assert client.post("/cipher/vigenere", json=body).status_code == 400
+
+def test_ceasar_crack(client):
+    plaintext = "Meet me near the old bridge at seven, bring the documents and tell no one."
+    body = {"userInput": main.ciphers.Ceaser_Cipher(5).encrypt(plaintext)}
+    response = client.post("/ceasar_cipher/crack", json=body).json
+    assert (response["key"], response["text"]) == (5, plaintext)
+    assert len(response["candidates"]) == 26
+    assert response["candidates"][0]["key"] == 5
@@ -0,0 +1,47 @@
+"""
+----------------------------------------------------
+Tests of utilities.get_ngram_table
+----------------------------------------------------
+"""
+import pytest
+
+import utilities
+
+WORDS = ["attack", "dawn", "the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog"]
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utilities, "_ngram_tables", {})
+    return tmp_path
+
+def test_reads_file(workdir):
+    (workdir / "bigrams.txt").write_text("TH 30\nHE 10\n")
+    n, table = utilities.get_ngram_table("bigrams.txt")
+    assert n == 2
+    assert table[19 * 26 + 7] > table[7 * 26 + 4] > table[0]
+
+def test_mixed_lengths(workdir):
+    (workdir / "mixed.txt").write_text("TH 30\nTHE 10\n")
+    with pytest.raises(ValueError):
+        utilities.get_ngram_table("mixed.txt")
+
+def test_empty_file(workdir):
+    (workdir / "empty.txt").write_text("")
+    with pytest.raises(ValueError):
+        utilities.get_ngram_table("empty.txt")
+
+def test_missing_file(workdir):
+    with pytest.raises(FileNotFoundError, match="nofile.txt"):
+        utilities.get_ngram_table("nofile.txt")
+    with pytest.raises(FileNotFoundError, match=utilities.DICT_FILE):
+        utilities.get_ngram_table()
+
+def test_derived_from_dictionary(workdir):
+    (workdir / utilities.DICT_FILE).write_text("\n".join(WORDS) + "\n", encoding="ISO-8859-15")
+    assert utilities.get_ngram_counts(utilities.DICT_FILE, 2)["at"] == 1
+    n, table = utilities.get_ngram_table()
+    assert n == 4
+    n, table = utilities.get_ngram_table(utilities.BIGRAM_FILE)
+    assert n == 2
+    assert table[0 * 26 + 19] > table[25 * 26 + 25]
@@ -0,0 +1,41 @@
+"""
+----------------------------------------------------
+Tests of parallel_encrypt/parallel_decrypt: same output as the serial
+cipher methods, whatever the chunk boundaries
+----------------------------------------------------
+"""
+import random
+
+import pytest
+
+import ciphers
+
+ALPHABET = "abcxyzKLMQ .,;:!?-'\n0123456789éß漢"
+
+def make_ciphers():
+    return [ciphers.Ceaser_Cipher(3), ciphers.Simple_Substitution(("zebra", "abcdefghijklmnopqrstuvwxyz")),
+            ciphers.Polybius((" ", 9)), ciphers.Vigenere("lemon"), ciphers.Vigenere("k!y")]
+
+@pytest.mark.parametrize("index", range(5))
+def test_matches_serial(index):
+    cipher = make_ciphers()[index]
+    rng = random.Random(index)
+    for length in [0, 1, 7, 500]:
+        text = "".join(rng.choice(ALPHABET) for _ in range(length))
+        ciphertext = cipher.encrypt(text)
+        assert ciphers.parallel_encrypt(cipher, text, workers=2, min_size=0) == ciphertext
+        assert ciphers.parallel_decrypt(cipher, ciphertext, workers=2, min_size=0) == cipher.decrypt(ciphertext)
+
+def test_polybius_numbers_are_not_split():
+    cipher = ciphers.Polybius((" ", 9))
+    ciphertext = "1" * 7 + " " + cipher.encrypt("attack at dawn") * 5
+    for chunks in [2, 3, 5, 11]:
+        bounds = ciphers._chunk_bounds(cipher, ciphertext, 1, chunks)
+        assert all(not (ciphertext[i - 1].isnumeric() and ciphertext[i].isnumeric()) for i in bounds[1:-1])
+    assert ciphers.parallel_decrypt(cipher, ciphertext, workers=3, min_size=0) == cipher.decrypt(ciphertext)
+
+def test_small_inputs_run_serially():
+    cipher = ciphers.Vigenere("lemon")
+    # no process pool below min_size or with a single worker
+    assert ciphers.parallel_encrypt(cipher, "attack at dawn", workers=2) == cipher.encrypt("attack at dawn")
+    assert ciphers.parallel_encrypt(cipher, "attack at dawn", workers=1, min_size=0) == cipher.encrypt("attack at dawn")
@@ -0,0 +1,62 @@
+"""
+----------------------------------------------------
+Tests of utilities.is_plaintext and Plaintext_Scorer
+----------------------------------------------------
+"""
+import pytest
+
+import utilities
+
+WORDS = ["attack", "at", "dawn", "the", "quick", "brown", "fox"]
+
+@pytest.fixture
+def dictionary():
+    return utilities.Dictionary([[word for word in WORDS if word[0] == chr(97 + i)] for i in range(26)])
+
+def full_check(text, dictionary, threshold, max_words=None):
+    words = utilities.text_to_words(text)[:max_words]
+    matches = len([word for word in words if word.lower() in dictionary.words])
+    return len(words) > 0 and matches / len(words) >= threshold
+
+@pytest.mark.parametrize("text", ["", "   ", "!!", "Attack at dawn!", "attack xq at zz dawn", "xq " * 40 + "the fox",
+                                  "the fox " * 40 + "xq zz"])
+@pytest.mark.parametrize("threshold", [0, 0.5, 0.9, 1])
+def test_is_plaintext(text, threshold, dictionary, monkeypatch):
+    for chunk_size in [4, utilities.CHUNK_SIZE]:
+        monkeypatch.setattr(utilities, "CHUNK_SIZE", chunk_size)
+        assert utilities.is_plaintext(text, dictionary, threshold) == full_check(text, dictionary, threshold)
+        for max_words in [1, 3, 1000]:
+            assert utilities.is_plaintext(text, dictionary, threshold, max_words) == \
+                full_check(text, dictionary, threshold, max_words)
+
+def test_scorer_stops_early(dictionary):
+    words = iter(["xq"] * 20 + ["the"] * 90)
+    scorer = utilities.Plaintext_Scorer(dictionary, 0.9, total=110)
+    assert scorer.update(words) is False
+    assert scorer.words() < 20
+    words = iter(["the"] * 100 + ["xq"] * 10)
+    scorer = utilities.Plaintext_Scorer(dictionary, 0.9, max_words=50)
+    assert scorer.update(words) is True
+    assert scorer.words() <= 50
+
+@pytest.mark.parametrize("text", ["", "a", "a b", "a\tb\r\nc", "a\x1cb\x1fc", "a　b c\xa0d", "  a  ", "é b"])
+def test_count_bound(text):
+    assert utilities._count_bound(text) >= len(text.split()) >= len(utilities.text_to_words(text))
+
+def test_decides_without_reading_whole_text(dictionary, monkeypatch):
+    read = []
+    iter_words = utilities.iter_words
+
+    def counting_iter_words(text):
+        for word in iter_words(text):
+            read.append(word)
+            yield word
+
+    monkeypatch.setattr(utilities, "iter_words", counting_iter_words)
+    text = "xq zz " * 10000
+    assert utilities.is_plaintext(text, dictionary) is False
+    assert len(read) < 20000 // 5
+    read.clear()
+    text = "the fox " * 10000 + "xq"
+    assert utilities.is_plaintext(text, dictionary) is True
+    assert len(read) < 20001
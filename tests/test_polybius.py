@@ -0,0 +1,93 @@
+"""
+----------------------------------------------------
+Tests of Polybius cryptanalysis and its prefix-check pruning
+----------------------------------------------------
+"""
+import pytest
+import ciphers
+
+WORDS = ["attack", "at", "dawn", "the", "quick", "brown", "fox", "jumps", "over", "dog", "and"]
+TEXT = "the quick brown fox jumps over the dog and attack at dawn " * 3
+
+@pytest.fixture
+def dict_file(tmp_path):
+    words = sorted(set(WORDS + [chr(97 + i) for i in range(26)]))
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(words) + "\n")
+    return str(path)
+
+def all_keys():
+    return [(chr(start), size) for size in range(2, 10) for start in range(32, 127 - size * size + 1)]
+
+def test_cryptanalyze_finds_key(dict_file):
+    ciphertext = ciphers.Polybius(("a", 5)).encrypt(TEXT)
+    key, plaintext = ciphers.Polybius.cryptanalyze(ciphertext, ['', 0, 0, dict_file, 0.9])
+    # the dictionary is case insensitive, so "A" (first in search order) and "a" tie
+    assert key == ("A", 5)
+    assert plaintext.lower() == TEXT
+
+def test_known_key(dict_file):
+    ciphertext = ciphers.Polybius(("a", 5)).encrypt(TEXT)
+    assert ciphers.Polybius.cryptanalyze(ciphertext, ['a', 5, 5, dict_file, 0.9]) == (("a", 5), TEXT)
+
+def test_ranked_and_parallel(dict_file):
+    ciphertext = ciphers.Polybius(("a", 5)).encrypt(TEXT)
+    ranked = ciphers.Polybius.cryptanalyze(ciphertext, ['', 0, 0, dict_file, 0.9], ranked=True)
+    assert [candidate[0] for candidate in ranked[:2]] == [("A", 5), ("a", 5)]
+    assert ranked[0][2] == 1.0
+    assert [score for key, plaintext, score in ranked] == sorted([score for key, plaintext, score in ranked], reverse=True)
+    assert ciphers.Polybius.cryptanalyze(ciphertext, ['', 0, 0, dict_file, 0.9], ranked=True, workers=2) == ranked
+
+def test_failed_cryptanalysis(dict_file):
+    assert ciphers.Polybius.cryptanalyze("zzzz qqqq", ['', 0, 0, dict_file, 0.9]) == ("", "")
+
+def test_prefix_check_keeps_true_key_and_prunes(dict_file):
+    ciphertext = ciphers.Polybius(("a", 5)).encrypt(TEXT)
+    prefix = ciphertext[:ciphers.Polybius.ANALYSIS_PREFIX]
+    analyze = ciphers.Polybius()
+    passed = []
+    for key in all_keys():
+        analyze.set_key(key)
+        if analyze._prefix_check(prefix): passed.append(key)
+    assert ("a", 5) in passed
+    assert len(passed) < len(all_keys()) // 10
+
+def test_pruning_keeps_best_candidate(dict_file):
+    # every key decrypted and scored, without the prefix check
+    ciphertext = ciphers.Polybius(("a", 5)).encrypt(TEXT)
+    best = max([(ciphers.Polybius._dictionary_score(ciphers.Polybius(key).decrypt(ciphertext), dict_file), key)
+                for key in all_keys()], key=lambda candidate: candidate[0])
+    ranked = ciphers.Polybius.cryptanalyze(ciphertext, ['', 0, 0, dict_file, 0.9], ranked=True)
+    assert ranked[0][2] == best[0]
+
+def reference_encrypt(cipher, plaintext):
+    square = cipher.get_square("list")
+    codes = {square[i][j]: str(i + 1) + str(j + 1) for i in range(len(square)) for j in range(len(square))}
+    return "".join([codes.get(element, element) for element in plaintext])
+
+def reference_decrypt(cipher, ciphertext):
+    square = cipher.get_square("list")
+    plaintext = ""
+    index = 0
+    while index < len(ciphertext) - 1:
+        pair = ciphertext[index:index + 2]
+        if pair.isnumeric():
+            i, j = int(pair[0]), int(pair[1])
+            if 1 <= i <= len(square) and 1 <= j <= len(square):
+                plaintext += square[i - 1][j - 1]
+            index += 2
+        else:
+            plaintext += ciphertext[index]
+            index += 1
+    if index < len(ciphertext):
+        plaintext += ciphertext[index]
+    return plaintext
+
+@pytest.mark.parametrize("key", [("a", 5), (" ", 9), ("A", 2), ("0", 3)])
+@pytest.mark.parametrize("text", ["", "hello world", "Hello, World! 0123456789", "1", "123", "09 90 19 91",
+                                  "naïve café ١٢", TEXT])
+def test_tables_match_square(key, text):
+    cipher = ciphers.Polybius(key)
+    assert cipher.encrypt(text) == reference_encrypt(cipher, text)
+    assert cipher.decrypt(text) == reference_decrypt(cipher, text)
+    assert cipher.decrypt(cipher.encrypt(text)) == reference_decrypt(cipher, reference_encrypt(cipher, text))
@@ -0,0 +1,43 @@
+"""
+----------------------------------------------------
+Tests of utilities.get_positions, clean_text and insert_positions
+against the original character-by-character versions
+----------------------------------------------------
+"""
+import pytest
+import utilities
+
+def reference_positions(text, base):
+    return [[element, index] for index, element in enumerate(text) if element in base]
+
+def reference_clean(text, base):
+    return "".join([character for character in text if character not in base])
+
+def reference_insert(text, positions):
+    updated_text = ""
+    p_index = 0
+    t_index = 0
+    for i in range(len(text) + len(positions)):
+        if p_index < len(positions) and positions[p_index][1] == i:
+            updated_text += positions[p_index][0]
+            p_index += 1
+        else:
+            updated_text += text[t_index]
+            t_index += 1
+    return updated_text
+
+TEXTS = ["I have 3 cents.", "", "   ", "no-change", "Ünïcödé ßtraße, naïve café!\n\tΚαλημέρα κόσμε 😀 end.",
+         "..,,;;", "a" * 1000 + " b\r\n" * 50]
+BASES = ["c.h", " ", utilities.get_base("punctuation") + " ", "é😀Κ", ""]
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("base", BASES)
+def test_same_output_as_original(text, base):
+    positions = utilities.get_positions(text, base)
+    assert positions == reference_positions(text, base)
+    cleaned = utilities.clean_text(text, base)
+    assert cleaned == reference_clean(text, base)
+    assert utilities.insert_positions(cleaned, positions) == reference_insert(cleaned, positions) == text
+
+def test_docstring_example():
+    assert utilities.get_positions('I have 3 cents.', 'c.h') == [['h', 2], ['c', 9], ['.', 14]]
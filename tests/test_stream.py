@@ -0,0 +1,43 @@
+"""
+----------------------------------------------------
+Tests of encrypt_stream/decrypt_stream: the output must not
+depend on where the chunks end
+----------------------------------------------------
+"""
+import io
+import pytest
+import ciphers
+
+TEXT = "Hello, World!\r\nThe quick brown fox jumps over the lazy dog 0123456789.\n" * 3
+CHUNK_SIZES = [1, 2, 3, 7, 64]
+
+def make_ciphers():
+    return [ciphers.Ceaser_Cipher(3), ciphers.Simple_Substitution(("zyxwvutsrqponmlkjihgfedcba", "abcdefghijklmnopqrstuvwxyz")),
+            ciphers.Polybius((" ", 9)), ciphers.Vigenere("lemon")]
+
+def run_stream(method, text, chunk_size):
+    writer = io.StringIO()
+    method(io.StringIO(text), writer, chunk_size)
+    return writer.getvalue()
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("index", range(4))
+def test_stream_matches_whole_text(index, chunk_size):
+    cipher = make_ciphers()[index]
+    ciphertext = cipher.encrypt(TEXT)
+    assert run_stream(cipher.encrypt_stream, TEXT, chunk_size) == ciphertext
+    assert run_stream(cipher.decrypt_stream, ciphertext, chunk_size) == cipher.decrypt(ciphertext)
+
+def test_vigenere_key_position_across_chunks():
+    # "a b" with key "lemon": the second letter uses key position 1 even though
+    # it starts a new chunk after a non-alpha character
+    cipher = ciphers.Vigenere("lemon")
+    assert run_stream(cipher.encrypt_stream, "a b", 2) == cipher.encrypt("a b")
+    assert run_stream(cipher.encrypt_stream, "a b", 2)[2] == "f"
+
+def test_polybius_pair_split_across_chunks():
+    cipher = ciphers.Polybius((" ", 9))
+    ciphertext = cipher.encrypt("abc")
+    assert len(ciphertext) % 2 == 0
+    for chunk_size in [1, 3]:
+        assert run_stream(cipher.decrypt_stream, ciphertext, chunk_size) == cipher.decrypt(ciphertext)
@@ -0,0 +1,76 @@
+"""
+----------------------------------------------------
+Differential tests of the NumPy backend (backend="numpy") against the
+    pure Python path of every cipher with a vectorized implementation
+    (Polybius has none)
+----------------------------------------------------
+"""
+import random
+
+import pytest
+
+import ciphers
+import utilities
+import vectorized
+
+numpy = pytest.importorskip("numpy")
+
+ASCII = "abcxyzAKQZ .,;:!?-'\"\n\t0123456789"
+NON_ASCII = "éßΩ漢K"
+
+CIPHERS = [
+    ciphers.Ceaser_Cipher(3),
+    ciphers.Ceaser_Cipher(-29),
+    ciphers.Vigenere("lemon"),
+    ciphers.Vigenere("k"),
+    ciphers.Simple_Substitution(("zebra", utilities.get_base("lower"))),
+    ciphers.Simple_Substitution(("Zebra1!", utilities.get_base("BA"))),
+    ciphers.Columnar_Transposition("keyword"),
+    ciphers.Columnar_Transposition("ab", "x"),
+    ciphers.Columnar_Transposition("zyxwvutsrqponmlkjihgfedcba"),
+]
+
+def cipher_id(cipher):
+    return "{}({})".format(type(cipher).__name__, getattr(cipher, "_key", ""))
+
+def boundary_lengths(cipher):
+    """
+    Lengths around multiples of the key length (Vigenere key position,
+    Columnar rows) and of the conversion chunks
+    """
+    period = len(getattr(cipher, "_key_order", "")) or len(str(getattr(cipher, "_key", ""))) or 1
+    lengths = {0, 1, 2, 3}
+    for multiple in [1, 2, 3, 10]:
+        lengths.update([multiple * period - 1, multiple * period, multiple * period + 1])
+    lengths.update([utilities.CHUNK_SIZE - 1, utilities.CHUNK_SIZE, utilities.CHUNK_SIZE + 1])
+    return sorted(length for length in lengths if length >= 0)
+
+def check(cipher, text):
+    assert cipher.encrypt(text, backend="numpy") == cipher.encrypt(text)
+    assert cipher.decrypt(text, backend="numpy") == cipher.decrypt(text)
+    ciphertext = cipher.encrypt(text)
+    assert cipher.decrypt(ciphertext, backend="numpy") == cipher.decrypt(ciphertext)
+
+@pytest.mark.parametrize("cipher", CIPHERS, ids=cipher_id)
+def test_empty(cipher):
+    check(cipher, "")
+
+@pytest.mark.parametrize("cipher", CIPHERS, ids=cipher_id)
+def test_ascii(cipher):
+    rng = random.Random(cipher_id(cipher))
+    for length in boundary_lengths(cipher):
+        check(cipher, "".join(rng.choice(ASCII) for _ in range(length)))
+
+@pytest.mark.parametrize("cipher", CIPHERS, ids=cipher_id)
+def test_non_ascii_falls_back(cipher):
+    rng = random.Random(cipher_id(cipher))
+    for length in [1, 5, 50]:
+        text = "".join(rng.choice(ASCII + NON_ASCII) for _ in range(length))
+        check(cipher, text)
+        check(cipher, text + NON_ASCII[0])
+        check(cipher, NON_ASCII[-1] + text)
+
+@pytest.mark.parametrize("cipher", CIPHERS, ids=cipher_id)
+def test_without_numpy(cipher, monkeypatch):
+    monkeypatch.setattr(vectorized, "numpy", None)
+    check(cipher, "The quick brown fox, jumps over 13 lazy dogs!")
@@ -0,0 +1,91 @@
+"""
+----------------------------------------------------
+Differential tests of Vigenere against the original per-character
+    implementation (baseline_encrypt/baseline_decrypt)
+----------------------------------------------------
+"""
+import random
+
+import pytest
+
+import ciphers
+import utilities
+
+KEYS = ["key", "lemon", "Zebra stripes", "ab", "k!y"]
+ALPHABET = "abcxyzKLMQ .,;:!?-'\"\n\t0123456789KéÉßİΩ漢"
+
+def baseline_run(text, key, mode):
+    """
+    Original Vigenere algorithm: characters of nonalpha + " \\n" are kept
+    in place, every other character whose lower case is in a-z is shifted
+    and moves the key forward, the rest is kept
+    """
+    removed = utilities.get_base("nonalpha") + " " + "\n"
+    base = utilities.get_base("lower")
+    vsquare = ciphers.Vigenere.get_square()
+    result = ""
+    key_pt = 0
+    for element in text:
+        if element in removed or element.lower() not in base:
+            result += element
+            continue
+        row = base.index(key[key_pt % len(key)])
+        if mode == 0:
+            value = vsquare[row][base.index(element.lower())]
+        else:
+            value = base[vsquare[row].index(element.lower())]
+        if element.isupper(): value = value.upper()
+        result += value
+        key_pt += 1
+    return result
+
+def random_text(rng, length, alphabet=ALPHABET):
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+@pytest.mark.parametrize("key", KEYS)
+def test_matches_baseline(key):
+    rng = random.Random(key)
+    cipher = ciphers.Vigenere(key)
+    for length in [0, 1, 2, 7, 50, 500]:
+        for alphabet in [ALPHABET, ALPHABET.encode("ascii", "ignore").decode("ascii")]:
+            text = random_text(rng, length, alphabet)
+            assert cipher.encrypt(text) == baseline_run(text, cipher.get_key(), 0)
+            assert cipher.decrypt(text) == baseline_run(text, cipher.get_key(), 1)
+
+@pytest.mark.parametrize("key", KEYS)
+def test_kelvin_sign(key):
+    cipher = ciphers.Vigenere(key)
+    for text in ["K", "aKb", "KK K k"]:
+        assert cipher.encrypt(text) == baseline_run(text, cipher.get_key(), 0)
+        assert cipher.decrypt(text) == baseline_run(text, cipher.get_key(), 1)
+
+def test_known_values():
+    assert ciphers.Vigenere("key").decrypt("K") == "A"
+    assert ciphers.Vigenere("lemon").decrypt("K") == "Z"
+    assert ciphers.Vigenere("lemon").encrypt("Attack at dawn!") == "Lxfopv ef rnhr!"
+
+def prose(rng, words):
+    vocabulary = "the quick brown fox jumps over lazy dogs and attack at dawn while we wait for it".split()
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_column_counts(numpy, monkeypatch):
+    import vectorized
+    if numpy and vectorized.numpy is None: pytest.skip("numpy is not installed")
+    if not numpy: monkeypatch.setattr(vectorized, "numpy", None)
+    letters = "".join(prose(random.Random(1), 500).split())
+    base = utilities.get_base("lower")
+    for key_len in [1, 2, 7, 26]:
+        baskets = utilities.blocks_to_baskets(utilities.text_to_blocks(letters, key_len, True, " "))
+        assert ciphers.Vigenere._column_counts(letters, key_len) == [utilities.get_freq(basket, base) for basket in baskets]
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_cryptanalyze(numpy, monkeypatch):
+    import vectorized
+    if numpy and vectorized.numpy is None: pytest.skip("numpy is not installed")
+    if not numpy: monkeypatch.setattr(vectorized, "numpy", None)
+    plaintext = prose(random.Random(2), 3000).capitalize() + "."
+    for key in ["lemonade", "key", "zebrastripes"]:
+        ciphertext = ciphers.Vigenere(key).encrypt(plaintext)
+        assert ciphers.Vigenere.cryptanalyze(ciphertext) == (key, plaintext)
+    assert ciphers.Vigenere.cryptanalyze("123 !?") == ("", "")
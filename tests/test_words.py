@@ -0,0 +1,58 @@
+"""
+----------------------------------------------------
+Tests of the tokenizer (utilities.iter_words, text_to_words) and
+score_text against the original per-character versions
+----------------------------------------------------
+"""
+import random
+
+import pytest
+
+import utilities
+
+def reference_words(text):
+    special = utilities.get_base("special")
+    word_list = []
+    for element in text.split():
+        string = element
+        for character in element:
+            if character in special and character != "-" and len(string) != 1:
+                string = string.replace(character, "")
+        if len(string) > 0:
+            word_list.append(string)
+    return word_list
+
+def reference_analyze(text, dict_list):
+    matches = 0
+    mismatches = 0
+    for word in reference_words(text):
+        ascii_val = ord(word[0].lower())
+        if 97 <= ascii_val <= 122 and word.lower() in dict_list[ascii_val - 97]:
+            matches += 1
+        else:
+            mismatches += 1
+    return matches, mismatches
+
+TEXTS = ["", "   ", "Hello, World!", "!! ?? ... -- a-b !a! \"quoted\"", "don't stop-me now...\r\n\tok",
+         "café naïve ÜBER Kelvin 漢字 ｆｕｌｌ", "x y z", "the " * 100]
+DICT_LIST = [[word for word in ["a-b", "attack", "dawn", "don't", "dont", "hello", "naïve", "now", "ok", "stop-me", "the", "world"]
+              if word[0] == chr(97 + i)] for i in range(26)]
+
+def random_text(seed):
+    rng = random.Random(seed)
+    return "".join(rng.choice("ab- .,!?'\n\tKKé") for _ in range(2000))
+
+@pytest.mark.parametrize("chunk_size", [1, 4, utilities.CHUNK_SIZE])
+@pytest.mark.parametrize("text", TEXTS + [random_text(seed) for seed in range(3)])
+def test_same_words_as_original(text, chunk_size, monkeypatch):
+    monkeypatch.setattr(utilities, "CHUNK_SIZE", chunk_size)
+    assert utilities.text_to_words(text) == reference_words(text)
+    assert list(utilities.iter_words(text)) == reference_words(text)
+    matches, words = utilities.score_text(text, DICT_LIST)
+    assert (matches, words - matches) == reference_analyze(text, DICT_LIST)
+    assert utilities.analyze_text(text, DICT_LIST) == reference_analyze(text, DICT_LIST)
+
+def test_iter_words_is_lazy(monkeypatch):
+    monkeypatch.setattr(utilities, "CHUNK_SIZE", 8)
+    words = utilities.iter_words("one two three " * 100000)
+    assert [next(words) for i in range(3)] == ["one", "two", "three"]
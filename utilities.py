@@ -1,5 +1,29 @@
+import logging
+import logging.handlers
+import math
+import mmap
+import os
+import queue
+import re
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+from functools import lru_cache, wraps
+from itertools import chain
+import operator
+
 DICT_FILE = 'engmix.txt'
+COMPILED_DICT_EXT = '.dic'
+NGRAM_FILE = 'english_quadgrams.txt'
+BIGRAM_FILE = 'english_bigrams.txt'
 PAD = 'q'
+CHUNK_SIZE = 65536
+
+# Silent unless configure_logging is called (or the application adds handlers)
+logger = logging.getLogger("ciphers")
+logger.addHandler(logging.NullHandler())
+_log_listener = None
 
 '______________________________________________________________________________'
 
@@ -25,42 +49,76 @@ def get_base(base_type):
     Errors:       if invalid base type, print error msg, return empty string
     ---------------------------------------------------
     """
-    lower = "".join([chr(ord('a')+i) for i in range(26)])
-    upper = lower.upper()
-    num = "".join([str(i) for i in range(10)])
-    special = ''
-    for i in range(ord('!'),127):
-        if not chr(i).isalnum():
-            special+= chr(i)
-            
-    result = ''
-    if base_type == 'lower':
-        result = lower
-    elif base_type == 'upper':
-        result = upper
-    elif base_type == 'alpha':
-        result = upper + lower
-    elif base_type == 'lowernum':
-        result = lower + num
-    elif base_type == 'uppernum':
-        result = upper + num
-    elif base_type == 'alphanum':
-        result = upper + lower + num
-    elif base_type == 'special':
-        result = special
-    elif base_type == 'nonalpha':
-        result = special + num
-    elif base_type == 'B6': #64 symbols
-        result = num + lower + upper + ' ' + '\n'
-    elif base_type == 'BA': #96 symbols
-        result = upper + lower + num + special + ' \n'
-    elif base_type == 'all':
-        result = upper + lower + num + special
-    else:
+    result = _BASES.get(base_type)
+    if result is None:
         print('Error(get_base): undefined base type')
         result = ''
     return result
 
+def _build_bases():
+    """
+    Private helper function which constructs every base string of get_base
+    """
+    lower = "abcdefghijklmnopqrstuvwxyz"
+    upper = lower.upper()
+    num = "0123456789"
+    special = "".join([chr(i) for i in range(ord('!'),127) if not chr(i).isalnum()])
+    return {
+        'lower': lower,
+        'upper': upper,
+        'alpha': upper + lower,
+        'lowernum': lower + num,
+        'uppernum': upper + num,
+        'alphanum': upper + lower + num,
+        'special': special,
+        'nonalpha': special + num,
+        'B6': num + lower + upper + ' ' + '\n', #64 symbols
+        'BA': upper + lower + num + special + ' \n', #96 symbols
+        'all': upper + lower + num + special,
+        }
+
+# Base strings, sets and deletion tables, constructed once at import
+_BASES = _build_bases()
+_BASE_SETS = {base_type: frozenset(base) for base_type, base in _BASES.items()}
+_DELETE_TABLES = {base_type: dict.fromkeys(map(ord, base)) for base_type, base in _BASES.items()}
+_DELETE_TABLES['whitespace'] = dict.fromkeys(map(ord, " \t\n\r\x0b\x0c"))
+
+'______________________________________________________________________________'
+
+def get_base_set(base_type):
+    """
+    ----------------------------------------------------
+    Parameters:   base_type (str): see get_base
+    Return:       result (frozenset): characters of get_base(base_type)
+    Description:  Shared set for fast membership tests
+    Errors:       if invalid base type, print error msg, return empty set
+    ---------------------------------------------------
+    """
+    result = _BASE_SETS.get(base_type)
+    if result is None:
+        print('Error(get_base_set): undefined base type')
+        result = frozenset()
+    return result
+
+'______________________________________________________________________________'
+
+def get_delete_table(base_type):
+    """
+    ----------------------------------------------------
+    Parameters:   base_type (str): see get_base, or whitespace
+                      (space, tab, newline, carriage return, vertical tab, form feed)
+    Return:       table (dict): str.translate table deleting every character of the base
+    Description:  Shared table, do not modify
+                  Example: "a1, b".translate(get_delete_table("nonalpha")) --> "a b"
+    Errors:       if invalid base type, print error msg, return empty table
+    ---------------------------------------------------
+    """
+    table = _DELETE_TABLES.get(base_type)
+    if table is None:
+        print('Error(get_delete_table): undefined base type')
+        table = {}
+    return table
+
 '______________________________________________________________________________'
 
 def get_language_freq(language='English'):
@@ -130,6 +188,27 @@ def text_to_file(text, filename):
 
 '______________________________________________________________________________'
 
+def read_chunks(reader, chunk_size=CHUNK_SIZE):
+    """
+    ----------------------------------------------------
+    Parameters:   reader (file-like): object with a read(size) method
+                  chunk_size (int): maximum characters per chunk
+                      default value = CHUNK_SIZE
+    Return:       chunks (generator of str)
+    Description:  Reads a file-like object lazily, one chunk at a time
+                  Only one chunk is held in memory at any time
+    Asserts:      chunk_size is a positive integer
+    ---------------------------------------------------
+    """
+    assert isinstance(chunk_size, int) and chunk_size > 0, "Error (read_chunks): invalid chunk size"
+
+    chunk = reader.read(chunk_size)
+    while chunk:
+        yield chunk
+        chunk = reader.read(chunk_size)
+
+'______________________________________________________________________________'
+
 def is_valid_filename(filename):
     """
     ----------------------------------------------------
@@ -192,6 +271,331 @@ def load_dictionary(dict_file=None):
 
 '______________________________________________________________________________'
 
+class Dictionary(list):
+    """
+    ----------------------------------------------------
+    Description: An indexed version of the dictionary list (see load_dictionary)
+                 Element i is a frozenset of the words in list i,
+                     so lookups take constant time instead of a linear scan
+                 Being a list, it can be passed wherever a dict_list is expected
+                     (analyze_text, is_plaintext) with identical results
+                 Use get_dictionary to share a single copy per process
+    ----------------------------------------------------
+    """
+
+    def __init__(self, dict_list):
+        """
+        ----------------------------------------------------
+        Parameters:   dict_list (list): 2D list generated by load_dictionary
+        Description:  Dictionary constructor
+        ---------------------------------------------------
+        """
+        super().__init__([frozenset(words) for words in dict_list])
+        self.words = frozenset().union(*self)
+        return
+
+    def analyze_text(self, text):
+        """
+        ----------------------------------------------------
+        Parameters:   text (str)
+        Return:       matches (int)
+                      mismatches (int)
+        Description:  Same as analyze_text(text, dictionary)
+        ---------------------------------------------------
+        """
+        return analyze_text(text, self)
+
+    def is_plaintext(self, text, threshold=0.9, max_words=None):
+        """
+        ----------------------------------------------------
+        Parameters:   text (str)
+                      threshold (float): default value = 0.9
+                      max_words (int): default value = None (all words)
+        Return:       True/False
+        Description:  Same as is_plaintext(text, dictionary, threshold, max_words)
+        ---------------------------------------------------
+        """
+        return is_plaintext(text, self, threshold, max_words)
+
+_dictionaries = {}
+
+def get_dictionary(dict_file=None):
+    """
+    ----------------------------------------------------
+    Parameters:   dict_file (str): filename
+                        default value = None
+    Return:       dictionary (Dictionary or Mapped_Dictionary)
+    Description:  Returns the indexed dictionary for a given dictionary file
+                  The file is loaded once per process and the same object
+                      is returned for every later call
+                  If a compiled copy (same name, COMPILED_DICT_EXT extension)
+                      exists and is up to date, it is memory-mapped instead
+                  if no parameter given, use default file (DICT_FILE)
+    ---------------------------------------------------
+    """
+    if dict_file == None: 
+        dict_file = DICT_FILE
+
+    if dict_file not in _dictionaries:
+        compiled_file = os.path.splitext(dict_file)[0] + COMPILED_DICT_EXT
+        if dict_file.endswith(COMPILED_DICT_EXT):
+            _dictionaries[dict_file] = Mapped_Dictionary(dict_file)
+        elif (os.path.exists(compiled_file) and 
+              (not os.path.exists(dict_file) or os.path.getmtime(compiled_file) >= os.path.getmtime(dict_file))):
+            _dictionaries[dict_file] = Mapped_Dictionary(compiled_file)
+        else:
+            _dictionaries[dict_file] = Dictionary(load_dictionary(dict_file))
+
+    return _dictionaries[dict_file]
+
+'______________________________________________________________________________'
+
+# Compiled dictionary layout (all integers are native uint32):
+#     header:  magic, byte order mark (1), number of groups
+#     groups:  number of groups + 1 word indices, group i = words [groups[i], groups[i+1])
+#     offsets: number of words + 1 byte offsets into the data section
+#     data:    utf-8 words, sorted within each group
+_DICT_MAGIC = 0x43444943
+
+def compile_dictionary(dict_file=None, compiled_file=None):
+    """
+    ----------------------------------------------------
+    Parameters:   dict_file (str): word list, default value = None (DICT_FILE)
+                  compiled_file (str): output file, default value = None
+                      (dict_file with COMPILED_DICT_EXT extension)
+    Return:       compiled_file (str)
+    Description:  Compiles a word list into a binary file that can be
+                      memory-mapped by Mapped_Dictionary without parsing
+                  Groups are the same as the lists of load_dictionary,
+                      so lookups give identical results
+                  The file uses native byte order and is meant to be
+                      compiled on the machine that uses it
+    ---------------------------------------------------
+    """
+    if dict_file == None: 
+        dict_file = DICT_FILE
+    if compiled_file == None:
+        compiled_file = os.path.splitext(dict_file)[0] + COMPILED_DICT_EXT
+
+    groups = array('I', [0])
+    offsets = array('I', [0])
+    data = bytearray()
+    for words in load_dictionary(dict_file):
+        for word in sorted(set([word.encode('utf-8') for word in words])):
+            data += word
+            offsets.append(len(data))
+        groups.append(len(offsets) - 1)
+
+    header = array('I', [_DICT_MAGIC, 1, len(groups) - 1])
+    f = open(compiled_file, 'wb')
+    f.write(header.tobytes() + groups.tobytes() + offsets.tobytes())
+    f.write(data)
+    f.close()
+
+    return compiled_file
+
+class _Mapped_Group:
+    """
+    ----------------------------------------------------
+    Private helper class
+    A single group (starting letter) of a Mapped_Dictionary
+    Membership is a binary search over the mapped words
+    ----------------------------------------------------
+    """
+
+    def __init__(self, dictionary, start, end):
+        self._dictionary = dictionary
+        self._start = start
+        self._end = end
+        return
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __contains__(self, word):
+        return self._dictionary._search(word, self._start, self._end)
+
+class Mapped_Dictionary(list):
+    """
+    ----------------------------------------------------
+    Description: A read-only dictionary backed by a memory-mapped file
+                     generated by compile_dictionary
+                 Loading does not parse the file, and the mapped pages are
+                     shared by every process that opens the same file
+                 Element i supports 'word in dictionary[i]', so it can be
+                     passed wherever a dict_list is expected
+    ----------------------------------------------------
+    """
+
+    def __init__(self, compiled_file):
+        """
+        ----------------------------------------------------
+        Parameters:   compiled_file (str): file generated by compile_dictionary
+        Description:  Mapped_Dictionary constructor
+        Asserts:      compiled_file is a compiled dictionary
+        ---------------------------------------------------
+        """
+        f = open(compiled_file, 'rb')
+        self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        f.close()
+
+        view = memoryview(self._map)
+        magic, bom, n_groups = view[0:12].cast('I')
+        assert magic == _DICT_MAGIC and bom == 1, "Error (Mapped_Dictionary): invalid dictionary file"
+
+        end = 12 + 4*(n_groups + 1)
+        groups = view[12:end].cast('I')
+        n_words = groups[-1]
+        self._offsets = view[end:end + 4*(n_words + 1)].cast('I')
+        self._data = end + 4*(n_words + 1)
+
+        super().__init__([_Mapped_Group(self, groups[i], groups[i+1]) for i in range(n_groups)])
+        return
+
+    def _word(self, index):
+        """
+        Private helper function which returns the encoded word at a given index
+        """
+        return self._map[self._data + self._offsets[index]:self._data + self._offsets[index+1]]
+
+    def _search(self, word, start, end):
+        """
+        Private helper function which checks if word is in words [start, end)
+        """
+        if not isinstance(word, str): return False
+        word = word.encode('utf-8', 'surrogatepass')
+        while start < end:
+            middle = (start + end) // 2
+            current = self._word(middle)
+            if current == word: return True
+            if current < word:
+                start = middle + 1
+            else:
+                end = middle
+        return False
+
+    def analyze_text(self, text):
+        """
+        ----------------------------------------------------
+        Parameters:   text (str)
+        Return:       matches (int)
+                      mismatches (int)
+        Description:  Same as analyze_text(text, dictionary)
+        ---------------------------------------------------
+        """
+        return analyze_text(text, self)
+
+    def is_plaintext(self, text, threshold=0.9, max_words=None):
+        """
+        ----------------------------------------------------
+        Parameters:   text (str)
+                      threshold (float): default value = 0.9
+                      max_words (int): default value = None (all words)
+        Return:       True/False
+        Description:  Same as is_plaintext(text, dictionary, threshold, max_words)
+        ---------------------------------------------------
+        """
+        return is_plaintext(text, self, threshold, max_words)
+
+'______________________________________________________________________________'
+
+_ngram_tables = {}
+
+def get_ngram_table(ngram_file=None):
+    """
+    ----------------------------------------------------
+    Parameters:   ngram_file (str): filename
+                        default value = None
+    Return:       n (int): n-gram size
+                  table (array of floats): log10 probabilities
+    Description:  Reads an n-gram count file, each line formatted as
+                      '<NGRAM> <count>' (e.g. 'TION 13168375')
+                  table[i] is the log probability of the n-gram whose letters,
+                      read as base 26 digits (a = 0), give the integer i
+                  Unseen n-grams get the log probability of 0.01 occurrences
+                  The file is loaded once per process and the same table
+                      is returned for every later call
+                  if no parameter given, use default file (NGRAM_FILE)
+                  If a default file (NGRAM_FILE, BIGRAM_FILE) is missing, the
+                      counts are derived from the words of DICT_FILE
+                      (see get_ngram_counts)
+    Errors:       if the file is missing (and cannot be derived) --> FileNotFoundError
+                  if the file has no n-grams, or n-grams of different lengths --> ValueError
+    ---------------------------------------------------
+    """
+    if ngram_file == None: 
+        ngram_file = NGRAM_FILE
+
+    if ngram_file not in _ngram_tables:
+        if os.path.exists(ngram_file) or ngram_file not in _DEFAULT_NGRAM_SIZES:
+            counts = _read_ngram_counts(ngram_file)
+        elif os.path.exists(DICT_FILE):
+            counts = get_ngram_counts(DICT_FILE, _DEFAULT_NGRAM_SIZES[ngram_file])
+        else:
+            raise FileNotFoundError("Error(get_ngram_table): n-gram file '{}' not found "
+                                    "and no dictionary '{}' to derive it from".format(ngram_file, DICT_FILE))
+
+        sizes = set(map(len, counts))
+        if len(sizes) != 1:
+            raise ValueError("Error(get_ngram_table): '{}' must hold n-grams of a single length, found {}".format(
+                ngram_file, sorted(sizes) if len(sizes) > 0 else "none"))
+        n = sizes.pop()
+        total = sum(counts.values())
+        table = array('d', [math.log10(0.01 / total)]) * (26 ** n)
+        for ngram, count in counts.items():
+            index = 0
+            for character in ngram:
+                index = index * 26 + ord(character) - 97
+            table[index] = math.log10(count / total)
+        _ngram_tables[ngram_file] = (n, table)
+
+    return _ngram_tables[ngram_file]
+
+# n-gram size of the default n-gram files, used when they are derived from DICT_FILE
+_DEFAULT_NGRAM_SIZES = {NGRAM_FILE: 4, BIGRAM_FILE: 2}
+
+def _read_ngram_counts(ngram_file):
+    """
+    Private helper function which reads {ngram: count} from an n-gram count file
+    """
+    if not os.path.exists(ngram_file):
+        raise FileNotFoundError("Error(get_ngram_table): n-gram file '{}' not found".format(ngram_file))
+    counts = {}
+    f = open(ngram_file, 'r')
+    for line in f:
+        fields = line.split()
+        if len(fields) == 2 and fields[0].isascii() and fields[0].isalpha(): 
+            counts[fields[0].lower()] = int(fields[1])
+    f.close()
+    return counts
+
+'______________________________________________________________________________'
+
+def get_ngram_counts(dict_file, n):
+    """
+    ----------------------------------------------------
+    Parameters:   dict_file (str): word list, one word per line
+                  n (int): n-gram size
+    Return:       counts (dict): {ngram: count}, lower case a-z n-grams
+    Description:  Counts the n-grams inside the words of a word list
+                  Every word counts once, n-grams do not cross word boundaries
+                  A rough substitute for n-gram counts of real English text,
+                      used when the n-gram files are not installed
+                  The result can be written as an n-gram file:
+                      '<ngram> <count>' per line
+    ---------------------------------------------------
+    """
+    counts = Counter()
+    f = open(dict_file, 'r', encoding="ISO-8859-15")
+    for line in f:
+        word = line.strip().lower()
+        if not (word.isascii() and word.isalpha()): continue
+        counts.update([word[i:i+n] for i in range(len(word) - n + 1)])
+    f.close()
+    return dict(counts)
+
+'______________________________________________________________________________'
+
 def text_to_words(text):
     """
     ----------------------------------------------------
@@ -200,30 +604,117 @@ def text_to_words(text):
     Description:  Reads a given text
                   Returns a list of strings, each pertaining to a word in the text
                   Words are separated by a white space (space, tab or newline)
-                  Gets rid of all special characters at the start and at the end
+                  Gets rid of all special characters except - (see iter_words)
     Asserts:      text is a string
     ---------------------------------------------------
     """
     assert isinstance(text, str)
 
-    special = get_base("special")
-    word_list1 = text.split()
-    word_list = []
-    string = ""
+    return list(iter_words(text))
 
+'______________________________________________________________________________'
 
-    for element in word_list1:
-        string = element
-        for character in element:
-           if (character in special and character != "-"):
-               if(len(string) != 1):
-                   string = string.replace(character,"")
-        if (len(string) > 0):
-            word_list.append(string)
+def iter_words(text):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str)
+    Return:       words (generator): the words of text_to_words(text), in order
+    Description:  Lazy version of text_to_words
+                  The text is read in chunks of about CHUNK_SIZE characters (cut at
+                      white space), special characters except - are deleted from a
+                      whole chunk with a single str.translate
+                  A word made only of special characters is kept if a single
+                      character is left while deleting them one by one, e.g. "!"
+    Asserts:      text is a string
+    ---------------------------------------------------
+    """
+    assert isinstance(text, str)
 
-                
+    for chunk in _text_chunks(text):
+        words = chunk.translate(_WORD_STRIP_TABLE).split()
+        elements = chunk.split()
+        if len(words) != len(elements):
+            # Some words were only special characters
+            words = [_strip_word(element) for element in elements]
+        for word in words:
+            if len(word) > 0: yield word
+    return
 
-    return word_list
+def _text_chunks(text):
+    """
+    Private helper function which yields text in pieces of about CHUNK_SIZE
+    characters, cut at white space so no word is split
+    """
+    start = 0
+    while start < len(text):
+        end = start + CHUNK_SIZE
+        if end < len(text):
+            space = _WHITE_SPACE.search(text, end)
+            end = space.start() if space is not None else len(text)
+        yield text[start:end]
+        start = end
+    return
+
+def _count_bound(text):
+    """
+    Private helper function which returns the number of white space characters
+    of text + 1, an upper bound of len(text_to_words(text)) found without
+    splitting the text (ASCII text is counted with a single bytes.translate)
+    """
+    if text.isascii():
+        data = text.encode('ascii')
+        return len(data) - len(data.translate(None, _ASCII_WHITE_SPACE)) + 1
+    return sum([text.count(character) for character in _WHITE_SPACE_CHARACTERS]) + 1
+
+# Special characters deleted from words (see iter_words)
+_WORD_STRIP_TABLE = {code: None for code in _DELETE_TABLES['special'] if code != ord("-")}
+_WHITE_SPACE = re.compile(r"\s")
+# Characters str.split() splits on (none above U+3000)
+_WHITE_SPACE_CHARACTERS = "".join([chr(code) for code in range(0x3001) if chr(code).isspace()])
+_ASCII_WHITE_SPACE = bytes([ord(character) for character in _WHITE_SPACE_CHARACTERS if character.isascii()])
+
+def _strip_word(element):
+    """
+    Private helper function which deletes the special characters (except -)
+    of a single word, one character at a time, as long as the word is longer
+    than one character
+    """
+    string = element.translate(_WORD_STRIP_TABLE)
+    if len(string) > 0: return string
+
+    string = element
+    for character in element:
+        if ord(character) in _WORD_STRIP_TABLE and len(string) != 1:
+            string = string.replace(character,"")
+    return string
+
+'______________________________________________________________________________'
+
+def score_text(text, dictionary):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str)
+                  dictionary (list): dict_list, Dictionary or Mapped_Dictionary
+    Return:       matches (int): words found in dictionary
+                  words (int): number of words in text (see text_to_words)
+    Description:  Tokenizes text and checks every word in a single pass
+                  Same counts as analyze_text: words are compared in lowercase,
+                      words not starting with a-z (or A-Z) are mismatches
+    Asserts:      text is a string and dictionary is a list
+    ---------------------------------------------------
+    """
+    assert isinstance(text,str)
+    assert isinstance(dictionary,list)
+
+    matches = 0
+    words = 0
+    for word in iter_words(text):
+        words += 1
+        ascii_val = ord(word[0].lower())
+        if 97 <= ascii_val <= 122 and word.lower() in dictionary[ascii_val - 97]:
+            matches += 1
+
+    return matches, words
 
 '______________________________________________________________________________'
 
@@ -238,6 +729,7 @@ def analyze_text(text, dict_list):
                   Returns number of matches and mismatches.
                   Words are compared in lowercase
                   Assumes a proper dict_list
+                  A Dictionary (see get_dictionary) is much faster than a plain list
     Asserts:      text is a string and dict_list is a list
     ---------------------------------------------------
     """
@@ -247,41 +739,31 @@ def analyze_text(text, dict_list):
     assert isinstance(text,str)
     assert isinstance(dict_list,list)
 
-    matches = 0
-    mismatches = 0
-    word_list = text_to_words(text)
-
-    for word in word_list:
-        first_letter = word[0].lower()
-        ascii_val = ord(first_letter)
-        if  ascii_val < 97 or ascii_val > 122: 
-            mismatches +=1 
-        else:
-            first_letter_index = ord(first_letter) - 97
-
-            if word.lower() in dict_list[first_letter_index]:
-                matches += 1
-            else:
-                mismatches += 1
+    matches, words = score_text(text, dict_list)
+    mismatches = words - matches
 
     return matches, mismatches
 
 '______________________________________________________________________________'
 
-def is_plaintext(text, dict_list, threshold=0.9):
+def is_plaintext(text, dict_list, threshold=0.9, max_words=None):
     """
     ----------------------------------------------------
     Parameters:   text (str)
                   dict_list (list): dictionary list
                   threshold (float): number between 0 to 1
                       default value = 0.9
+                  max_words (int): only the first max_words words are checked
+                      default value = None (all words)
     Return:       True/False
     Description:  Check if a given file is a plaintext
                   If #matches/#words >= threshold --> True
                       otherwise --> False
                   If invalid threshold, set to default value of 0.9
-                  An empty text should return False
+                  An empty text (or a text without words) should return False
                   Assumes a valid dict_list is passed
+                  Stops reading words as soon as the result is known
+                      (see Plaintext_Scorer)
     ---------------------------------------------------
     """
     if (threshold > 1 or threshold < 0):
@@ -289,15 +771,131 @@ def is_plaintext(text, dict_list, threshold=0.9):
 
     boolean = False 
     if (len(text) > 0):
-        matches, mismatches = analyze_text(text,dict_list)
-        word_list = text_to_words(text)
-        if (matches/len(word_list) >= threshold):
-            boolean = True
+        # With max_words the scorer only needs that bound, otherwise count the white space
+        total = max_words if max_words is not None else _count_bound(text)
+        scorer = Plaintext_Scorer(dict_list, threshold, total, max_words)
+        boolean = scorer.update(iter_words(text))
    
     return boolean
 
 '______________________________________________________________________________'
 
+class Plaintext_Scorer:
+    """
+    ----------------------------------------------------
+    Description: Incremental version of is_plaintext
+                 Words are added as a stream, the scorer keeps running match
+                     and mismatch counts and decides as soon as the threshold
+                     is certain to be reached or missed by the complete text
+                 The decision needs an upper bound of the number of words,
+                     e.g. the number of white space separated elements
+                     (words can only be dropped by text_to_words), or max_words
+                 Usage: scorer = Plaintext_Scorer(dictionary, 0.9, max_words=50)
+                        result = scorer.update(iter_words(text))
+    ----------------------------------------------------
+    """
+
+    def __init__(self, dictionary, threshold=0.9, total=None, max_words=None):
+        """
+        ----------------------------------------------------
+        Parameters:   dictionary (list): dict_list, Dictionary or Mapped_Dictionary
+                      threshold (float): number between 0 to 1, default = 0.9
+                      total (int): upper bound of the number of words
+                          default = None (unknown, decided at the end of the stream)
+                      max_words (int): words checked before deciding
+                          default = None (no limit)
+        Description:  Plaintext_Scorer constructor
+        ---------------------------------------------------
+        """
+        self.dictionary = dictionary
+        self.threshold = threshold
+        self.max_words = max_words
+        if max_words is not None and (total is None or max_words < total): total = max_words
+        self.total = total
+        self.matches = 0
+        self.mismatches = 0
+
+        # Smallest number of matches m with m/total >= threshold
+        self._need = None
+        if total is not None:
+            need = max(0, math.ceil(threshold * total) - 2)
+            while need <= total and need / max(total, 1) < threshold: need += 1
+            self._need = need
+        return
+
+    def words(self):
+        """
+        Returns the number of words added so far
+        """
+        return self.matches + self.mismatches
+
+    def score(self):
+        """
+        Returns #matches/#words of the words added so far (0 if there are none)
+        """
+        words = self.words()
+        if words == 0: return 0
+        return self.matches / words
+
+    def decided(self):
+        """
+        ----------------------------------------------------
+        Parameters:   -
+        Return:       result (bool): True/False if the threshold is certain
+                          to be reached/missed by the complete stream
+                      None if more words are needed
+        Description:  With n words in total (n <= total):
+                      reached if matches/total >= threshold (and n > 0)
+                      missed if (total - mismatches)/total < threshold,
+                          even if every remaining word matches
+        ---------------------------------------------------
+        """
+        if self.total is None: return None
+        if self.total <= self.words(): return self.words() > 0 and self.score() >= self.threshold
+        if self.matches >= max(self._need, 1): return True
+        if self.total - self.mismatches < self._need: return False
+        return None
+
+    def update(self, words):
+        """
+        ----------------------------------------------------
+        Parameters:   words (iterable of str): e.g. iter_words(text)
+        Return:       result (bool): is the stream a plaintext
+        Description:  Checks words until the result is known (see decided),
+                          max_words words were checked or words runs out
+                      Same lookup as analyze_text
+        ---------------------------------------------------
+        """
+        result = self.decided()
+        if result is not None: return result
+
+        dictionary = self.dictionary
+        matches = self.matches
+        mismatches = self.mismatches
+        if self.total is None:
+            need = limit = allowed = float("inf")
+        else:
+            need = max(self._need, 1)
+            allowed = self.total - self._need
+            limit = self.total
+        for word in words:
+            ascii_val = ord(word[0].lower())
+            if 97 <= ascii_val <= 122 and word.lower() in dictionary[ascii_val - 97]:
+                matches += 1
+                if matches >= need: break
+            else:
+                mismatches += 1
+                if mismatches > allowed: break
+            if matches + mismatches >= limit: break
+        self.matches = matches
+        self.mismatches = mismatches
+
+        result = self.decided()
+        if result is None: result = self.words() > 0 and self.score() >= self.threshold
+        return result
+
+'______________________________________________________________________________'
+
 def new_matrix(r,c,fill):
     """
     ----------------------------------------------------
@@ -431,17 +1029,13 @@ def get_positions(text,base):
                   Example: get_positions('I have 3 cents.','c.h') -->
                       [['h',2],['c',9],['.',14]]
                   items are ordered based on their occurrence in the text
+                  For large texts use get_mask, which is more compact
     Asserts:      text and base are strings
     ---------------------------------------------------
     """
-    positions = []
-    index = 0 
-    
-    for element in text: 
-        if element in base: 
-            positions.append([element, index])
-        index += 1
-    return positions
+    if len(base) == 0: return []
+    pattern = _base_pattern(base)
+    return list(map(list, zip(pattern.findall(text), map(re.Match.start, pattern.finditer(text)))))
 
 '______________________________________________________________________________'
 
@@ -459,12 +1053,7 @@ def clean_text(text,base):
     assert isinstance(text, str)
     assert isinstance(base, str)
 
-    updated_text = ""
-    for character in text:
-        if character not in base:
-            updated_text += character
-
-    return updated_text
+    return text.translate(_delete_table(base))
 
 '______________________________________________________________________________'
 
@@ -483,20 +1072,82 @@ def insert_positions(text, positions):
     assert isinstance(text, str)
     assert isinstance(positions, list)
 
-    updated_text = "" 
-    p_index = 0
-    t_index = 0
+    chars = "".join([position[0] for position in positions])
+    offsets = array('I', [position[1] for position in positions])
 
-    for i in range(len(text) + len(positions)): 
-        if (p_index < len(positions) and positions[p_index][1] == i):
-            updated_text += positions[p_index][0]
-            p_index += 1
-        else:
-            updated_text += text[t_index]
-            t_index += 1
+    return insert_mask(text, (chars, offsets))
+
+'______________________________________________________________________________'
+
+def get_mask(text,base):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str): input string
+                  base (str): stream of unique characters
+    Return:       updated_text (str): text without base characters
+                  mask (tuple): (chars (str), offsets (array))
+    Description:  Removes all base characters from text and returns
+                      the removed characters with their positions
+                  mask is a compact version of get_positions:
+                      chars[i] was found at position offsets[i]
+                  Example: get_mask('I have 3 cents.','c.h') -->
+                      'I ave 3 ents', ('hc.', array('I', [2, 9, 14]))
+                  Use insert_mask to restore the original text
+    Asserts:      text and base are strings
+    ---------------------------------------------------
+    """
+    assert isinstance(text, str)
+    assert isinstance(base, str)
+
+    if len(base) == 0: return text, ("", array('I'))
+
+    pattern = _base_pattern(base)
+    chars = "".join(pattern.findall(text))
+    offsets = array('I', map(re.Match.start, pattern.finditer(text)))
+
+    return text.translate(_delete_table(base)), (chars, offsets)
+
+'______________________________________________________________________________'
+
+def insert_mask(text,mask):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str)
+                  mask (tuple): (chars (str), offsets (array)) generated by get_mask
+    Return:       updated_text (str)
+    Description:  Inserts all masked characters back into their positions
+                  Assumes a valid mask is given
+    Asserts:      text is a string
+    ---------------------------------------------------
+    """
+    assert isinstance(text, str)
+
+    chars, offsets = mask
+    if len(offsets) == 0: return text
+
+    # cuts[i] = number of text characters that come before chars[i]
+    cuts = list(map(operator.sub, offsets, range(len(offsets))))
+    pieces = map(text.__getitem__, map(slice, [0] + cuts, cuts))
+    updated_text = "".join(chain.from_iterable(zip(pieces, chars))) + text[cuts[-1]:]
 
     return updated_text
 
+@lru_cache(maxsize=64)
+def _base_pattern(base):
+    """
+    Private helper function which returns a compiled pattern matching
+    any single character of base
+    """
+    return re.compile("[" + re.escape(base) + "]")
+
+@lru_cache(maxsize=64)
+def _delete_table(base):
+    """
+    Private helper function which returns a str.translate table
+    deleting every character of base
+    """
+    return dict.fromkeys(map(ord, base))
+
 '______________________________________________________________________________'
 
 def text_to_blocks(text,b_size,padding = False,pad =PAD):
@@ -517,21 +1168,8 @@ def text_to_blocks(text,b_size,padding = False,pad =PAD):
     assert isinstance(b_size, int)
     assert b_size > 0
 
-    blocks = []
-    counter = 0
-    i = 0 
-    s = ""
-
-    for character in text:
-        s += character 
-        counter += 1 
-        if (counter == b_size):
-            blocks.append(s)
-            counter = 0 
-            s = ""
-        elif (i+1 == len(text)): # Reached last element of the string and could use some padding
-            blocks.append(s)
-        i += 1
+    blocks = [text[i:i+b_size] for i in range(0, len(text), b_size)]
+    counter = len(text) % b_size
     
     if (padding == True and counter != 0): # Pad if required
         blocks[-1] += pad*(b_size-counter)
@@ -560,11 +1198,8 @@ def blocks_to_baskets(blocks):
             return []
 
     k = len(blocks[0])
-    baskets = ['' for string in range(k)]
-
-    for i in range(k):
-        for j in range(len(blocks)):
-            baskets[i] += blocks[j][i]
+    text = "".join(blocks)
+    baskets = [text[i::k] for i in range(k)]
 
     return baskets
 '______________________________________________________________________________'
@@ -613,12 +1248,9 @@ def get_freq(text,base = ''):
     if (base == None): # Deafult base ie upper and lower case letters  
         base = get_base('alpha')
     
-    count_list = [0 for character in base]
-    index = 0
-    for character in text: 
-        if character in base:
-            index = base.find(character)
-            count_list[index] += 1
+    # Count the text once, duplicate base characters are only counted at their first index
+    counts = Counter(text)
+    count_list = [counts[character] if base.find(character) == index else 0 for index, character in enumerate(base)]
     return count_list
 
 '______________________________________________________________________________'
@@ -800,3 +1432,180 @@ def decode(b,code_type):
             c = base[decimal]
              
     return c
+
+def typed_key(value):
+    """
+    ----------------------------------------------------
+    Parameters:   value (?): a key, pad or other JSON value
+    Return:       key (tuple)
+    Description:  Returns a cache key of value that keeps the type of every
+                      element (e.g. 1 and True, or "1" and 1 are different keys)
+                  Used for every key of a shared LRU_Cache
+    ---------------------------------------------------
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value),) + tuple(typed_key(element) for element in value)
+    return (type(value), value)
+
+'______________________________________________________________________________'
+
+class LRU_Cache:
+    """
+    ----------------------------------------------------
+    Description: A bounded least recently used cache with optional expiry
+                 Used to share fully prepared objects (e.g. cipher engines)
+                     between calls that use the same key
+                 Keeps hit and miss counters
+                 Safe to share between threads
+    ----------------------------------------------------
+    """
+
+    def __init__(self, size=128, ttl=None):
+        """
+        ----------------------------------------------------
+        Parameters:   size (int): maximum number of entries, default = 128
+                      ttl (float): seconds before an entry expires
+                          default = None (entries never expire)
+        Description:  LRU_Cache constructor
+                      A size smaller than 1 disables caching
+        ---------------------------------------------------
+        """
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        return
+
+    def get(self, key, factory):
+        """
+        ----------------------------------------------------
+        Parameters:   key (?): a hashable cache key
+                      factory (function): builds the value on a cache miss
+        Return:       value (?)
+        Description:  Returns the cached value for key
+                      On a miss (or an expired entry) the value is built by
+                          calling factory() and stored in the cache
+                      Least recently used entries are evicted when full
+                      Unhashable keys are never cached
+        ---------------------------------------------------
+        """
+        try:
+            hash(key)
+        except TypeError:
+            with self._lock:
+                self.misses += 1
+            return factory()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[1] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = factory()
+        if self.size < 1:
+            return value
+
+        with self._lock:
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """
+        ----------------------------------------------------
+        Parameters:   -
+        Return:       -
+        Description:  Removes all entries and resets the hit/miss counters
+        ---------------------------------------------------
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        return
+
+    def stats(self):
+        """
+        ----------------------------------------------------
+        Parameters:   -
+        Return:       stats (dict): hits, misses, entries, size, ttl
+        Description:  Returns a snapshot of the cache counters
+        ---------------------------------------------------
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                    "size": self.size, "ttl": self.ttl}
+
+    def __len__(self):
+        return len(self._entries)
+
+'______________________________________________________________________________'
+
+def configure_logging(level=logging.DEBUG, handler=None):
+    """
+    ----------------------------------------------------
+    Parameters:   level (int or str): logging level, default = DEBUG
+                  handler (logging.Handler): default = None (stderr)
+    Return:       listener (logging.handlers.QueueListener)
+    Description:  Enables the "ciphers" logger
+                  Records are put on a queue by a QueueHandler and written
+                      by handler on the listener thread, so logging never
+                      blocks the caller on I/O
+                  Calling it again replaces the previous listener
+    ---------------------------------------------------
+    """
+    global _log_listener
+
+    if handler == None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+
+    if _log_listener is not None:
+        _log_listener.stop()
+    for old_handler in logger.handlers[:]:
+        if isinstance(old_handler, logging.handlers.QueueHandler): logger.removeHandler(old_handler)
+
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _log_listener.start()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+
+    return _log_listener
+
+'______________________________________________________________________________'
+
+def log_call(method):
+    """
+    ----------------------------------------------------
+    Parameters:   method (function): a cipher method taking text first
+    Return:       wrapper (function)
+    Description:  Decorator which emits a debug event for every call:
+                      cipher=<class> method=<name> length=<len(text)> duration=<seconds>
+                  The values are also attached to the record (cipher, method,
+                      length, duration) for structured handlers
+                  Costs a single level check when debug logging is off
+    ---------------------------------------------------
+    """
+    @wraps(method)
+    def wrapper(self, text, *args, **kwargs):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return method(self, text, *args, **kwargs)
+
+        start = time.perf_counter()
+        result = method(self, text, *args, **kwargs)
+        duration = time.perf_counter() - start
+        cipher = type(self).__name__
+        logger.debug("cipher=%s method=%s length=%d duration=%.6f", cipher, method.__name__, len(text), duration,
+                     extra={"cipher": cipher, "method": method.__name__, "length": len(text), "duration": duration})
+        return result
+    return wrapper
@@ -0,0 +1,199 @@
+"""
+----------------------------------------------------
+Optional NumPy backend for the ciphers
+ASCII text is converted to a numpy.uint8 array and the cipher is
+    applied to the whole array at once:
+    shifts (Ceaser, Vigenere): modular arithmetic over the alpha positions,
+        case is kept through the 0x20 bit of every byte
+    substitution: a 128 entry lookup table
+    transposition: an index permutation gather
+Selected with backend="numpy" on encrypt/decrypt, the ciphers fall back
+    to pure Python when NumPy is missing or the text is not ASCII
+----------------------------------------------------
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BACKENDS = ["python", "numpy"]
+
+def available(text):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str)
+    Return:       True/False
+    Description:  Checks if text can be processed by the NumPy backend
+                  NumPy must be installed and text must be ASCII
+    ---------------------------------------------------
+    """
+    return numpy is not None and text.isascii()
+
+'______________________________________________________________________________'
+
+def to_array(text):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str): ASCII string
+    Return:       array (numpy.ndarray): read only uint8 array
+    ---------------------------------------------------
+    """
+    return numpy.frombuffer(text.encode('ascii'), dtype=numpy.uint8)
+
+'______________________________________________________________________________'
+
+def to_text(array):
+    """
+    ----------------------------------------------------
+    Parameters:   array (numpy.ndarray): uint8 array of ASCII codes
+    Return:       text (str)
+    ---------------------------------------------------
+    """
+    return array.tobytes().decode('ascii')
+
+'______________________________________________________________________________'
+
+def shift_alpha(text,shifts,key_start=0):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str): ASCII string
+                  shifts (list of int): shift of every key position
+                  key_start (int): key position of the first alpha character
+                      default = 0
+    Return:       updated_text (str)
+    Description:  Shifts the alpha characters of text, the i-th alpha
+                      character is shifted by shifts[(key_start + i) % len(shifts)]
+                  Preserves the case of characters, other characters are kept
+                  Example: shift_alpha('Ab, c', [1, 2]) --> 'Bd, d'
+    ---------------------------------------------------
+    """
+    array = to_array(text)
+    positions = numpy.flatnonzero(((array | 0x20) >= 97) & ((array | 0x20) <= 122))
+    if len(positions) == 0: return text
+
+    shifts = numpy.array(shifts, dtype=numpy.int64) % 26
+    shifts = shifts[(numpy.arange(len(positions)) + key_start) % len(shifts)]
+    letters = (array[positions] | 0x20) - 97
+
+    updated = array.copy()
+    updated[positions] = ((letters + shifts) % 26 + 65) | (array[positions] & 0x20)
+
+    return to_text(updated)
+
+'______________________________________________________________________________'
+
+def column_counts(letters,columns):
+    """
+    ----------------------------------------------------
+    Parameters:   letters (str): lower case ASCII letters
+                  columns (int): number of columns
+    Return:       counts (2D list): counts[i][j] = occurrences of chr(97 + j)
+                      in column i (letters[i::columns])
+    Description:  Counts the letters of every column in a single pass
+    ---------------------------------------------------
+    """
+    array = to_array(letters).astype(numpy.int64) - 97
+    codes = (numpy.arange(len(array)) % columns) * 26 + array
+    return numpy.bincount(codes, minlength=26 * columns).reshape(columns, 26).tolist()
+
+'______________________________________________________________________________'
+
+def lookup_table(translate_table):
+    """
+    ----------------------------------------------------
+    Parameters:   translate_table (dict): a str.translate table
+    Return:       table (numpy.ndarray): uint8 array of 128 ASCII codes
+    Description:  Converts a translate table into a lookup table,
+                      table[code] is the translation of chr(code)
+                  If some ASCII character is not translated into a single
+                      ASCII character, returns None
+    ---------------------------------------------------
+    """
+    translated = "".join(map(chr, range(128))).translate(translate_table)
+    if len(translated) != 128 or not translated.isascii(): return None
+    return to_array(translated)
+
+'______________________________________________________________________________'
+
+def lookup(text,table):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str): ASCII string
+                  table (numpy.ndarray): lookup table from lookup_table
+    Return:       updated_text (str)
+    ---------------------------------------------------
+    """
+    return to_text(table[to_array(text)])
+
+'______________________________________________________________________________'
+
+def transpose_encrypt(text,key_order,pad):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str): ASCII string
+                  key_order (list): column order from Columnar_Transposition.key_order
+                  pad (str): ASCII padding character
+    Return:       ciphertext (str)
+    Description:  Columnar Transposition encryption
+                  Same output as Columnar_Transposition.encrypt:
+                      spaces are kept in place, the last row is padded
+                      and the columns are read in key order
+    ---------------------------------------------------
+    """
+    array = to_array(text)
+    spaces = numpy.flatnonzero(array == 32)
+    array = array[array != 32]
+
+    length = len(array)
+    col = len(key_order)
+    rows = length // col + 1
+    padded = numpy.full(rows * col, ord(pad), dtype=numpy.uint8)
+    padded[:length] = array
+
+    # Gather: column index of the table is read as ciphertext[k*rows:(k+1)*rows]
+    indices = (numpy.arange(rows) * col)[numpy.newaxis, :] + numpy.array(key_order)[:, numpy.newaxis]
+    ciphertext = padded[indices.ravel()]
+
+    return to_text(_insert_spaces(ciphertext, spaces))
+
+'______________________________________________________________________________'
+
+def transpose_decrypt(text,key_order,pad):
+    """
+    ----------------------------------------------------
+    Parameters:   text (str): ASCII string
+                  key_order (list): column order from Columnar_Transposition.key_order
+                  pad (str): ASCII padding character
+    Return:       plaintext (str)
+    Description:  Columnar Transposition decryption
+                  Same output as Columnar_Transposition.decrypt:
+                      the table has at least two rows, characters that do not
+                      fit in the table are dropped and padding is removed
+                      from the last row only
+    ---------------------------------------------------
+    """
+    array = to_array(text)
+    spaces = numpy.flatnonzero(array == 32)
+    array = array[array != 32]
+
+    col = len(key_order)
+    rows = len(array) // col
+    table = numpy.full(max(rows, 2) * col, ord(pad), dtype=numpy.uint8)
+
+    # Scatter: ciphertext[k*rows:(k+1)*rows] is column key_order[k] of the table
+    indices = (numpy.arange(rows) * col)[numpy.newaxis, :] + numpy.array(key_order)[:, numpy.newaxis]
+    table[indices.ravel()] = array[:rows * col]
+
+    last_row = (max(rows, 2) - 1) * col
+    plaintext = numpy.concatenate((table[:last_row], table[last_row:][table[last_row:] != ord(pad)]))
+
+    return to_text(_insert_spaces(plaintext, spaces))
+
+def _insert_spaces(array, spaces):
+    """
+    Private helper function which inserts spaces back at the positions
+    found in the original text, same as utilities.insert_mask
+    """
+    if len(spaces) == 0: return array
+    cuts = numpy.minimum(spaces - numpy.arange(len(spaces)), len(array))
+    return numpy.insert(array, cuts, 32)